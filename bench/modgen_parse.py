@@ -0,0 +1,52 @@
+"""Benchmark `flattrs.modgen` schema parsing, LALR against Earley.
+
+Run with `python bench/modgen_parse.py`.
+"""
+from pathlib import Path
+from timeit import repeat
+
+from lark import Lark
+
+from flattrs.modgen.parser import parser as lalr
+
+DEFS = Path(__file__).parent.parent / "tests" / "flatbufferdefs"
+
+earley = Lark(lalr.source_grammar, start="module")
+
+
+def synthetic_schema(tables: int = 500) -> str:
+    """A schema with many tables, enums and unions."""
+    lines = ["namespace bench.large;"]
+    for i in range(tables):
+        lines.append(f"enum Enum{i}: ubyte {{ Alpha = 1, Beta, Gamma, Delta = 10 }}")
+        lines.append(f"table Table{i} (immutable) {{")
+        lines.append("  id: string (required);")
+        lines.append("  count: uint32 = 0;")
+        lines.append("  ratio: float64;")
+        lines.append(f"  kind: Enum{i} = Alpha;")
+        lines.append("  values: [int16];")
+        if i:
+            lines.append(f"  previous: Table{i - 1};")
+            lines.append(f"  previous_list: [Table{i - 1}];")
+        lines.append("}")
+        if i > 1:
+            lines.append(f"union Union{i} {{ Table{i - 2}, Table{i - 1} = 5 }}")
+    return "\n".join(lines)
+
+
+def bench(name: str, sources: list[str], number: int) -> None:
+    size = sum(len(s) for s in sources)
+    for label, parser in (("earley", earley), ("lalr", lalr)):
+        best = min(
+            repeat(lambda: [parser.parse(s) for s in sources], number=number, repeat=5)
+        )
+        per_run = best / number
+        print(
+            f"{name:>8} {label:>6}: {per_run * 1000:8.2f} ms"
+            f" ({size / per_run / 1_000_000:6.2f} MB/s)"
+        )
+
+
+if __name__ == "__main__":
+    bench("corpus", [p.read_text() for p in sorted(DEFS.rglob("*.fbs"))], 20)
+    bench("large", [synthetic_schema()], 1)
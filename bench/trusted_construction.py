@@ -0,0 +1,69 @@
+"""Benchmark loading with and without `Converter(trusted_construction=True)`.
+
+The models mirror `tests/flatbufferdefs/common.fbs`, with a validator on
+`Common1` like hand-written models often have.
+
+Run with `python bench/trusted_construction.py`.
+"""
+from timeit import repeat
+
+from attrs import define, field, frozen
+from attrs.validators import instance_of
+
+from flattrs import Float32, Int8, Int16, Int64, Uint8, Uint16, Uint32, Uint64
+from flattrs.converters import Converter
+
+
+@define
+class Common1:
+    id: str = field(validator=instance_of(str))
+    aSmallInt: Uint8 = 0
+    aBigInt: int = 0
+
+
+@frozen
+class AllScalars:
+    boolean: bool
+    uint8: Uint8
+    uint16: Uint16
+    uint32: Uint32
+    uint64: Uint64
+    int8: Int8
+    int16: Int16
+    int32: int
+    int64: Int64
+    float32: Float32
+    float64: float
+
+
+@define
+class VectorOfCommon1:
+    vecOfCommon: list[Common1]
+
+
+def bench(name: str, model, number: int) -> None:
+    timings = {}
+    for label, converter in (
+        ("init", Converter()),
+        ("trusted", Converter(trusted_construction=True)),
+    ):
+        payload = converter.dumps(model)
+        loads = converter.make_loads(model.__class__)
+        assert loads(payload) == model
+        timings[label] = min(repeat(lambda: loads(payload), number=number, repeat=5))
+    init, trusted = timings["init"], timings["trusted"]
+    print(
+        f"{name:>15}: init {init / number * 1e6:7.2f} us,"
+        f" trusted {trusted / number * 1e6:7.2f} us ({init / trusted:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    common = Common1("an id", 1, 2)
+    bench("Common1", common, 100_000)
+    bench(
+        "AllScalars",
+        AllScalars(True, 1, 2, 3, 4, -1, -2, -3, -4, 0.5, 0.25),
+        100_000,
+    )
+    bench("VectorOfCommon1", VectorOfCommon1([common] * 1_000), 200)
@@ -1,58 +1,109 @@
 from typing import Final
 
-from .converters import Converter
+from ._verifier import VerificationError
+from .converters import Converter, struct_dtype
 from .types import (
+    KEY,
+    NOT_LOADED,
+    BoolVector,
     Float,
     Float32,
+    Float32Vector,
     Float64,
+    Float64Vector,
     Int8,
     Int8Enum,
+    Int8Vector,
     Int16,
     Int16Enum,
+    Int16Vector,
     Int32,
     Int32Enum,
+    Int32Vector,
     Int64,
     Int64Enum,
+    Int64Vector,
+    Nested,
+    StructVector,
     Uint8,
     Uint8Enum,
+    Uint8Vector,
     Uint16,
     Uint16Enum,
+    Uint16Vector,
     Uint32,
     Uint32Enum,
+    Uint32Vector,
     Uint64,
     Uint64Enum,
+    Uint64Vector,
     UnionVal,
+    struct,
 )
 
 global_converter = Converter()
 dumps: Final = global_converter.dumps
+dumps_into: Final = global_converter.dumps_into
+dumps_many: Final = global_converter.dumps_many
 loads: Final = global_converter.loads
+lookup_by_key: Final = global_converter.lookup_by_key
+loads_many: Final = global_converter.loads_many
+iter_loads: Final = global_converter.iter_loads
 make_dumps: Final = global_converter.make_dumps
 make_loads: Final = global_converter.make_loads
+make_verifier: Final = global_converter.make_verifier
+make_view: Final = global_converter.make_view
+make_writer: Final = global_converter.make_writer
 
 __all__ = [
+    "BoolVector",
     "dumps",
+    "dumps_into",
+    "dumps_many",
     "Float",
     "Float32",
+    "Float32Vector",
     "Float64",
+    "Float64Vector",
     "Int16",
     "Int16Enum",
+    "Int16Vector",
     "Int32",
     "Int32Enum",
+    "Int32Vector",
     "Int64",
     "Int64Enum",
+    "Int64Vector",
     "Int8",
     "Int8Enum",
+    "Int8Vector",
+    "iter_loads",
+    "KEY",
     "loads",
+    "loads_many",
+    "lookup_by_key",
     "make_dumps",
     "make_loads",
+    "make_verifier",
+    "make_view",
+    "make_writer",
+    "Nested",
+    "NOT_LOADED",
+    "struct",
+    "struct_dtype",
+    "StructVector",
     "Uint16",
     "Uint16Enum",
+    "Uint16Vector",
     "Uint32",
     "Uint32Enum",
+    "Uint32Vector",
     "Uint64",
     "Uint64Enum",
+    "Uint64Vector",
     "Uint8",
     "Uint8Enum",
+    "Uint8Vector",
     "UnionVal",
+    "VerificationError",
 ]
@@ -3,7 +3,13 @@ from enum import IntEnum
 
 from attrs import NOTHING, AttrsInstance, fields, frozen, has, resolve_types
 
-from ._consts import ENUM_TYPE_TO_SCALAR_TYPE, HELPER_TYPE_TO_SCALAR_TYPE, NoneType
+from ._consts import (
+    ENUM_TYPE_TO_SCALAR_TYPE,
+    HELPER_TYPE_TO_SCALAR_TYPE,
+    SCALAR_TYPE_TO_FORMAT,
+    SCALAR_TYPE_TO_WIDTH,
+    NoneType,
+)
 from ._types import (
     FieldName,
     MaybeDefault,
@@ -14,6 +20,7 @@ from ._types import (
     UnionMapping,
 )
 from .types import (
+    KEY,
     Float,
     Float64,
     Int8,
@@ -23,7 +30,9 @@ from .types import (
     Int32,
     Int32Enum,
     Int64Enum,
+    Nested,
     ScalarMarker,
+    StructVector,
     Uint8,
     Uint8Enum,
     Uint16,
@@ -33,16 +42,34 @@ from .types import (
     Uint64,
     Uint64Enum,
     UnionVal,
+    VectorMarker,
 )
 from .typing import (
     get_annotation_and_base,
     get_optional_arg,
     get_union_args,
     is_generic_subclass,
+    is_struct,
     is_subclass,
 )
 
 
+@frozen
+class FlatbufferStruct:
+    """The fixed layout of a struct.
+
+    Fields are `(name, scalar type or nested struct, field type)` tuples.
+    `format` is the `struct` module format of the whole struct, padding
+    included, without the byte order.
+    """
+
+    cl: type[AttrsInstance]
+    size: int
+    alignment: int
+    format: str
+    fields: list[tuple[FieldName, "ScalarType | FlatbufferStruct", type]]
+
+
 @frozen
 class FlatbufferTable:
     cl: type[AttrsInstance]
@@ -60,7 +87,16 @@ class FlatbufferTable:
         tuple[FieldName, SlotNumber, PythonScalarType, ScalarType, Optionality]
     ]
     lists_of_tables: list[tuple[FieldName, type, SlotNumber, Optionality]]
+    numpy_vectors: list[tuple[FieldName, SlotNumber, ScalarType, Optionality]]
     unions: list[tuple[FieldName, tuple[type, ...], UnionMapping, SlotNumber]]
+    structs: list[tuple[FieldName, FlatbufferStruct, SlotNumber, Optionality]]
+    lists_of_structs: list[tuple[FieldName, FlatbufferStruct, SlotNumber, Optionality]]
+    numpy_struct_vectors: list[
+        tuple[FieldName, FlatbufferStruct, SlotNumber, Optionality]
+    ]
+    nested_flatbuffers: list[tuple[FieldName, type, SlotNumber, Optionality]]
+    #: The key field, with `None` as the scalar type for strings.
+    key: tuple[FieldName, SlotNumber, ScalarType | None, MaybeDefault] | None = None
 
 
 def analyze(
@@ -83,7 +119,16 @@ def analyze(
     ] = []
     enums: list[FieldName, str, SlotNumber, MaybeDefault] = []
     inlines: list[FieldName, ScalarType, SlotNumber, MaybeDefault] = []
+    numpy_vectors: list[tuple[FieldName, SlotNumber, ScalarType, Optionality]] = []
     unions: list[tuple[FieldName, tuple[type, ...], UnionMapping, SlotNumber]] = []
+    structs: list[tuple[FieldName, FlatbufferStruct, SlotNumber, Optionality]] = []
+    lists_of_structs: list[
+        tuple[FieldName, FlatbufferStruct, SlotNumber, Optionality]
+    ] = []
+    numpy_struct_vectors: list[
+        tuple[FieldName, FlatbufferStruct, SlotNumber, Optionality]
+    ] = []
+    nested_flatbuffers: list[tuple[FieldName, type, SlotNumber, Optionality]] = []
     next_slot_idx = 0
 
     overridden = {f[0]: f for f in field_overrides}
@@ -106,6 +151,8 @@ def analyze(
             strings.append((field.name, next_slot_idx, False))
         elif ftype is bytes:
             byte_fields.append((field.name, next_slot_idx, False))
+        elif is_struct(ftype):
+            structs.append((field.name, analyze_struct(ftype), next_slot_idx, False))
         elif has(ftype):
             if field.name in union_overrides:
                 # A single-class union.
@@ -133,12 +180,24 @@ def analyze(
                 )
             )
             next_slot_idx += 1
+        elif (anb := get_annotation_and_base(ftype, VectorMarker)) is not None:
+            numpy_vectors.append((field.name, next_slot_idx, anb[0].scalar_type, False))
+        elif (anb := get_annotation_and_base(ftype, StructVector)) is not None:
+            numpy_struct_vectors.append(
+                (field.name, analyze_struct(anb[0].struct), next_slot_idx, False)
+            )
+        elif is_generic_subclass(ftype, Nested):
+            nested_flatbuffers.append(
+                (field.name, ftype.__args__[0], next_slot_idx, False)
+            )
         elif o := get_optional_arg(ftype):
             # This is an optional field.
             if o is str:
                 strings.append((field.name, next_slot_idx, True))
             elif o is bytes:
                 byte_fields.append((field.name, next_slot_idx, True))
+            elif is_struct(o):
+                structs.append((field.name, analyze_struct(o), next_slot_idx, True))
             elif has(o):
                 if field.name in union_overrides:
                     unions.append(
@@ -164,10 +223,26 @@ def analyze(
                     )
                 )
                 next_slot_idx += 1
+            elif (anb := get_annotation_and_base(o, VectorMarker)) is not None:
+                numpy_vectors.append(
+                    (field.name, next_slot_idx, anb[0].scalar_type, True)
+                )
+            elif (anb := get_annotation_and_base(o, StructVector)) is not None:
+                numpy_struct_vectors.append(
+                    (field.name, analyze_struct(anb[0].struct), next_slot_idx, True)
+                )
+            elif is_generic_subclass(o, Nested):
+                nested_flatbuffers.append(
+                    (field.name, o.__args__[0], next_slot_idx, True)
+                )
             elif is_generic_subclass(o, list):
                 arg = o.__args__[0]
                 if arg is str:
                     lists_of_strings.append((field.name, next_slot_idx, True))
+                elif is_struct(arg):
+                    lists_of_structs.append(
+                        (field.name, analyze_struct(arg), next_slot_idx, True)
+                    )
                 elif has(arg):
                     lists_of_tables.append((field.name, arg, next_slot_idx, True))
                 elif arg in (
@@ -239,6 +314,10 @@ def analyze(
             arg = ftype.__args__[0]
             if arg is str:
                 lists_of_strings.append((field.name, next_slot_idx, False))
+            elif is_struct(arg):
+                lists_of_structs.append(
+                    (field.name, analyze_struct(arg), next_slot_idx, False)
+                )
             elif has(arg):
                 lists_of_tables.append((field.name, arg, next_slot_idx, False))
             elif arg in HELPER_TYPE_TO_SCALAR_TYPE:
@@ -320,6 +399,20 @@ def analyze(
             raise TypeError(f"Cannot handle {ftype}")
 
         next_slot_idx += 1
+
+    key = None
+    keys = [f.name for f in fields(cl) if f.metadata.get(KEY)]
+    if len(keys) > 1:
+        raise TypeError(f"{cl.__name__} has more than one key: {', '.join(keys)}")
+    if keys:
+        for name, slot_idx, is_optional in strings:
+            if name == keys[0] and not is_optional:
+                key = (name, slot_idx, None, NOTHING)
+        for name, scalar_type, slot_idx, default in inlines + enums:
+            if name == keys[0]:
+                key = (name, slot_idx, scalar_type, default)
+        if key is None:
+            raise TypeError(f"The key {keys[0]} must be a scalar or a required string")
     return FlatbufferTable(
         cl,
         next_slot_idx,
@@ -332,7 +425,56 @@ def analyze(
         lists_of_scalars,
         lists_of_enums,
         lists_of_tables,
+        numpy_vectors,
         unions,
+        structs,
+        lists_of_structs,
+        numpy_struct_vectors,
+        nested_flatbuffers,
+        key,
+    )
+
+
+def analyze_struct(cl: type[AttrsInstance]) -> FlatbufferStruct:
+    """Lay out a struct, aligning every field to its size like flatc does."""
+    resolve_types(cl)
+    size = 0
+    alignment = 1
+    format = []
+    struct_fields = []
+
+    for field in fields(cl):
+        ftype = field.type
+        if is_struct(ftype):
+            member = analyze_struct(ftype)
+            member_size, member_alignment = member.size, member.alignment
+            member_format = member.format
+        else:
+            if is_subclass(ftype, tuple(ENUM_TYPE_TO_SCALAR_TYPE)):
+                for enum_type, member in ENUM_TYPE_TO_SCALAR_TYPE.items():
+                    if enum_type in ftype.__mro__:
+                        break
+            elif ftype in HELPER_TYPE_TO_SCALAR_TYPE:
+                member = HELPER_TYPE_TO_SCALAR_TYPE[ftype]
+            else:
+                raise TypeError(f"Cannot handle {field.name} {ftype} in a struct")
+            member_size = member_alignment = SCALAR_TYPE_TO_WIDTH[member]
+            member_format = SCALAR_TYPE_TO_FORMAT[member]
+
+        if padding := -size % member_alignment:
+            format.append(f"{padding}x")
+        format.append(member_format)
+        size += padding + member_size
+        alignment = max(alignment, member_alignment)
+        struct_fields.append((field.name, member, ftype))
+
+    if not struct_fields:
+        raise TypeError(f"{cl.__name__} is an empty struct")
+    if padding := -size % alignment:
+        format.append(f"{padding}x")
+
+    return FlatbufferStruct(
+        cl, size + padding, alignment, "".join(format), struct_fields
     )
 
 
@@ -0,0 +1,115 @@
+"""A pure-Python fallback for `flattrs.cflattrs.builder`, for PyPy."""
+from threading import local
+from typing import Iterable
+
+from flatbuffers.builder import Builder as _FbBuilder
+from flatbuffers.builder import BuilderNotFinishedError
+
+from ._consts import SCALAR_TYPE_TO_WIDTH
+from ._types import ReadableBuffer
+
+
+class Builder(_FbBuilder):
+    """`flatbuffers.builder.Builder`, extended with `Clear`, `Reset`,
+    `CreateScalarVector`, `CreateStruct`, `CreateStructVector` and the buffer
+    protocol."""
+
+    __slots__ = ()
+
+    def Clear(self) -> None:
+        """Clear resets the Builder, so it can be used to build a new buffer."""
+        self.Bytes[self.head :] = bytes(len(self.Bytes) - self.head)
+        self.current_vtable = None
+        self.head = len(self.Bytes)
+        self.minalign = 1
+        self.objectEnd = None
+        self.vtables = {}
+        self.nested = False
+        self.sharedStrings = {}
+        self.finished = False
+
+    def Reset(self, maxSize: int) -> None:
+        """Reset clears the Builder, shrinking its buffer to `maxSize` bytes
+        if it has grown larger."""
+        if len(self.Bytes) > maxSize:
+            self.Bytes = bytearray(maxSize)
+            self.head = 0
+        self.Clear()
+
+    def CreateScalarVector(self, type: str, x: Iterable) -> int:
+        """CreateScalarVector writes a vector of scalars into the buffer.
+
+        `type` is the name of the scalar type, like `"Float32"`.
+        """
+        prepend = getattr(self, f"Prepend{type}")
+        items = x if isinstance(x, list) else list(x)
+        width = SCALAR_TYPE_TO_WIDTH[type]
+        self.StartVector(width, len(items), width)
+        for item in reversed(items):
+            prepend(item)
+        return self.EndVector()
+
+    def CreateStruct(self, alignment: int, data: bytes) -> int:
+        """CreateStruct writes a packed struct inline, aligned to `alignment`."""
+        self.Prep(alignment, len(data))
+        self.head -= len(data)
+        self.Bytes[self.head : self.head + len(data)] = data
+        return self.Offset()
+
+    def CreateStructVector(
+        self, size: int, alignment: int, data: ReadableBuffer
+    ) -> int:
+        """CreateStructVector writes a vector of packed structs of `size`
+        bytes each, laid out contiguously in `data`."""
+        data = memoryview(data).cast("B")
+        if size <= 0 or len(data) % size:
+            raise ValueError("flatbuffers: struct vector data has an invalid length.")
+        self.StartVector(size, len(data) // size, alignment)
+        self.head -= len(data)
+        self.Bytes[self.head : self.head + len(data)] = data
+        return self.EndVector()
+
+    def __buffer__(self, flags: int) -> memoryview:
+        """Expose the finished buffer, like `Output` but without copying."""
+        if not self.finished:
+            raise BuilderNotFinishedError()
+        return memoryview(self.Bytes)[self.head :].toreadonly()
+
+
+class BuilderPool:
+    """A per-thread pool of reusable builders.
+
+    Builders are cleared when they are released back to the pool. Builders
+    that grew larger than `max_size` bytes are shrunk back down, so a single
+    large buffer doesn't pin its memory forever.
+    """
+
+    def __init__(
+        self,
+        initial_size: int = 10000,
+        max_size: int = 1024 * 1024,
+        max_builders: int = 4,
+    ) -> None:
+        self.initial_size = initial_size
+        self.max_size = max_size
+        self.max_builders = max_builders
+        self._local = local()
+
+    def _builders(self) -> list[Builder]:
+        try:
+            return self._local.builders
+        except AttributeError:
+            res = self._local.builders = []
+            return res
+
+    def acquire(self) -> Builder:
+        """Take a builder from this thread's pool, or create a new one."""
+        builders = self._builders()
+        return builders.pop() if builders else Builder(self.initial_size)
+
+    def release(self, builder: Builder) -> None:
+        """Return a builder to this thread's pool."""
+        builders = self._builders()
+        if len(builders) < self.max_builders:
+            builder.Reset(self.max_size)
+            builders.append(builder)
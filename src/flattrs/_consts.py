@@ -92,3 +92,31 @@ SCALAR_TYPE_TO_WIDTH: Final[dict[ScalarType, int]] = {
     "Float32": 4,
     "Float64": 8,
 }
+
+SCALAR_TYPE_TO_DTYPE: Final[dict[ScalarType, str]] = {
+    "Bool": "?",
+    "Uint8": "u1",
+    "Uint16": "<u2",
+    "Uint32": "<u4",
+    "Uint64": "<u8",
+    "Int8": "i1",
+    "Int16": "<i2",
+    "Int32": "<i4",
+    "Int64": "<i8",
+    "Float32": "<f4",
+    "Float64": "<f8",
+}
+
+SCALAR_TYPE_TO_FORMAT: Final[dict[ScalarType, str]] = {
+    "Bool": "?",
+    "Uint8": "B",
+    "Uint16": "H",
+    "Uint32": "I",
+    "Uint64": "Q",
+    "Int8": "b",
+    "Int16": "h",
+    "Int32": "i",
+    "Int64": "q",
+    "Float32": "f",
+    "Float64": "d",
+}
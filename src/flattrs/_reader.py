@@ -0,0 +1,129 @@
+"""A pure-Python fallback for `flattrs.cflattrs.reader`, for PyPy."""
+from struct import Struct
+
+from flatbuffers.table import Table as _FbTable
+
+_bool = Struct("<?").unpack_from
+_uint8 = Struct("<B").unpack_from
+_uint16 = Struct("<H").unpack_from
+_uint32 = Struct("<I").unpack_from
+_uint64 = Struct("<Q").unpack_from
+_int8 = Struct("<b").unpack_from
+_int16 = Struct("<h").unpack_from
+_int32 = Struct("<i").unpack_from
+_int64 = Struct("<q").unpack_from
+_float32 = Struct("<f").unpack_from
+_float64 = Struct("<d").unpack_from
+
+
+class Table(_FbTable):
+    """`flatbuffers.table.Table`, extended with the typed getters of the Cython reader."""
+
+    __slots__ = ()
+
+    def SubTable(self, pos: int) -> "Table":
+        """Create a table at `pos`, sharing this table's buffer."""
+        return Table(self.Bytes, pos)
+
+    def DecodeString(self, off: int) -> str:
+        """DecodeString decodes a UTF-8 string stored inside the flatbuffer."""
+        off += _uint32(self.Bytes, off)[0]
+        length = _uint32(self.Bytes, off)[0]
+        return str(memoryview(self.Bytes)[off + 4 : off + 4 + length], "utf-8")
+
+    def Union(self, t2: "Table", off: int) -> None:
+        off += self.Pos
+        t2.Pos = off + _uint32(self.Bytes, off)[0]
+        t2.Bytes = self.Bytes
+
+    def GetBool(self, off: int) -> bool:
+        return _bool(self.Bytes, off)[0]
+
+    def GetUint8(self, off: int) -> int:
+        return _uint8(self.Bytes, off)[0]
+
+    def GetUint16(self, off: int) -> int:
+        return _uint16(self.Bytes, off)[0]
+
+    def GetUint32(self, off: int) -> int:
+        return _uint32(self.Bytes, off)[0]
+
+    def GetUint64(self, off: int) -> int:
+        return _uint64(self.Bytes, off)[0]
+
+    def GetInt8(self, off: int) -> int:
+        return _int8(self.Bytes, off)[0]
+
+    def GetInt16(self, off: int) -> int:
+        return _int16(self.Bytes, off)[0]
+
+    def GetInt32(self, off: int) -> int:
+        return _int32(self.Bytes, off)[0]
+
+    def GetInt64(self, off: int) -> int:
+        return _int64(self.Bytes, off)[0]
+
+    def GetFloat32(self, off: int) -> float:
+        return _float32(self.Bytes, off)[0]
+
+    def GetFloat64(self, off: int) -> float:
+        return _float64(self.Bytes, off)[0]
+
+    def GetBoolSlot(self, slot: int, d):
+        return (
+            d if (o := self.Offset(slot)) == 0 else _bool(self.Bytes, self.Pos + o)[0]
+        )
+
+    def GetUint8Slot(self, slot: int, d):
+        return (
+            d if (o := self.Offset(slot)) == 0 else _uint8(self.Bytes, self.Pos + o)[0]
+        )
+
+    def GetUint16Slot(self, slot: int, d):
+        return (
+            d if (o := self.Offset(slot)) == 0 else _uint16(self.Bytes, self.Pos + o)[0]
+        )
+
+    def GetUint32Slot(self, slot: int, d):
+        return (
+            d if (o := self.Offset(slot)) == 0 else _uint32(self.Bytes, self.Pos + o)[0]
+        )
+
+    def GetUint64Slot(self, slot: int, d):
+        return (
+            d if (o := self.Offset(slot)) == 0 else _uint64(self.Bytes, self.Pos + o)[0]
+        )
+
+    def GetInt8Slot(self, slot: int, d):
+        return (
+            d if (o := self.Offset(slot)) == 0 else _int8(self.Bytes, self.Pos + o)[0]
+        )
+
+    def GetInt16Slot(self, slot: int, d):
+        return (
+            d if (o := self.Offset(slot)) == 0 else _int16(self.Bytes, self.Pos + o)[0]
+        )
+
+    def GetInt32Slot(self, slot: int, d):
+        return (
+            d if (o := self.Offset(slot)) == 0 else _int32(self.Bytes, self.Pos + o)[0]
+        )
+
+    def GetInt64Slot(self, slot: int, d):
+        return (
+            d if (o := self.Offset(slot)) == 0 else _int64(self.Bytes, self.Pos + o)[0]
+        )
+
+    def GetFloat32Slot(self, slot: int, d):
+        return (
+            d
+            if (o := self.Offset(slot)) == 0
+            else _float32(self.Bytes, self.Pos + o)[0]
+        )
+
+    def GetFloat64Slot(self, slot: int, d):
+        return (
+            d
+            if (o := self.Offset(slot)) == 0
+            else _float64(self.Bytes, self.Pos + o)[0]
+        )
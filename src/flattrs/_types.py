@@ -1,4 +1,5 @@
 """Types used internally."""
+from mmap import mmap
 from typing import Any, Literal, TypeAlias
 
 from attrs import NOTHING, AttrsInstance
@@ -12,3 +13,8 @@ ScalarType: TypeAlias = Literal[
 PythonScalarType: TypeAlias = type[int] | type[bool] | type[float]
 Optionality: TypeAlias = bool
 UnionMapping: TypeAlias = dict[int, type[AttrsInstance]]
+Projection: TypeAlias = tuple[frozenset[str] | None, frozenset[str]]
+ReadableBuffer: TypeAlias = bytes | bytearray | memoryview | mmap
+WritableBuffer: TypeAlias = bytearray | memoryview | mmap
+#: How enum values without members are loaded.
+UnknownEnums: TypeAlias = Literal["raise", "raw", "default"]
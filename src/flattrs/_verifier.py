@@ -0,0 +1,172 @@
+"""A pure-Python fallback for `flattrs.cflattrs.verifier`, for PyPy."""
+from struct import Struct
+from typing import Any
+
+from ._types import ReadableBuffer
+
+# Field kinds, keep in sync with `flattrs.cflattrs.verifier`.
+SCALAR = 0
+STRING = 1
+VECTOR = 2
+TABLE = 3
+STRING_VECTOR = 4
+TABLE_VECTOR = 5
+UNION = 6
+NESTED = 7
+
+_uint16 = Struct("<H").unpack_from
+_uint32 = Struct("<I").unpack_from
+_int32 = Struct("<i").unpack_from
+
+
+class VerificationError(ValueError):
+    """The payload is not a valid flatbuffer for the given model."""
+
+
+class TableSchema:
+    """The fields of a table, as needed by the verifier.
+
+    Fields are `(kind, voffset, size, required, child)` tuples.
+    `child` is the schema of nested tables and nested flatbuffers, or a
+    dictionary of schemas keyed by union type for unions.
+    """
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: list[tuple[int, int, int, bool, Any]]) -> None:
+        self.fields = fields
+
+
+class _Verifier:
+    __slots__ = ("buf", "length", "depth", "max_depth", "num_tables", "max_tables")
+
+    def __init__(self, buf, max_depth: int, max_tables: int) -> None:
+        self.buf = buf
+        self.length = len(buf)
+        self.depth = 0
+        self.max_depth = max_depth
+        self.num_tables = 0
+        self.max_tables = max_tables
+
+    def check(self, pos: int, size: int) -> None:
+        if pos < 0 or size > self.length or pos > self.length - size:
+            raise VerificationError(
+                f"flatbuffers: {size} bytes at {pos} are out of range."
+            )
+
+    def offset(self, pos: int) -> int:
+        self.check(pos, 4)
+        o = _uint32(self.buf, pos)[0]
+        if o == 0:
+            raise VerificationError(f"flatbuffers: null offset at {pos}.")
+        self.check(pos + o, 1)
+        return pos + o
+
+    def vector(self, pos: int, elem_size: int) -> int:
+        self.check(pos, 4)
+        n = _uint32(self.buf, pos)[0]
+        self.check(pos + 4, n * elem_size)
+        return n
+
+    def string(self, pos: int) -> None:
+        end = pos + 4 + self.vector(pos, 1)
+        self.check(end, 1)
+        if self.buf[end] != 0:
+            raise VerificationError(
+                f"flatbuffers: string at {pos} is not null-terminated."
+            )
+
+    def table(self, schema: TableSchema, pos: int) -> None:
+        self.depth += 1
+        self.num_tables += 1
+        if self.depth > self.max_depth:
+            raise VerificationError("flatbuffers: maximum depth exceeded.")
+        if self.num_tables > self.max_tables:
+            raise VerificationError("flatbuffers: maximum number of tables exceeded.")
+        self.check(pos, 4)
+        vtable = pos - _int32(self.buf, pos)[0]
+        self.check(vtable, 4)
+        vsize = _uint16(self.buf, vtable)[0]
+        if vsize < 4 or vsize & 1:
+            raise VerificationError(f"flatbuffers: invalid vtable at {vtable}.")
+        self.check(vtable, vsize)
+        self.check(pos, _uint16(self.buf, vtable + 2)[0])
+
+        for kind, voffset, size, required, child in schema.fields:
+            fo = _uint16(self.buf, vtable + voffset)[0] if voffset < vsize else 0
+            if kind == UNION:
+                union_type = 0
+                if fo != 0:
+                    self.check(pos + fo, 1)
+                    union_type = self.buf[pos + fo]
+                if union_type == 0:
+                    if required:
+                        raise VerificationError(
+                            f"flatbuffers: required union at {voffset} is missing."
+                        )
+                    continue
+                if union_type not in child:
+                    raise VerificationError(
+                        f"flatbuffers: unknown union type {union_type}."
+                    )
+                voffset += 2
+                fo = _uint16(self.buf, vtable + voffset)[0] if voffset < vsize else 0
+                if fo == 0:
+                    raise VerificationError(
+                        f"flatbuffers: union value at {voffset} is missing."
+                    )
+                self.table(child[union_type], self.offset(pos + fo))
+                continue
+            if fo == 0:
+                if required:
+                    raise VerificationError(
+                        f"flatbuffers: required field at {voffset} is missing."
+                    )
+                continue
+            field = pos + fo
+            if kind == SCALAR:
+                self.check(field, size)
+            elif kind == STRING:
+                self.string(self.offset(field))
+            elif kind == VECTOR:
+                self.vector(self.offset(field), size)
+            elif kind == TABLE:
+                self.table(child, self.offset(field))
+            elif kind == STRING_VECTOR:
+                vec = self.offset(field)
+                for i in range(self.vector(vec, 4)):
+                    self.string(self.offset(vec + 4 + 4 * i))
+            elif kind == TABLE_VECTOR:
+                vec = self.offset(field)
+                for i in range(self.vector(vec, 4)):
+                    self.table(child, self.offset(vec + 4 + 4 * i))
+            elif kind == NESTED:
+                vec = self.offset(field)
+                self.nested(child, vec + 4, self.vector(vec, 1))
+        self.depth -= 1
+
+    def nested(self, schema: TableSchema, start: int, size: int) -> None:
+        """Verify a nested flatbuffer as a buffer of its own, like `VerifyNestedFlatBuffer`."""
+        verifier = _Verifier(
+            self.buf[start : start + size], self.max_depth, self.max_tables
+        )
+        verifier.depth = self.depth
+        verifier.num_tables = self.num_tables
+        verifier.table(schema, verifier.offset(0))
+        self.num_tables = verifier.num_tables
+
+
+def verify(
+    schema: TableSchema,
+    buf: ReadableBuffer,
+    offset: int = 0,
+    max_depth: int = 64,
+    max_tables: int = 1000000,
+) -> None:
+    """Verify `buf` holds a table described by `schema`, with its root at `offset`.
+
+    Raises `VerificationError` if it doesn't.
+    """
+    with memoryview(buf) as view, view.cast("B") as data:
+        verifier = _Verifier(data, max_depth, max_tables)
+        verifier.table(schema, verifier.offset(offset))
@@ -15,8 +15,20 @@
 from libc.string cimport memcmp, memcpy, memset
 from libc.stdint cimport uint8_t, uint16_t, uint32_t, uint64_t, int8_t, int16_t, int32_t, int64_t
 from cpython.mem cimport PyMem_Malloc, PyMem_Free
+from cpython.buffer cimport (
+    PyBUF_C_CONTIGUOUS,
+    PyBUF_FORMAT,
+    PyBUF_RECORDS_RO,
+    PyBuffer_FillInfo,
+    PyBuffer_IsContiguous,
+    PyBuffer_Release,
+    PyObject_CheckBuffer,
+    PyObject_GetBuffer,
+)
 
 import struct
+import sys
+from threading import local
 
 from .number_types cimport Flags, enforce_number
 
@@ -30,9 +42,20 @@ cdef struct StoredVtable:
     uint32_t num_fields
     unsigned char* vtable
     int64_t offset        # Offset from the end of the file.
+    uint64_t hash
+    Py_ssize_t slot       # Position in the builder's vtable index.
     StoredVtable* next
 
 
+cdef inline uint64_t hashVtable(const unsigned char* vtable, Py_ssize_t length):
+    """Hash normalized vtable bytes, using FNV-1a."""
+    cdef uint64_t h = 0xcbf29ce484222325ULL
+    cdef Py_ssize_t i
+    for i in range(length):
+        h = (h ^ vtable[i]) * 0x100000001b3ULL
+    return h
+
+
 cdef FlatbufferType Fb_bool_t = FlatbufferType(1)
 cdef FlatbufferType Fb_uint8_t = FlatbufferType(1)
 cdef FlatbufferType Fb_uint16_t = FlatbufferType(2)
@@ -46,6 +69,71 @@ cdef FlatbufferType Fb_float32_t = FlatbufferType(4)
 cdef FlatbufferType Fb_float64_t = FlatbufferType(8)
 
 
+cdef FlatbufferType* scalarType(str name) except NULL:
+    """Look up a scalar type by name, for `CreateScalarVector`."""
+    if name == "Bool":
+        return &Fb_bool_t
+    elif name == "Uint8":
+        return &Fb_uint8_t
+    elif name == "Uint16":
+        return &Fb_uint16_t
+    elif name == "Uint32":
+        return &Fb_uint32_t
+    elif name == "Uint64":
+        return &Fb_uint64_t
+    elif name == "Int8":
+        return &Fb_int8_t
+    elif name == "Int16":
+        return &Fb_int16_t
+    elif name == "Int32":
+        return &Fb_int32_t
+    elif name == "Int64":
+        return &Fb_int64_t
+    elif name == "Float32":
+        return &Fb_float32_t
+    elif name == "Float64":
+        return &Fb_float64_t
+    raise ValueError(f"flatbuffers: unknown scalar type {name!r}.")
+
+
+cdef bint NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+cdef bint bufferMatches(Py_buffer* view, FlatbufferType* fb_type, bint* swap):
+    """
+    Check whether a buffer holds scalars that can be copied as-is into a
+    vector of `fb_type`, and whether they need byteswapping first.
+    """
+    cdef char order = b'@'
+    cdef char code
+    cdef const char* fmt = view.format
+
+    if view.ndim > 1 or view.itemsize != fb_type.bytewidth:
+        return False
+    if fmt is NULL:
+        fmt = b'B'
+    if fmt[0] in b'@=<>!':
+        order = fmt[0]
+        fmt += 1
+    code = fmt[0]
+    if code == 0 or fmt[1] != 0:
+        return False
+
+    if fb_type == &Fb_float32_t or fb_type == &Fb_float64_t:
+        if code not in b'fd':
+            return False
+    elif fb_type == &Fb_bool_t:
+        if code != b'?':
+            return False
+    elif code not in b'bBhHiIlLqQnN':
+        return False
+
+    swap[0] = order == b'>' or order == b'!' or (
+        (order == b'@' or order == b'=') and not NATIVE_LITTLE_ENDIAN
+    )
+    return True
+
+
 cdef inline void Write(packer_type, buf, Py_ssize_t head, Py_ssize_t n):
     """ Write encodes `n` at buf[head] using `packer_type`. """
     packer_type.pack_into(buf, head, n)
@@ -191,6 +279,10 @@ class BuilderNotFinishedError(RuntimeError):
 # VtableMetadataFields is the count of metadata fields in each vtable.
 cdef unsigned int VtableMetadataFields = 2
 cdef unsigned int MAX_BUFFER_SIZE = 2**31
+# The vtable index starts at this many slots, and is kept across `Reset`
+# calls up to `MAX_KEPT_VTABLE_INDEX_SIZE` slots.
+cdef Py_ssize_t MIN_VTABLE_INDEX_SIZE = 16
+cdef Py_ssize_t MAX_KEPT_VTABLE_INDEX_SIZE = 256
 
 cdef class Builder(object):
     """ A Builder is used to construct one or more FlatBuffers.
@@ -207,6 +299,8 @@ cdef class Builder(object):
         - Bytes: an array of bytes.
         - current_vtable: a list of integers.
         - vtables: a list of vtable entries (i.e. a list of list of integers).
+        - vtable_index: an open-addressing hash table over `vtables`, keyed by
+          the normalized vtable bytes, for deduplicating vtables.
 
     Attributes:
       Bytes: The internal `bytearray` for the Builder.
@@ -220,10 +314,13 @@ cdef class Builder(object):
     cdef Py_ssize_t minalign
     cdef int objectEnd
     cdef StoredVtable* vtables
+    cdef StoredVtable** vtable_index
+    cdef Py_ssize_t vtable_index_size
+    cdef Py_ssize_t vtable_count
     cdef bint nested
     cdef bint finished
     cdef Py_ssize_t vectorNumElems
-
+    cdef Py_ssize_t exports
     def __init__(self, Py_ssize_t initialSize):
         """Initializes a Builder of size `initial_size`.
 
@@ -246,19 +343,131 @@ cdef class Builder(object):
         self.nested = False
         self.finished = False
         self.vtables = NULL
+        self.vtable_index = NULL
+        self.vtable_index_size = 0
+        self.vtable_count = 0
         self.vectorNumElems = 0
+        self.exports = 0
 
     def __dealloc__(self):
         PyMem_Free(self.buffer)
+        self.freeVtables()
+        PyMem_Free(self.vtable_index)
+
+    cdef void freeVtables(self):
         if self.current_vtable != NULL:
             PyMem_Free(self.current_vtable)
             self.current_vtable = NULL
             self.current_vtable_length = 0
         while self.vtables is not NULL:
             next = self.vtables.next
+            # Emptying the slots one by one keeps clearing proportional
+            # to the number of vtables, not to the size of the index.
+            self.vtable_index[self.vtables.slot] = NULL
             PyMem_Free(self.vtables.vtable)
             PyMem_Free(self.vtables)
             self.vtables = next
+        self.vtable_count = 0
+
+    cdef StoredVtable* findVtable(self, const unsigned char* vtable, uint32_t num_fields, uint64_t h):
+        """Look up a stored vtable equal to `vtable`, or return NULL."""
+        cdef Py_ssize_t mask, slot
+        cdef StoredVtable* svt
+        if self.vtable_index is NULL:
+            return NULL
+        mask = self.vtable_index_size - 1
+        slot = h & mask
+        while True:
+            svt = self.vtable_index[slot]
+            if svt is NULL:
+                return NULL
+            if (svt.hash == h and svt.num_fields == num_fields and
+                memcmp(vtable, svt.vtable, sizeof(uint16_t) * num_fields) == 0):
+                return svt
+            slot = (slot + 1) & mask
+
+    cdef inline void indexVtable(self, StoredVtable* svt):
+        """Insert `svt` into the index, which must have a free slot."""
+        cdef Py_ssize_t mask = self.vtable_index_size - 1
+        cdef Py_ssize_t slot = svt.hash & mask
+        while self.vtable_index[slot] is not NULL:
+            slot = (slot + 1) & mask
+        self.vtable_index[slot] = svt
+        svt.slot = slot
+
+    cdef int storeVtable(self, StoredVtable* svt) except -1:
+        """Add `svt` to the stored vtables, growing the index to keep its
+        load factor at or under a half."""
+        cdef StoredVtable** index
+        cdef StoredVtable* stored
+        cdef Py_ssize_t size
+        if 2 * (self.vtable_count + 1) > self.vtable_index_size:
+            size = max(MIN_VTABLE_INDEX_SIZE, 2 * self.vtable_index_size)
+            index = <StoredVtable**>PyMem_Malloc(sizeof(StoredVtable*) * size)
+            if index is NULL:
+                raise MemoryError()
+            memset(index, 0, sizeof(StoredVtable*) * size)
+            PyMem_Free(self.vtable_index)
+            self.vtable_index = index
+            self.vtable_index_size = size
+            stored = self.vtables
+            while stored is not NULL:
+                self.indexVtable(stored)
+                stored = stored.next
+        svt.next = self.vtables
+        self.vtables = svt
+        self.indexVtable(svt)
+        self.vtable_count += 1
+        return 0
+
+    cpdef void Clear(self) except *:
+        """Clear resets the Builder, so it can be used to build a new buffer.
+
+        The internal buffer is kept, so no allocations are needed for
+        buffers that fit in it.
+        """
+        self.assertNotExported()
+        memset(&self.buffer[self.head], 0, self.buffer_length - self.head)
+        self.freeVtables()
+        self.head = self.buffer_length
+        self.minalign = 1
+        self.objectEnd = -1
+        self.nested = False
+        self.finished = False
+        self.vectorNumElems = 0
+
+    cpdef void Reset(self, Py_ssize_t maxSize) except *:
+        """Reset clears the Builder, shrinking its buffer to `maxSize` bytes
+        if it has grown larger.
+
+        This keeps builders that are reused from holding on to the memory
+        needed for an occasional large buffer.
+        """
+        cdef unsigned char* buffer
+        self.assertNotExported()
+        if self.buffer_length <= maxSize:
+            self.Clear()
+            self.shrinkVtableIndex()
+            return
+        if maxSize < 0:
+            raise BuilderSizeError("flatbuffers: Cannot shrink Builder below 0 bytes.")
+        buffer = <unsigned char*>PyMem_Malloc(sizeof(unsigned char) * maxSize)
+        if buffer is NULL:
+            raise MemoryError()
+        PyMem_Free(self.buffer)
+        self.buffer = buffer
+        self.buffer_length = maxSize
+        # Clearing zeroes the buffer from the head onwards.
+        self.head = 0
+        self.Clear()
+        self.shrinkVtableIndex()
+
+    cdef inline void shrinkVtableIndex(self):
+        """Drop the vtable index if it has grown large. Must be empty."""
+        if self.vtable_index_size > MAX_KEPT_VTABLE_INDEX_SIZE:
+            PyMem_Free(self.vtable_index)
+            self.vtable_index = NULL
+            self.vtable_index_size = 0
 
     def Output(self):
         """Return the portion of the buffer that has been used for writing data.
@@ -279,6 +488,36 @@ cdef class Builder(object):
 
         return res
 
+    def __getbuffer__(self, Py_buffer* view, int flags):
+        """Expose the finished buffer, like `Output` but without copying.
+
+        The builder cannot be cleared or grown while the buffer is exported.
+        """
+        if not self.finished:
+            raise BuilderNotFinishedError()
+        PyBuffer_FillInfo(
+            view,
+            self,
+            &self.buffer[self.head],
+            self.buffer_length - self.head,
+            1,
+            flags,
+        )
+        self.exports += 1
+
+    def __releasebuffer__(self, Py_buffer* view):
+        self.exports -= 1
+
+    cdef void assertNotExported(self):
+        """
+        Check that the buffer is not exported, since exported memory
+        can be neither moved nor overwritten.
+        """
+        if self.exports:
+            raise BufferError(
+                "flatbuffers: Builder cannot be modified while its buffer is exported."
+            )
+
     @property
     def Bytes(self):
         return self.buffer[0:self.buffer_length]
@@ -297,13 +536,13 @@ cdef class Builder(object):
         self.objectEnd = self.Offset()
         self.nested = True
 
-    cdef Py_ssize_t WriteVtable(self):
+    cdef Py_ssize_t WriteVtable(self) except -1:
         """
         WriteVtable serializes the vtable for the current object, if needed.
 
         Before writing out the vtable, this checks pre-existing vtables for
-        equality to this one. If an equal vtable is found, point the object to
-        the existing vtable and return.
+        equality to this one, using a hash index over them. If an equal vtable
+        is found, point the object to the existing vtable and return.
 
         Because vtable values are sensitive to alignment of object data, not
         all logically-equal vtables will be deduplicated.
@@ -322,6 +561,7 @@ cdef class Builder(object):
         cdef Py_ssize_t objectOffset, i, off, objectSize, objectStart, vBytes
         cdef Py_ssize_t effective_vtable_length, vtable_offset
         cdef StoredVtable* svt
+        cdef uint64_t h
 
         # Prepend a zero scalar to the object. Later in this function we'll
         # write an offset here that points to the object's vtable:
@@ -341,6 +581,8 @@ cdef class Builder(object):
         i = effective_vtable_length - 1
         cdef Py_ssize_t norm_vtable_length = sizeof(uint16_t) * effective_vtable_length
         norm_vtable = <unsigned char*>PyMem_Malloc(norm_vtable_length)
+        if norm_vtable is NULL:
+            raise MemoryError()
         while i >= 0:
             off = 0
             if self.current_vtable[i] != 0:
@@ -352,12 +594,8 @@ cdef class Builder(object):
             i -= 1
 
         # Check if this vtable has been seen already.
-        svt = self.vtables
-        while svt is not NULL:
-            if (svt.num_fields == effective_vtable_length and
-                memcmp(norm_vtable, svt.vtable, norm_vtable_length) == 0):
-                break
-            svt = svt.next
+        h = hashVtable(norm_vtable, norm_vtable_length)
+        svt = self.findVtable(norm_vtable, effective_vtable_length, h)
 
         if svt is not NULL:
             PyMem_Free(self.current_vtable)
@@ -403,11 +641,14 @@ cdef class Builder(object):
         # Finally, store this vtable in memory for future
         # deduplication:
         svt = <StoredVtable*>PyMem_Malloc(sizeof(StoredVtable))
+        if svt is NULL:
+            PyMem_Free(norm_vtable)
+            raise MemoryError()
         svt.num_fields = effective_vtable_length
         svt.vtable = norm_vtable
-        svt.next = self.vtables
         svt.offset = self.Offset()
-        self.vtables = svt
+        svt.hash = h
+        self.storeVtable(svt)
 
         PyMem_Free(self.current_vtable)
         self.current_vtable = NULL
@@ -424,6 +665,7 @@ cdef class Builder(object):
         """Doubles the size of the byteslice, and copies the old data towards
            the end of the new buffer (since we build the buffer backwards)."""
         cdef Py_ssize_t newSize
+        self.assertNotExported()
         if self.buffer_length == MAX_BUFFER_SIZE:
             msg = "flatbuffers: cannot grow buffer beyond 2 gigabytes"
             raise BuilderSizeError(msg)
@@ -571,6 +813,128 @@ cdef class Builder(object):
 
         return self.EndVector()
 
+    def CreateNumpyVector(self, x):
+        """CreateNumpyVector writes a numpy array into the buffer.
+
+        Any one-dimensional, C-contiguous object supporting the buffer
+        protocol can be written. The data is copied with a single `memcpy`,
+        unless it needs to be byteswapped to little-endian first.
+        """
+        cdef Py_buffer view
+
+        PyObject_GetBuffer(x, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT)
+        try:
+            if view.ndim > 1:
+                raise TypeError("multidimensional-ndarray passed to CreateNumpyVector")
+            self.WriteBuffer(
+                &view, view.format[0] == b'>' or view.format[0] == b'!'
+            )
+        finally:
+            PyBuffer_Release(&view)
+        return self.EndVector()
+
+    def CreateScalarVector(self, str type, x):
+        """CreateScalarVector writes a vector of scalars into the buffer.
+
+        `type` is the name of the scalar type, like `"Float32"`. Buffers
+        (`bytes`, `array.array`, NumPy arrays...) with items of the same size
+        and kind are copied with a single `memcpy`, unless they need to be
+        byteswapped to little-endian first. Other iterables are written
+        like with the `Prepend` methods, but aligned and grown only once.
+        """
+        cdef FlatbufferType* fb_type = scalarType(type)
+        cdef Py_buffer view
+        cdef bint swap = False
+        cdef list items
+        cdef Py_ssize_t i
+
+        if PyObject_CheckBuffer(x):
+            PyObject_GetBuffer(x, &view, PyBUF_RECORDS_RO)
+            try:
+                # Anything else gets iterated over instead.
+                if PyBuffer_IsContiguous(&view, b'C') and bufferMatches(
+                    &view, fb_type, &swap
+                ):
+                    self.WriteBuffer(&view, swap)
+                    return self.EndVector()
+            finally:
+                PyBuffer_Release(&view)
+
+        items = x if isinstance(x, list) else list(x)
+        self.StartVector(fb_type.bytewidth, len(items), fb_type.bytewidth)
+        if fb_type == &Fb_float32_t:
+            for i in range(len(items) - 1, -1, -1):
+                self.head = self.head - Fb_float32_t.bytewidth
+                writeFloat32(items[i], self.buffer, self.head)
+        elif fb_type == &Fb_float64_t:
+            for i in range(len(items) - 1, -1, -1):
+                self.head = self.head - Fb_float64_t.bytewidth
+                writeFloat64(items[i], self.buffer, self.head)
+        elif fb_type == &Fb_uint64_t:
+            for i in range(len(items) - 1, -1, -1):
+                self.Place(items[i], fb_type)
+        else:
+            # Like `Prepend`, which goes through an `int64_t`.
+            for i in range(len(items) - 1, -1, -1):
+                self.Place(<int64_t>items[i], fb_type)
+        return self.EndVector()
+
+    def CreateStruct(self, Py_ssize_t alignment, bytes data):
+        """CreateStruct writes a packed struct inline, aligned to `alignment`.
+
+        `data` holds the whole struct, including any padding. Use the
+        returned offset with `PrependStructSlot` right away.
+        """
+        cdef Py_ssize_t size = len(data)
+        self.Prep(alignment, size)
+        self.head = self.head - size
+        memcpy(&self.buffer[self.head], <const char*>data, size)
+        return self.Offset()
+
+    def CreateStructVector(self, Py_ssize_t size, Py_ssize_t alignment, data):
+        """CreateStructVector writes a vector of packed structs of `size`
+        bytes each, laid out contiguously in `data`.
+
+        `data` can be any C-contiguous buffer, like `bytes` or a NumPy
+        structured array, and is copied with a single `memcpy`.
+        """
+        cdef Py_buffer view
+        cdef Py_ssize_t length
+
+        PyObject_GetBuffer(data, &view, PyBUF_C_CONTIGUOUS)
+        try:
+            length = view.len
+            if size <= 0 or length % size:
+                raise ValueError(
+                    "flatbuffers: struct vector data has an invalid length."
+                )
+            self.StartVector(size, length // size, alignment)
+            self.head = self.head - length
+            memcpy(&self.buffer[self.head], view.buf, length)
+        finally:
+            PyBuffer_Release(&view)
+        return self.EndVector()
+
+    cdef void WriteBuffer(self, Py_buffer* view, bint swap) except *:
+        """
+        WriteBuffer starts a vector holding the items of a one-dimensional
+        buffer, byteswapping them if needed. Call `EndVector` afterwards.
+        """
+        cdef Py_ssize_t i, j, itemsize = view.itemsize
+        cdef unsigned char* dest
+        cdef const unsigned char* src = <const unsigned char*>view.buf
+
+        self.StartVector(itemsize, view.len // itemsize, itemsize)
+        self.head = self.head - view.len
+        dest = &self.buffer[self.head]
+        if swap:
+            for i in range(0, view.len, itemsize):
+                for j in range(itemsize):
+                    dest[i + j] = src[i + itemsize - 1 - j]
+        else:
+            memcpy(dest, src, view.len)
+        self.vectorNumElems = view.len // itemsize
+
     cdef void assertNested(self) except *:
         """
         Check that we are in the process of building an object.
@@ -701,7 +1065,7 @@ cdef class Builder(object):
             self.PrependUOffsetTRelative(x)
             self.Slot(o)
 
-    cdef PrependStructSlot(self, v, x, d):
+    def PrependStructSlot(self, Py_ssize_t v, Py_ssize_t x, Py_ssize_t d):
         """
         PrependStructSlot prepends a struct onto the object at vtable slot `o`.
         Structs are stored inline, so nothing additional is being added.
@@ -852,3 +1216,49 @@ cdef class Builder(object):
         self.head = self.head - Fb_uint32_t.bytewidth
         #Write(uoffset, self.Bytes, self.head, x)
         writeUint32(x, self.buffer, self.head)
+
+
+cdef class BuilderPool:
+    """A per-thread pool of reusable builders.
+
+    Builders are cleared when they are released back to the pool. Builders
+    that grew larger than `max_size` bytes are shrunk back down, so a single
+    large buffer doesn't pin its memory forever.
+    """
+    cdef readonly Py_ssize_t initial_size
+    cdef readonly Py_ssize_t max_size
+    cdef readonly Py_ssize_t max_builders
+    cdef object local
+
+    def __init__(
+        self,
+        Py_ssize_t initial_size=10000,
+        Py_ssize_t max_size=1024 * 1024,
+        Py_ssize_t max_builders=4,
+    ):
+        self.initial_size = initial_size
+        self.max_size = max_size
+        self.max_builders = max_builders
+        self.local = local()
+
+    cdef list builders(self):
+        cdef list res
+        try:
+            return self.local.builders
+        except AttributeError:
+            res = self.local.builders = []
+            return res
+
+    cpdef Builder acquire(self):
+        """Take a builder from this thread's pool, or create a new one."""
+        cdef list builders = self.builders()
+        if builders:
+            return builders.pop()
+        return Builder(self.initial_size)
+
+    cpdef void release(self, Builder builder) except *:
+        """Return a builder to this thread's pool."""
+        cdef list builders = self.builders()
+        if len(builders) < self.max_builders:
+            builder.Reset(self.max_size)
+            builders.append(builder)
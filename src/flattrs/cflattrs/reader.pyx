@@ -0,0 +1,307 @@
+#cython: language_level=3
+"""A Cython counterpart to `flatbuffers.table.Table`."""
+from cpython.buffer cimport PyBUF_SIMPLE, PyBuffer_Release, PyObject_GetBuffer
+from cpython.bytes cimport PyBytes_FromStringAndSize
+from cpython.unicode cimport PyUnicode_DecodeUTF8
+from libc.stdint cimport (
+    int8_t,
+    int16_t,
+    int32_t,
+    int64_t,
+    uint8_t,
+    uint16_t,
+    uint32_t,
+    uint64_t,
+)
+
+
+cdef inline uint16_t readUint16(const unsigned char* buffer, Py_ssize_t head) noexcept:
+    return buffer[head] | (<uint16_t>buffer[head+1] << 8)
+
+
+cdef inline uint32_t readUint32(const unsigned char* buffer, Py_ssize_t head) noexcept:
+    return (
+        buffer[head]
+        | (<uint32_t>buffer[head+1] << 8)
+        | (<uint32_t>buffer[head+2] << 16)
+        | (<uint32_t>buffer[head+3] << 24)
+    )
+
+
+cdef inline uint64_t readUint64(const unsigned char* buffer, Py_ssize_t head) noexcept:
+    return readUint32(buffer, head) | (<uint64_t>readUint32(buffer, head+4) << 32)
+
+
+cdef union uint32_to_float:
+    uint32_t i
+    float f
+
+
+cdef union uint64_to_double:
+    uint64_t i
+    double d
+
+
+cdef inline float readFloat32(const unsigned char* buffer, Py_ssize_t head) noexcept:
+    cdef uint32_to_float t
+    t.i = readUint32(buffer, head)
+    return t.f
+
+
+cdef inline double readFloat64(const unsigned char* buffer, Py_ssize_t head) noexcept:
+    cdef uint64_to_double t
+    t.i = readUint64(buffer, head)
+    return t.d
+
+
+cdef class _Buffer:
+    """Owns the `Py_buffer` shared by all tables reading the same payload."""
+    cdef Py_buffer view
+    cdef readonly object obj
+
+    def __cinit__(self, obj):
+        PyObject_GetBuffer(obj, &self.view, PyBUF_SIMPLE)
+        self.obj = obj
+
+    def __dealloc__(self):
+        PyBuffer_Release(&self.view)
+
+
+cdef class Table:
+    """Table wraps a buffer and provides read access to its data.
+
+    A replacement for `flatbuffers.table.Table`. Any object supporting the
+    buffer protocol can be read from. In addition to the `flatbuffers` API,
+    typed getters (`GetUint8`, `GetFloat32Slot`...) read scalars directly,
+    without going through `struct`.
+
+    All reads are bounds-checked and raise `IndexError` when they would
+    reach outside of the buffer.
+
+    The variable `Pos` indicates the root of the FlatBuffers object therein.
+    """
+    cdef _Buffer buffer
+    cdef const unsigned char* data
+    cdef Py_ssize_t length
+    cdef public Py_ssize_t Pos
+
+    def __init__(self, buf, Py_ssize_t pos):
+        self.buffer = _Buffer(buf)
+        self.data = <const unsigned char*>self.buffer.view.buf
+        self.length = self.buffer.view.len
+        self.Pos = pos
+
+    @property
+    def Bytes(self):
+        return self.buffer.obj
+
+    cdef inline int check(self, Py_ssize_t off, Py_ssize_t size) except -1:
+        if off < 0 or off + size > self.length:
+            raise IndexError(f"flatbuffers: read of {size} bytes at {off} is out of range.")
+        return 0
+
+    cdef inline Py_ssize_t offset(self, Py_ssize_t vtableOffset) except -1:
+        cdef Py_ssize_t vtable, vtableEnd
+        self.check(self.Pos, 4)
+        vtable = self.Pos - <int32_t>readUint32(self.data, self.Pos)
+        self.check(vtable, 2)
+        vtableEnd = readUint16(self.data, vtable)
+        if vtableOffset < vtableEnd:
+            self.check(vtable + vtableOffset, 2)
+            return readUint16(self.data, vtable + vtableOffset)
+        return 0
+
+    cdef inline Py_ssize_t indirect(self, Py_ssize_t off) except -1:
+        self.check(off, 4)
+        return off + readUint32(self.data, off)
+
+    cpdef Table SubTable(self, Py_ssize_t pos):
+        """Create a table at `pos`, sharing this table's buffer."""
+        cdef Table res = Table.__new__(Table)
+        res.buffer = self.buffer
+        res.data = self.data
+        res.length = self.length
+        res.Pos = pos
+        return res
+
+    def Offset(self, Py_ssize_t vtableOffset):
+        """Offset provides access into the Table's vtable.
+
+        Deprecated fields are ignored by checking the vtable's length."""
+        return self.offset(vtableOffset)
+
+    def Indirect(self, Py_ssize_t off):
+        """Indirect retrieves the relative offset stored at `offset`."""
+        return self.indirect(off)
+
+    def String(self, Py_ssize_t off):
+        """String gets a string from data stored inside the flatbuffer."""
+        cdef Py_ssize_t length
+        off = self.indirect(off)
+        self.check(off, 4)
+        length = readUint32(self.data, off)
+        self.check(off + 4, length)
+        return PyBytes_FromStringAndSize(<const char*>&self.data[off + 4], length)
+
+    def DecodeString(self, Py_ssize_t off):
+        """DecodeString decodes a UTF-8 string stored inside the flatbuffer.
+
+        Unlike `String().decode()`, no intermediate `bytes` is created.
+        """
+        cdef Py_ssize_t length
+        off = self.indirect(off)
+        self.check(off, 4)
+        length = readUint32(self.data, off)
+        self.check(off + 4, length)
+        return PyUnicode_DecodeUTF8(<const char*>&self.data[off + 4], length, NULL)
+
+    def VectorLen(self, Py_ssize_t off):
+        """VectorLen retrieves the length of the vector whose offset is stored
+           at "off" in this object."""
+        off = self.indirect(off + self.Pos)
+        self.check(off, 4)
+        return readUint32(self.data, off)
+
+    def Vector(self, Py_ssize_t off):
+        """Vector retrieves the start of data of the vector whose offset is
+           stored at "off" in this object."""
+        return self.indirect(off + self.Pos) + 4
+
+    def Union(self, Table t2, Py_ssize_t off):
+        """Union initializes any Table-derived type to point to the union at
+           the given offset."""
+        t2.buffer = self.buffer
+        t2.data = self.data
+        t2.length = self.length
+        t2.Pos = self.indirect(off + self.Pos)
+
+    def Get(self, flags, Py_ssize_t off):
+        """
+        Get retrieves a value of the type specified by `flags`  at the
+        given offset.
+        """
+        return flags.py_type(flags.packer_type.unpack_from(self.buffer.obj, off)[0])
+
+    def GetBool(self, Py_ssize_t off):
+        self.check(off, 1)
+        return self.data[off] != 0
+
+    def GetUint8(self, Py_ssize_t off):
+        self.check(off, 1)
+        return self.data[off]
+
+    def GetUint16(self, Py_ssize_t off):
+        self.check(off, 2)
+        return readUint16(self.data, off)
+
+    def GetUint32(self, Py_ssize_t off):
+        self.check(off, 4)
+        return readUint32(self.data, off)
+
+    def GetUint64(self, Py_ssize_t off):
+        self.check(off, 8)
+        return readUint64(self.data, off)
+
+    def GetInt8(self, Py_ssize_t off):
+        self.check(off, 1)
+        return <int8_t>self.data[off]
+
+    def GetInt16(self, Py_ssize_t off):
+        self.check(off, 2)
+        return <int16_t>readUint16(self.data, off)
+
+    def GetInt32(self, Py_ssize_t off):
+        self.check(off, 4)
+        return <int32_t>readUint32(self.data, off)
+
+    def GetInt64(self, Py_ssize_t off):
+        self.check(off, 8)
+        return <int64_t>readUint64(self.data, off)
+
+    def GetFloat32(self, Py_ssize_t off):
+        self.check(off, 4)
+        return readFloat32(self.data, off)
+
+    def GetFloat64(self, Py_ssize_t off):
+        self.check(off, 8)
+        return readFloat64(self.data, off)
+
+    # The slot getters combine `Offset` and a typed getter, returning `d`
+    # if the field is absent from the vtable.
+
+    def GetBoolSlot(self, Py_ssize_t slot, d):
+        cdef Py_ssize_t o = self.offset(slot)
+        if o == 0:
+            return d
+        self.check(self.Pos + o, 1)
+        return self.data[self.Pos + o] != 0
+
+    def GetUint8Slot(self, Py_ssize_t slot, d):
+        cdef Py_ssize_t o = self.offset(slot)
+        if o == 0:
+            return d
+        self.check(self.Pos + o, 1)
+        return self.data[self.Pos + o]
+
+    def GetUint16Slot(self, Py_ssize_t slot, d):
+        cdef Py_ssize_t o = self.offset(slot)
+        if o == 0:
+            return d
+        self.check(self.Pos + o, 2)
+        return readUint16(self.data, self.Pos + o)
+
+    def GetUint32Slot(self, Py_ssize_t slot, d):
+        cdef Py_ssize_t o = self.offset(slot)
+        if o == 0:
+            return d
+        self.check(self.Pos + o, 4)
+        return readUint32(self.data, self.Pos + o)
+
+    def GetUint64Slot(self, Py_ssize_t slot, d):
+        cdef Py_ssize_t o = self.offset(slot)
+        if o == 0:
+            return d
+        self.check(self.Pos + o, 8)
+        return readUint64(self.data, self.Pos + o)
+
+    def GetInt8Slot(self, Py_ssize_t slot, d):
+        cdef Py_ssize_t o = self.offset(slot)
+        if o == 0:
+            return d
+        self.check(self.Pos + o, 1)
+        return <int8_t>self.data[self.Pos + o]
+
+    def GetInt16Slot(self, Py_ssize_t slot, d):
+        cdef Py_ssize_t o = self.offset(slot)
+        if o == 0:
+            return d
+        self.check(self.Pos + o, 2)
+        return <int16_t>readUint16(self.data, self.Pos + o)
+
+    def GetInt32Slot(self, Py_ssize_t slot, d):
+        cdef Py_ssize_t o = self.offset(slot)
+        if o == 0:
+            return d
+        self.check(self.Pos + o, 4)
+        return <int32_t>readUint32(self.data, self.Pos + o)
+
+    def GetInt64Slot(self, Py_ssize_t slot, d):
+        cdef Py_ssize_t o = self.offset(slot)
+        if o == 0:
+            return d
+        self.check(self.Pos + o, 8)
+        return <int64_t>readUint64(self.data, self.Pos + o)
+
+    def GetFloat32Slot(self, Py_ssize_t slot, d):
+        cdef Py_ssize_t o = self.offset(slot)
+        if o == 0:
+            return d
+        self.check(self.Pos + o, 4)
+        return readFloat32(self.data, self.Pos + o)
+
+    def GetFloat64Slot(self, Py_ssize_t slot, d):
+        cdef Py_ssize_t o = self.offset(slot)
+        if o == 0:
+            return d
+        self.check(self.Pos + o, 8)
+        return readFloat64(self.data, self.Pos + o)
@@ -0,0 +1,234 @@
+#cython: language_level=3
+"""A Cython flatbuffer verifier, driven by table schemas.
+
+Modeled after the C++ `flatbuffers::Verifier`.
+"""
+from cpython.buffer cimport PyBUF_SIMPLE, PyBuffer_Release, PyObject_GetBuffer
+from cpython.mem cimport PyMem_Free, PyMem_Malloc
+from libc.stdint cimport int32_t, uint16_t, uint32_t
+
+from flattrs._verifier import VerificationError
+
+# Field kinds, keep in sync with `flattrs._verifier`.
+cdef enum:
+    SCALAR = 0
+    STRING = 1
+    VECTOR = 2
+    TABLE = 3
+    STRING_VECTOR = 4
+    TABLE_VECTOR = 5
+    UNION = 6
+    NESTED = 7
+
+
+cdef inline uint16_t readUint16(const unsigned char* buffer, Py_ssize_t head) noexcept:
+    return buffer[head] | (<uint16_t>buffer[head+1] << 8)
+
+
+cdef inline uint32_t readUint32(const unsigned char* buffer, Py_ssize_t head) noexcept:
+    return (
+        buffer[head]
+        | (<uint32_t>buffer[head+1] << 8)
+        | (<uint32_t>buffer[head+2] << 16)
+        | (<uint32_t>buffer[head+3] << 24)
+    )
+
+
+cdef class TableSchema:
+    """The fields of a table, as needed by the verifier.
+
+    Fields are `(kind, voffset, size, required, child)` tuples.
+    `child` is the schema of nested tables and nested flatbuffers, or a
+    dictionary of schemas keyed by union type for unions.
+    """
+    cdef Py_ssize_t num_fields
+    cdef int* kinds
+    cdef Py_ssize_t* voffsets
+    cdef Py_ssize_t* sizes
+    cdef bint* required
+    cdef list children
+
+    def __init__(self, list fields):
+        cdef Py_ssize_t i
+        self.num_fields = len(fields)
+        self.kinds = <int*>PyMem_Malloc(sizeof(int) * self.num_fields)
+        self.voffsets = <Py_ssize_t*>PyMem_Malloc(sizeof(Py_ssize_t) * self.num_fields)
+        self.sizes = <Py_ssize_t*>PyMem_Malloc(sizeof(Py_ssize_t) * self.num_fields)
+        self.required = <bint*>PyMem_Malloc(sizeof(bint) * self.num_fields)
+        if (
+            self.kinds is NULL
+            or self.voffsets is NULL
+            or self.sizes is NULL
+            or self.required is NULL
+        ):
+            raise MemoryError()
+        self.children = []
+        for i, (kind, voffset, size, required, child) in enumerate(fields):
+            self.kinds[i] = kind
+            self.voffsets[i] = voffset
+            self.sizes[i] = size
+            self.required[i] = required
+            self.children.append(child)
+
+    def __dealloc__(self):
+        PyMem_Free(self.kinds)
+        PyMem_Free(self.voffsets)
+        PyMem_Free(self.sizes)
+        PyMem_Free(self.required)
+
+    @property
+    def fields(self):
+        return [
+            (self.kinds[i], self.voffsets[i], self.sizes[i], self.required[i], self.children[i])
+            for i in range(self.num_fields)
+        ]
+
+
+cdef class _Verifier:
+    cdef const unsigned char* data
+    cdef Py_ssize_t length
+    cdef Py_ssize_t depth
+    cdef Py_ssize_t max_depth
+    cdef Py_ssize_t num_tables
+    cdef Py_ssize_t max_tables
+
+    cdef inline int check(self, Py_ssize_t pos, Py_ssize_t size) except -1:
+        if pos < 0 or size > self.length or pos > self.length - size:
+            raise VerificationError(f"flatbuffers: {size} bytes at {pos} are out of range.")
+        return 0
+
+    cdef Py_ssize_t offset(self, Py_ssize_t pos) except -1:
+        cdef uint32_t o
+        self.check(pos, 4)
+        o = readUint32(self.data, pos)
+        if o == 0:
+            raise VerificationError(f"flatbuffers: null offset at {pos}.")
+        self.check(pos + o, 1)
+        return pos + o
+
+    cdef Py_ssize_t vector(self, Py_ssize_t pos, Py_ssize_t elem_size) except -1:
+        cdef Py_ssize_t n
+        self.check(pos, 4)
+        n = readUint32(self.data, pos)
+        self.check(pos + 4, n * elem_size)
+        return n
+
+    cdef int string(self, Py_ssize_t pos) except -1:
+        cdef Py_ssize_t end = pos + 4 + self.vector(pos, 1)
+        self.check(end, 1)
+        if self.data[end] != 0:
+            raise VerificationError(f"flatbuffers: string at {pos} is not null-terminated.")
+        return 0
+
+    cdef int table(self, TableSchema schema, Py_ssize_t pos) except -1:
+        cdef Py_ssize_t vtable, vsize, voffset, fo, field, vec, i, j, n
+        cdef int kind
+        cdef uint16_t union_type
+        cdef dict union_schemas
+
+        self.depth += 1
+        self.num_tables += 1
+        if self.depth > self.max_depth:
+            raise VerificationError("flatbuffers: maximum depth exceeded.")
+        if self.num_tables > self.max_tables:
+            raise VerificationError("flatbuffers: maximum number of tables exceeded.")
+        self.check(pos, 4)
+        vtable = pos - <int32_t>readUint32(self.data, pos)
+        self.check(vtable, 4)
+        vsize = readUint16(self.data, vtable)
+        if vsize < 4 or vsize & 1:
+            raise VerificationError(f"flatbuffers: invalid vtable at {vtable}.")
+        self.check(vtable, vsize)
+        self.check(pos, readUint16(self.data, vtable + 2))
+
+        for i in range(schema.num_fields):
+            kind = schema.kinds[i]
+            voffset = schema.voffsets[i]
+            fo = readUint16(self.data, vtable + voffset) if voffset < vsize else 0
+            if kind == UNION:
+                union_type = 0
+                if fo != 0:
+                    self.check(pos + fo, 1)
+                    union_type = self.data[pos + fo]
+                if union_type == 0:
+                    if schema.required[i]:
+                        raise VerificationError(
+                            f"flatbuffers: required union at {voffset} is missing."
+                        )
+                    continue
+                union_schemas = schema.children[i]
+                if union_type not in union_schemas:
+                    raise VerificationError(f"flatbuffers: unknown union type {union_type}.")
+                voffset += 2
+                fo = readUint16(self.data, vtable + voffset) if voffset < vsize else 0
+                if fo == 0:
+                    raise VerificationError(f"flatbuffers: union value at {voffset} is missing.")
+                self.table(union_schemas[union_type], self.offset(pos + fo))
+                continue
+            if fo == 0:
+                if schema.required[i]:
+                    raise VerificationError(
+                        f"flatbuffers: required field at {voffset} is missing."
+                    )
+                continue
+            field = pos + fo
+            if kind == SCALAR:
+                self.check(field, schema.sizes[i])
+            elif kind == STRING:
+                self.string(self.offset(field))
+            elif kind == VECTOR:
+                self.vector(self.offset(field), schema.sizes[i])
+            elif kind == TABLE:
+                self.table(schema.children[i], self.offset(field))
+            elif kind == STRING_VECTOR:
+                vec = self.offset(field)
+                n = self.vector(vec, 4)
+                for j in range(n):
+                    self.string(self.offset(vec + 4 + 4 * j))
+            elif kind == TABLE_VECTOR:
+                vec = self.offset(field)
+                n = self.vector(vec, 4)
+                for j in range(n):
+                    self.table(schema.children[i], self.offset(vec + 4 + 4 * j))
+            elif kind == NESTED:
+                vec = self.offset(field)
+                self.nested(schema.children[i], vec + 4, self.vector(vec, 1))
+        self.depth -= 1
+        return 0
+
+    cdef int nested(self, TableSchema schema, Py_ssize_t start, Py_ssize_t size) except -1:
+        """Verify a nested flatbuffer as a buffer of its own, like `VerifyNestedFlatBuffer`."""
+        cdef _Verifier verifier = _Verifier.__new__(_Verifier)
+        verifier.data = self.data + start
+        verifier.length = size
+        verifier.depth = self.depth
+        verifier.max_depth = self.max_depth
+        verifier.num_tables = self.num_tables
+        verifier.max_tables = self.max_tables
+        verifier.table(schema, verifier.offset(0))
+        self.num_tables = verifier.num_tables
+        return 0
+
+
+def verify(
+    TableSchema schema,
+    buf,
+    Py_ssize_t offset=0,
+    Py_ssize_t max_depth=64,
+    Py_ssize_t max_tables=1000000,
+):
+    """Verify `buf` holds a table described by `schema`, with its root at `offset`.
+
+    Raises `VerificationError` if it doesn't.
+    """
+    cdef Py_buffer view
+    cdef _Verifier verifier = _Verifier.__new__(_Verifier)
+    PyObject_GetBuffer(buf, &view, PyBUF_SIMPLE)
+    try:
+        verifier.data = <const unsigned char*>view.buf
+        verifier.length = view.len
+        verifier.max_depth = max_depth
+        verifier.max_tables = max_tables
+        verifier.table(schema, verifier.offset(offset))
+    finally:
+        PyBuffer_Release(&view)
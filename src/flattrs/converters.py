@@ -1,110 +1,668 @@
 import hashlib
 import linecache
+import marshal
 import struct
-from functools import cache
-from typing import Any, Callable, Final, TypeAlias, TypeVar
-
-from attrs import NOTHING, AttrsInstance, Factory, define, fields
-from flatbuffers.number_types import (
-    BoolFlags,
-    Float32Flags,
-    Float64Flags,
-    Int8Flags,
-    Int16Flags,
-    Int32Flags,
-    Int64Flags,
-    Uint8Flags,
-    Uint16Flags,
-    Uint32Flags,
-    Uint64Flags,
+import sys
+from ast import literal_eval
+from concurrent.futures import Future
+from enum import IntEnum
+from functools import cache, partial
+from importlib import import_module
+from importlib.metadata import PackageNotFoundError, version
+from itertools import starmap
+from operator import attrgetter, itemgetter
+from os import getpid, replace
+from pathlib import Path
+from threading import Thread
+from time import perf_counter
+from types import CodeType, FunctionType, MemberDescriptorType, ModuleType
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Final,
+    Iterable,
+    Iterator,
+    Mapping,
+    TypeAlias,
+    TypeVar,
 )
-from flatbuffers.table import Table
 
-from ._analysis import FlatbufferTable, analyze
+from attrs import NOTHING, AttrsInstance, Factory, define, field, fields, has
+
+from ._analysis import FlatbufferStruct, FlatbufferTable, analyze, analyze_struct
 from ._consts import (
+    HELPER_TYPE_TO_SCALAR_TYPE,
     SCALAR_TYPE_TO_DEFAULT,
-    SCALAR_TYPE_TO_PYTHON,
+    SCALAR_TYPE_TO_DTYPE,
     SCALAR_TYPE_TO_WIDTH,
     NoneType,
 )
-from ._types import ScalarType
-from .types import UnionVal
-from .typing import get_annotation_and_base
+from ._types import (
+    FieldName,
+    Projection,
+    ReadableBuffer,
+    ScalarType,
+    UnknownEnums,
+    WritableBuffer,
+)
+from ._verifier import (
+    NESTED,
+    SCALAR,
+    STRING,
+    STRING_VECTOR,
+    TABLE,
+    TABLE_VECTOR,
+    UNION,
+    VECTOR,
+)
+from .types import NOT_LOADED, Nested, UnionVal
+from .typing import get_annotation_and_base, is_struct
+
+try:
+    from .cflattrs.builder import Builder, BuilderPool
+except ImportError:  # NOQA
+    from ._builder import Builder, BuilderPool
+
+try:
+    from .cflattrs.reader import Table
+except ImportError:  # NOQA
+    from ._reader import Table
 
 try:
-    from .cflattrs.builder import Builder
+    from .cflattrs.verifier import TableSchema, verify
 except ImportError:  # NOQA
-    from flatbuffers.builder import Builder
+    from ._verifier import TableSchema, verify
+
+try:
+    from .cflattrs.encode import GetVectorAsNumpy
+except ImportError:  # NOQA
+    from flatbuffers.encode import GetVectorAsNumpy
 
 T = TypeVar("T", bound=AttrsInstance)
 AddToBuilder: TypeAlias = Callable[[T, Builder, dict[int, int], dict[int, int]], int]
 start_struct: Final = struct.Struct("<I")
+CODECS_SUFFIX: Final = "_codecs"
+_codecs: dict[str, Callable] = {}
+
+
+@define
+class CodeCache:
+    """An on-disk cache of the code compiled by converters, using `marshal`.
+
+    Later processes load the compiled code instead of compiling it again.
+    Entries are keyed by the generated script, the flattrs version and the
+    Python version, so outdated entries are never used. Loading code from
+    a directory others can write to is unsafe.
+    """
+
+    path: Path = field(converter=Path)
+
+    def load(self, script: str, unique_filename: str) -> CodeType | None:
+        try:
+            data = (self.path / self._key(script, unique_filename)).read_bytes()
+            return marshal.loads(data)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    def store(self, script: str, unique_filename: str, code: CodeType) -> None:
+        target = self.path / self._key(script, unique_filename)
+        temp = target.with_suffix(f".{getpid()}.tmp")
+        try:
+            self.path.mkdir(parents=True, exist_ok=True)
+            temp.write_bytes(marshal.dumps(code))
+            replace(temp, target)
+        except OSError:
+            # The cache is best-effort.
+            temp.unlink(missing_ok=True)
+
+    @staticmethod
+    def _key(script: str, unique_filename: str) -> str:
+        sha1 = hashlib.sha1()
+        for part in (_flattrs_version(), sys.version, unique_filename, script):
+            sha1.update(part.encode("utf-8"))
+            sha1.update(b"\0")
+        return f"{sha1.hexdigest()}.marshal"
 
 
 @define
 class Converter:
-    """A converter for loading and dumping Flatbuffers."""
+    """A converter for loading and dumping Flatbuffers.
+
+    Unless given a builder, `dumps` uses builders from `builder_pool`.
+    If `code_cache` is set, the compiled code is cached on disk there.
+    If `trusted_construction` is set, loaded models are created without
+    calling their `__init__`, skipping validators, converters and
+    `__attrs_post_init__`.
+    `unknown_enums` sets what happens to enum values without members when
+    loading: `"raise"` raises a `ValueError`, `"raw"` keeps the integer
+    and `"default"` uses the field default, or the first member.
+    """
+
+    _builder_pool: BuilderPool = Factory(BuilderPool)
+    _code_cache: CodeCache | None = None
+    _trusted_construction: bool = False
+    _unknown_enums: UnknownEnums = "raise"
 
     _dumps_cache: Callable = Factory(
         lambda self: cache(lambda cls: self.make_dumps(cls)), takes_self=True
     )
     _to_fb_cache: Callable[[type[T]], AddToBuilder] = Factory(
         lambda self: cache(
-            lambda cls: _make_add_to_builder_fn(analyze(cls), self._to_fb_cache)
+            lambda cls: _make_add_to_builder_fn(
+                analyze(cls), self._to_fb_cache, self._code_cache, self._builder_pool
+            )
         ),
         takes_self=True,
     )
-    _from_fb_cache: Callable[[type[T]], Callable] = Factory(
-        lambda self: cache(lambda cls: self._make_from_fb(cls)), takes_self=True
+    _from_fb_cache: Callable[..., Callable] = Factory(
+        lambda self: cache(
+            lambda cls, *projection: self._make_from_fb(cls, *projection)
+        ),
+        takes_self=True,
     )
     _loads_cache: Callable = Factory(
         lambda self: cache(lambda cls: self.make_loads(cls)), takes_self=True
     )
+    _schema_cache: Callable[[type[T]], TableSchema] = Factory(
+        lambda self: cache(
+            lambda cls: make_table_schema(analyze(cls), self._schema_cache)
+        ),
+        takes_self=True,
+    )
+    _verifier_cache: Callable = Factory(
+        lambda self: cache(lambda cls: self.make_verifier(cls)), takes_self=True
+    )
+    _key_search_cache: Callable = Factory(
+        lambda self: cache(lambda cls, field: make_key_search(analyze(cls), field)),
+        takes_self=True,
+    )
+    _view_cache: Callable[[type[T]], type] = Factory(
+        lambda self: cache(
+            lambda cls: make_view_cls(
+                analyze(cls), self._view_cache, self._code_cache, self._unknown_enums
+            )
+        ),
+        takes_self=True,
+    )
 
-    def loads(self, payload: bytes, cl: type[T]) -> T:
-        return self._loads_cache(cl)(payload)
-
-    def dumps(self, model: AttrsInstance, builder: Builder | None = None) -> bytes:
-        return self._dumps_cache(model.__class__)(model, builder)
-
-    def _make_from_fb(self, cl: type[AttrsInstance]) -> Callable:
+    def loads(
+        self,
+        payload: ReadableBuffer,
+        cl: type[T],
+        offset: int = 0,
+        verify: bool = False,
+    ) -> T:
+        """Load a model from any buffer, starting at `offset`.
+
+        The payload is read in place, without being copied into `bytes`.
+        If `verify` is true, the payload is checked first, see `make_verifier`.
+        """
+        if verify:
+            self._verifier_cache(cl)(payload, offset)
+        return self._loads_cache(cl)(payload, offset)
+
+    def dumps(
+        self,
+        model: AttrsInstance,
+        builder: Builder | None = None,
+        size_prefixed: bool = False,
+    ) -> bytes:
+        return self._dumps_cache(model.__class__)(model, builder, size_prefixed)
+
+    def dumps_into(
+        self,
+        model: AttrsInstance,
+        buffer: WritableBuffer,
+        offset: int = 0,
+        size_prefixed: bool = False,
+    ) -> int:
+        """Dump a model into a writable buffer, starting at `offset`.
+
+        The payload is copied straight from the builder into the buffer (a
+        `bytearray`, `mmap`...), without creating intermediate `bytes`.
+        Returns the size of the payload.
+        """
+        builder = self._builder_pool.acquire()
+        try:
+            root = self._to_fb_cache(model.__class__)(model, builder, {}, {})
+            if size_prefixed:
+                builder.FinishSizePrefixed(root)
+            else:
+                builder.Finish(root)
+            with _builder_output(builder) as payload, memoryview(buffer) as target:
+                size = payload.nbytes
+                if not 0 <= offset <= target.nbytes - size:
+                    raise ValueError(
+                        f"flattrs: {size} bytes do not fit into the buffer at offset {offset}."
+                    )
+                target.cast("B")[offset : offset + size] = payload
+        finally:
+            self._builder_pool.release(builder)
+        return size
+
+    def dumps_many(
+        self, models: Iterable[AttrsInstance], concatenate: bool = False
+    ) -> list[bytes] | bytes:
+        """Dump a batch of models, reusing a single builder.
+
+        Every payload is identical to what `dumps` would produce.
+        If `concatenate` is true, the payloads are size-prefixed like with
+        `dumps(size_prefixed=True)`, and joined into a single blob.
+        """
+        builder = self._builder_pool.acquire()
+        strs: dict[str, int] = {}
+        nodes: dict[int, int] = {}
+        res = []
+        last_cls = add_to_builder = None
+        try:
+            for model in models:
+                if model.__class__ is not last_cls:
+                    last_cls = model.__class__
+                    add_to_builder = self._to_fb_cache(last_cls)
+                root = add_to_builder(model, builder, strs, nodes)
+                if concatenate:
+                    builder.FinishSizePrefixed(root)
+                else:
+                    builder.Finish(root)
+                res.append(builder.Output())
+                builder.Clear()
+                strs.clear()
+                nodes.clear()
+        finally:
+            self._builder_pool.release(builder)
+        return b"".join(res) if concatenate else res
+
+    def loads_many(self, payloads: Iterable[ReadableBuffer], cl: type[T]) -> list[T]:
+        """Load a batch of payloads of the same model."""
+        from_fb = self._from_fb_cache(cl)
+        unpack_from = start_struct.unpack_from
+        return [from_fb(Table(p, unpack_from(p, 0)[0])) for p in payloads]
+
+    def iter_loads(self, source: ReadableBuffer | BinaryIO, cl: type[T]) -> Iterator[T]:
+        """Load a stream of size-prefixed payloads of the same model.
+
+        `source` can be a buffer (including an `mmap`), which is read in place
+        from the start, or a binary file, socket or file-like object, which is
+        read one frame at a time.
+        Size-prefixed payloads are produced by `dumps(size_prefixed=True)`,
+        `dumps_many(concatenate=True)` and the writers from `make_writer`.
+        """
+        from_fb = self._from_fb_cache(cl)
+        unpack_from = start_struct.unpack_from
+
+        try:
+            with memoryview(source) as view:
+                end = view.nbytes
+        except TypeError:
+            read = getattr(source, "read", None) or getattr(source, "recv", None)
+            if read is None:
+                raise
+            while header := _read_frame(read, 4):
+                payload = _read_frame(read, unpack_from(header, 0)[0])
+                yield from_fb(Table(payload, unpack_from(payload, 0)[0]))
+        else:
+            offset = 0
+            while offset < end:
+                if offset + 4 > end:
+                    raise ValueError("flattrs: truncated frame.")
+                start = offset + 4
+                offset = start + unpack_from(source, offset)[0]
+                if offset > end:
+                    raise ValueError("flattrs: truncated frame.")
+                yield from_fb(Table(source, start + unpack_from(source, start)[0]))
+
+    def make_writer(self, file: BinaryIO, buffer_size: int = 65536) -> "FramedWriter":
+        """Create a writer appending size-prefixed models to `file`.
+
+        Payloads are accumulated in memory, and written to `file` once
+        more than `buffer_size` bytes are pending.
+        """
+        return FramedWriter(file, self._to_fb_cache, buffer_size)
+
+    def _make_from_fb(
+        self,
+        cl: type[AttrsInstance],
+        include: frozenset[str] | None = None,
+        exclude: frozenset[str] = frozenset(),
+    ) -> Callable:
         """Generate all necessary functions for a class to work with Flatbuffers."""
-        return make_from_fb_fn(analyze(cl), self._from_fb_cache)
+        return make_from_fb_fn(
+            analyze(cl),
+            self._from_fb_cache,
+            include,
+            exclude,
+            self._code_cache,
+            self._trusted_construction,
+            self._unknown_enums,
+        )
 
-    def make_loads(self, cl: type[T]) -> Callable[[bytes], T]:
-        """Prepare a loading function for a model in advance."""
-        from_fb = self._from_fb_cache(cl)
+    def make_loads(
+        self,
+        cl: type[T],
+        include: Iterable[str] | None = None,
+        exclude: Iterable[str] = (),
+    ) -> Callable[[ReadableBuffer, int], T]:
+        """Prepare a loading function for a model in advance.
+
+        The loading function accepts any buffer (`bytes`, `bytearray`,
+        `memoryview`, `mmap`...) and an optional start offset into it.
+
+        `include` and `exclude` restrict the fields that get decoded, and can
+        reach into nested tables using dots: `include=["id", "player.position"]`.
+        Fields that aren't loaded are set to their defaults if they have them,
+        and to `flattrs.NOT_LOADED` otherwise. Projected models are created
+        without going through `__init__`, so validators, converters and
+        `__attrs_post_init__` don't run on them.
+        """
+        if include is None and not exclude:
+            from_fb = self._from_fb_cache(cl)
+        else:
+            from_fb = self._from_fb_cache(
+                cl,
+                frozenset(include) if include is not None else None,
+                frozenset(exclude),
+            )
 
         def loads(
-            data: bytes, _from_fb=from_fb, _unpack_from=start_struct.unpack_from
+            data: ReadableBuffer,
+            offset: int = 0,
+            _from_fb=from_fb,
+            _unpack_from=start_struct.unpack_from,
         ) -> T:
-            start_offset = _unpack_from(data, 0)[0]
-            return _from_fb(Table(data, start_offset))
+            return _from_fb(Table(data, offset + _unpack_from(data, offset)[0]))
 
         return loads
 
-    def make_dumps(self, cl: type[T]) -> Callable[[T, Builder | None], bytes]:
-        """Prepare a dumping function for a model in advance."""
+    def make_view(self, cl: type[T]) -> Callable[[ReadableBuffer, int], Any]:
+        """Prepare a function loading lazy views of a model in advance.
+
+        A view decodes its fields from the payload on first access, and
+        caches them. Tables nested in the view are returned as views too.
+        """
+        view_cls = self._view_cache(cl)
+
+        def view(
+            data: ReadableBuffer,
+            offset: int = 0,
+            _view_cls=view_cls,
+            _unpack_from=start_struct.unpack_from,
+        ) -> Any:
+            return _view_cls(Table(data, offset + _unpack_from(data, offset)[0]))
+
+        return view
+
+    def lookup_by_key(
+        self,
+        data: ReadableBuffer | Any,
+        field: str,
+        key: Any,
+        cl: type[AttrsInstance] | None = None,
+        offset: int = 0,
+    ) -> Any:
+        """Find the table with the given key in a vector of tables.
+
+        `data` is either a view from `make_view`, or a payload of `cl`
+        starting at `offset`. The vector `field` is binary-searched in place,
+        and only the matching table is decoded: as a view if `data` is a view,
+        and as a model otherwise. Returns `None` if no table has that key.
+
+        Vectors are sorted when dumped if their tables have a key field,
+        see `flattrs.KEY`.
+        """
+        view_model = getattr(data.__class__, "__flattrs_model__", None)
+        if view_model is not None:
+            search, elem_cl = self._key_search_cache(view_model, field)
+            found = search(data._tab, key)
+            return self._view_cache(elem_cl)(found) if found is not None else None
+        if cl is None:
+            raise TypeError("flattrs: `cl` is required when looking up in payloads.")
+        search, elem_cl = self._key_search_cache(cl, field)
+        found = search(
+            Table(data, offset + start_struct.unpack_from(data, offset)[0]), key
+        )
+        return self._from_fb_cache(elem_cl)(found) if found is not None else None
+
+    def make_verifier(
+        self, cl: type[T], max_depth: int = 64, max_tables: int = 1000000
+    ) -> Callable[[ReadableBuffer, int], None]:
+        """Prepare a verification function for a model in advance.
 
-        fb_cl = analyze(cl)
+        The verification function checks a payload can be safely loaded as
+        `cl`, and raises `flattrs.VerificationError` if it can't.
+        Offsets, vtables, strings (including their null terminators), vectors
+        and union types are checked to be in range, and required fields to be
+        present. Nesting deeper than `max_depth` tables, or containing more
+        than `max_tables` tables, is rejected. Strings are not validated
+        as UTF-8.
+        """
+        schema = self._schema_cache(cl)
 
-        add_to_builder = _make_add_to_builder_fn(fb_cl, self._to_fb_cache)
+        def verifier(data: ReadableBuffer, offset: int = 0) -> None:
+            verify(schema, data, offset, max_depth, max_tables)
 
-        def dumps(model: T, builder: Builder | None = None) -> bytes:
-            builder = Builder(10000) if builder is None else builder
-            offset = add_to_builder(model, builder, {}, {})
-            builder.Finish(offset)
-            return builder.Output()
+        return verifier
+
+    def make_dumps(self, cl: type[T]) -> Callable[[T, Builder | None], bytes]:
+        """Prepare a dumping function for a model in advance."""
+        add_to_builder = self._to_fb_cache(cl)
+        acquire = self._builder_pool.acquire
+        release = self._builder_pool.release
+
+        def dumps(
+            model: T, builder: Builder | None = None, size_prefixed: bool = False
+        ) -> bytes:
+            pooled = builder is None
+            if pooled:
+                builder = acquire()
+            try:
+                offset = add_to_builder(model, builder, {}, {})
+                if size_prefixed:
+                    builder.FinishSizePrefixed(offset)
+                else:
+                    builder.Finish(offset)
+                return builder.Output()
+            finally:
+                if pooled:
+                    release(builder)
 
         return dumps
 
+    def prepare(
+        self,
+        *targets: type[AttrsInstance] | ModuleType,
+        recursive: bool = True,
+        background: bool = False,
+    ) -> dict[type[AttrsInstance], float] | Future[dict[type[AttrsInstance], float]]:
+        """Compile the dumping and loading functions of models up front.
+
+        `targets` are model classes, or modules whose models get prepared.
+        If `recursive` is true, the tables, vectors of tables and union
+        members they reference are prepared too.
+
+        Returns the seconds spent preparing every class, not including the
+        classes it references. If `background` is true, the work is done in
+        a background thread, and a future of the timings is returned instead.
+        """
+        classes = _walk_classes(targets, recursive)
+        if not background:
+            return self._prepare(classes)
+
+        future: Future[dict[type[AttrsInstance], float]] = Future()
+
+        def run() -> None:
+            try:
+                future.set_result(self._prepare(classes))
+            except BaseException as exc:
+                future.set_exception(exc)
+
+        Thread(target=run, name="flattrs-prepare", daemon=True).start()
+        return future
+
+    def _prepare(
+        self, classes: list[type[AttrsInstance]]
+    ) -> dict[type[AttrsInstance], float]:
+        res = {}
+        for cl in classes:
+            start = perf_counter()
+            self._dumps_cache(cl)
+            self._loads_cache(cl)
+            res[cl] = perf_counter() - start
+        return res
+
+
+class FramedWriter:
+    """Appends size-prefixed models to a binary file, buffering writes.
+
+    Use `Converter.make_writer` to create one. Writers reuse a single
+    builder for all models, and need to be flushed or closed (or used as
+    context managers) for the last models to reach the file.
+    """
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        to_fb: Callable[[type[T]], AddToBuilder],
+        buffer_size: int = 65536,
+    ) -> None:
+        self._file = file
+        self._to_fb = to_fb
+        self._buffer_size = buffer_size
+        self._buffer = bytearray()
+        self._builder = Builder(10000)
+
+    def write(self, model: AttrsInstance) -> None:
+        """Append a model."""
+        builder = self._builder
+        builder.FinishSizePrefixed(self._to_fb(model.__class__)(model, builder, {}, {}))
+        with _builder_output(builder) as payload:
+            self._buffer += payload
+        builder.Clear()
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    def write_many(self, models: Iterable[AttrsInstance]) -> None:
+        """Append several models."""
+        for model in models:
+            self.write(model)
+
+    def flush(self) -> None:
+        """Write any pending models to the file."""
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer.clear()
+
+    def close(self) -> None:
+        """Flush pending models. The file is left open."""
+        self.flush()
+
+    def __enter__(self) -> "FramedWriter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
+def _builder_output(builder: Builder) -> memoryview:
+    """The output of a finished builder, without copying it.
+
+    The pure-Python builder only supports the buffer protocol on Python 3.12+.
+    """
+    try:
+        return memoryview(builder)
+    except TypeError:
+        return memoryview(builder.Bytes)[builder.Head() :].toreadonly()
+
+
+def _walk_classes(
+    targets: Iterable[type[AttrsInstance] | ModuleType], recursive: bool
+) -> list[type[AttrsInstance]]:
+    """The models to prepare, referenced models first."""
+    roots = []
+    for target in targets:
+        if isinstance(target, ModuleType):
+            roots.extend(
+                cl
+                for cl in vars(target).values()
+                if isinstance(cl, type)
+                and has(cl)
+                and cl.__module__ == target.__name__
+                and not is_struct(cl)
+            )
+        else:
+            roots.append(target)
+
+    res = []
+    seen = set()
+
+    def walk(cl: type[AttrsInstance]) -> None:
+        if cl in seen:
+            return
+        seen.add(cl)
+        if recursive:
+            fb_cl = analyze(cl)
+            for _, type, _, _ in (
+                fb_cl.tables + fb_cl.lists_of_tables + fb_cl.nested_flatbuffers
+            ):
+                walk(type)
+            for _, _, union_mapping, _ in fb_cl.unions:
+                for type in union_mapping.values():
+                    if type is not NoneType:
+                        walk(type)
+        res.append(cl)
+
+    for cl in roots:
+        walk(cl)
+    return res
+
+
+def _read_frame(read: Callable[[int], bytes], size: int) -> bytes:
+    """Read exactly `size` bytes, or nothing if the stream is exhausted."""
+    res = read(size)
+    if len(res) == size or not res:
+        return res
+    chunks = [res]
+    remaining = size - len(res)
+    while remaining:
+        chunk = read(remaining)
+        if not chunk:
+            raise ValueError("flattrs: truncated frame.")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
 
 def _make_add_to_builder_fn(
     cl: FlatbufferTable,
     hook_factory: Callable[[type[AttrsInstance]], AddToBuilder[Any]],
+    code_cache: CodeCache | None = None,
+    builder_pool: BuilderPool | None = None,
 ) -> AddToBuilder[Any]:
     name = cl.cl.__name__
     globs = {}
+    script = make_add_to_builder_script(cl, hook_factory, globs, builder_pool)
+    sha1 = hashlib.sha1()
+    sha1.update(name.encode("utf-8"))
+    unique_filename = "<FB add_to_builder for %s, %s>" % (
+        name,
+        sha1.hexdigest(),
+    )
+    _compile(script, unique_filename, globs, cl.cl.__module__, code_cache)
+
+    return globs["__fb_add_to_builder__"]
+
+
+def make_add_to_builder_script(
+    cl: FlatbufferTable,
+    hook_factory: Callable[[type[AttrsInstance]], AddToBuilder[Any]],
+    globs: dict[str, Any],
+    builder_pool: BuilderPool | None = None,
+) -> str:
+    """Generate the source of `__fb_add_to_builder__` for a table.
+
+    Any necessary globals are added to `globs`. Nested flatbuffers are dumped
+    using builders from `builder_pool`.
+    """
     lines = []
     lines.append("def __fb_add_to_builder__(self, builder, strs, nodes):")
 
@@ -154,31 +712,95 @@ def _make_add_to_builder_fn(
     for field, _, _, fb_number_type, is_optional in (
         cl.lists_of_scalars + cl.lists_of_enums
     ):
-        prepend = SCALAR_TYPE_TO_PREPEND[fb_number_type]
-        w = SCALAR_TYPE_TO_WIDTH[fb_number_type]
-
+        # One call, writing the whole vector in C.
         lines.append(f"    __fb_self_{field} = self.{field}")
         indent = ""
         if is_optional:
             lines.append(f"    if __fb_self_{field} is not None:")
             indent = "  "
-        lines.append(f"    {indent}builder.StartVector({w}, len(self.{field}), {w})")
-        lines.append(f"    {indent}for o in reversed(__fb_self_{field}):")
-        lines.append(f"    {indent}    builder.{prepend}(o)")
-        lines.append(f"    {indent}__fb_self_{field}_offset = builder.EndVector()")
+        lines.append(
+            f"    {indent}__fb_self_{field}_offset = builder.CreateScalarVector('{fb_number_type}', __fb_self_{field})"
+        )
 
-    for field, type, slot_idx, is_optional in cl.lists_of_tables:
-        globs[f"_{field}_add_to_builder"] = hook_factory(type)
+    for field, fb_struct, _, is_optional in cl.lists_of_structs:
+        # Structs are packed back to back, and copied in one go.
+        globs[f"_{field}_pack"] = struct_pack_fn(fb_struct)
+        values = ", ".join(_struct_values(fb_struct, "e"))
+        lines.append(f"    __fb_self_{field} = self.{field}")
+        indent = ""
+        if is_optional:
+            lines.append(f"    if __fb_self_{field} is not None:")
+            indent = "    "
+        lines.append(
+            f'    {indent}__fb_self_{field}_offset = builder.CreateStructVector({fb_struct.size}, {fb_struct.alignment}, b"".join([_{field}_pack({values}) for e in __fb_self_{field}]))'
+        )
+
+    if cl.numpy_vectors or cl.numpy_struct_vectors:
+        from numpy import ascontiguousarray
+
+        globs["_ascontiguousarray"] = ascontiguousarray
+
+    for field, _, fb_number_type, is_optional in cl.numpy_vectors:
+        # Arrays of the right dtype go through untouched, and get
+        # written with a single copy.
+        globs[f"_{field}_dtype"] = SCALAR_TYPE_TO_DTYPE[fb_number_type]
         lines.append(f"    __fb_self_{field} = self.{field}")
+        indent = ""
+        if is_optional:
+            lines.append(f"    if __fb_self_{field} is not None:")
+            indent = "    "
+        lines.append(
+            f"    {indent}__fb_self_{field}_offset = builder.CreateNumpyVector(_ascontiguousarray(__fb_self_{field}, _{field}_dtype))"
+        )
 
+    for field, fb_struct, _, is_optional in cl.numpy_struct_vectors:
+        # Structured arrays of the right dtype are written with a single copy.
+        globs[f"_{field}_dtype"] = make_struct_dtype(fb_struct)
+        lines.append(f"    __fb_self_{field} = self.{field}")
         indent = ""
         if is_optional:
             lines.append(f"    if __fb_self_{field} is not None:")
             indent = "    "
+        lines.append(
+            f"    {indent}__fb_self_{field}_offset = builder.CreateStructVector({fb_struct.size}, {fb_struct.alignment}, _ascontiguousarray(__fb_self_{field}, _{field}_dtype))"
+        )
 
+    for field, type, _, is_optional in cl.nested_flatbuffers:
+        # Nested flatbuffers are complete payloads, 8-byte aligned for their scalars.
+        globs[f"_{field}_add_nested"] = partial(
+            _add_nested,
+            hook_factory(type),
+            builder_pool if builder_pool is not None else BuilderPool(),
+        )
+        lines.append(f"    __fb_self_{field} = self.{field}")
+        indent = ""
+        if is_optional:
+            lines.append(f"    if __fb_self_{field} is not None:")
+            indent = "    "
         lines.append(
-            f"    {indent}offsets = [_{field}_add_to_builder(t, builder, strs, nodes) for t in __fb_self_{field}]"
+            f"    {indent}__fb_self_{field}_offset = _{field}_add_nested(__fb_self_{field}, builder)"
         )
+
+    for field, type, slot_idx, is_optional in cl.lists_of_tables:
+        globs[f"_{field}_add_to_builder"] = hook_factory(type)
+        lines.append(f"    __fb_self_{field} = self.{field}")
+
+        indent = ""
+        if is_optional:
+            lines.append(f"    if __fb_self_{field} is not None:")
+            indent = "    "
+
+        if (key := analyze(type).key) is not None:
+            # Sorted by key like `CreateVectorOfSortedTables`, for binary search.
+            globs[f"_{field}_key"] = attrgetter(key[0])
+            globs["_first"] = itemgetter(0)
+            lines.append(
+                f"    {indent}offsets = [o for _, o in sorted([(_{field}_key(t), _{field}_add_to_builder(t, builder, strs, nodes)) for t in __fb_self_{field}], key=_first)]"
+            )
+        else:
+            lines.append(
+                f"    {indent}offsets = [_{field}_add_to_builder(t, builder, strs, nodes) for t in __fb_self_{field}]"
+            )
         lines.append(f"    {indent}builder.StartVector(4, len(offsets), 4)")
         lines.append(
             f"    {indent}for o in reversed(offsets): builder.PrependUOffsetTRelative(o)"
@@ -218,6 +840,29 @@ def _make_add_to_builder_fn(
     # The actual object starts here.
     lines.append(f"    builder.StartObject({cl.num_slots})")
 
+    for field, fb_struct, slot_idx, is_optional in cl.structs:
+        # Structs are written inline, right before their slot.
+        globs[f"_{field}_pack"] = struct_pack_fn(fb_struct)
+        values = ", ".join(_struct_values(fb_struct, f"__fb_self_{field}"))
+        lines.append(f"    __fb_self_{field} = self.{field}")
+        indent = ""
+        if is_optional:
+            lines.append(f"    if __fb_self_{field} is not None:")
+            indent = "    "
+        lines.append(
+            f"    {indent}builder.PrependStructSlot({slot_idx}, builder.CreateStruct({fb_struct.alignment}, _{field}_pack({values})), 0)"
+        )
+
+    for field, _, slot_idx, is_optional in (
+        cl.lists_of_structs + cl.numpy_struct_vectors
+    ):
+        prefix = ""
+        if is_optional:
+            prefix = f"if __fb_self_{field} is not None: "
+        lines.append(
+            f"    {prefix}builder.PrependUOffsetTRelativeSlot({slot_idx}, __fb_self_{field}_offset, 0)"
+        )
+
     for field, slot_idx, is_optional in cl.strings:
         indent = ""
         if is_optional:
@@ -243,6 +888,14 @@ def _make_add_to_builder_fn(
             f"    {prefix}builder.PrependUOffsetTRelativeSlot({slot_idx}, __fb_self_{field}_offset, 0)"
         )
 
+    for field, _, slot_idx, is_optional in cl.nested_flatbuffers:
+        prefix = ""
+        if is_optional:
+            prefix = f"if __fb_self_{field} is not None: "
+        lines.append(
+            f"    {prefix}builder.PrependUOffsetTRelativeSlot({slot_idx}, __fb_self_{field}_offset, 0)"
+        )
+
     for field, _, slot_idx, is_optional in cl.tables:
         indent = ""
         if is_optional:
@@ -271,6 +924,15 @@ def _make_add_to_builder_fn(
             f"    {prefix}builder.PrependUOffsetTRelativeSlot({slot_idx}, __fb_self_{field}_offset, 0)"
         )
 
+    for field, slot_idx, _, is_optional in cl.numpy_vectors:
+        if is_optional:
+            prefix = f"if __fb_self_{field} is not None: "
+        else:
+            prefix = ""
+        lines.append(
+            f"    {prefix}builder.PrependUOffsetTRelativeSlot({slot_idx}, __fb_self_{field}_offset, 0)"
+        )
+
     for field, fb_type, slot_idx, default in cl.inlines + cl.enums:
         if default is NOTHING:
             default = SCALAR_TYPE_TO_DEFAULT[fb_type]
@@ -305,36 +967,437 @@ def _make_add_to_builder_fn(
 
     lines.append("    return builder.EndObject()")
     lines.append("")
-    sha1 = hashlib.sha1()
-    sha1.update(name.encode("utf-8"))
-    unique_filename = "<FB add_to_builder for %s, %s>" % (
-        name,
-        sha1.hexdigest(),
-    )
-    script = "\n".join(lines)
-    eval(compile(script, unique_filename, "exec"), globs)
+    return "\n".join(lines)
 
-    linecache.cache[unique_filename] = (
-        len(script),
-        None,
-        script.splitlines(True),
-        unique_filename,
-    )
 
-    return globs["__fb_add_to_builder__"]
+def make_table_schema(
+    cl: FlatbufferTable, hook_factory: Callable[[type[AttrsInstance]], TableSchema]
+) -> TableSchema:
+    """Describe the layout of a table to the verifier."""
+    res = []
+    for _, fb_type, slot_idx, _ in cl.inlines + cl.enums:
+        res.append(
+            (SCALAR, 4 + slot_idx * 2, SCALAR_TYPE_TO_WIDTH[fb_type], False, None)
+        )
+    for _, slot_idx, is_optional in cl.strings:
+        res.append((STRING, 4 + slot_idx * 2, 1, not is_optional, None))
+    for _, slot_idx, is_optional in cl.byte_fields:
+        res.append((VECTOR, 4 + slot_idx * 2, 1, not is_optional, None))
+    for _, type, slot_idx, is_optional in cl.nested_flatbuffers:
+        res.append((NESTED, 4 + slot_idx * 2, 1, not is_optional, hook_factory(type)))
+    for _, type, slot_idx, is_optional in cl.tables:
+        res.append((TABLE, 4 + slot_idx * 2, 4, not is_optional, hook_factory(type)))
+    for _, slot_idx, is_optional in cl.lists_of_strings:
+        res.append((STRING_VECTOR, 4 + slot_idx * 2, 4, not is_optional, None))
+    for _, slot_idx, _, fb_type, _ in cl.lists_of_scalars + cl.lists_of_enums:
+        res.append(
+            (VECTOR, 4 + slot_idx * 2, SCALAR_TYPE_TO_WIDTH[fb_type], False, None)
+        )
+    for _, slot_idx, fb_type, _ in cl.numpy_vectors:
+        res.append(
+            (VECTOR, 4 + slot_idx * 2, SCALAR_TYPE_TO_WIDTH[fb_type], False, None)
+        )
+    for _, type, slot_idx, _ in cl.lists_of_tables:
+        res.append((TABLE_VECTOR, 4 + slot_idx * 2, 4, False, hook_factory(type)))
+    for _, fb_struct, slot_idx, is_optional in cl.structs:
+        res.append((SCALAR, 4 + slot_idx * 2, fb_struct.size, not is_optional, None))
+    for _, fb_struct, slot_idx, _ in cl.lists_of_structs + cl.numpy_struct_vectors:
+        res.append((VECTOR, 4 + slot_idx * 2, fb_struct.size, False, None))
+    for _, union_types, union_mapping, slot_idx in cl.unions:
+        union_schemas = {
+            ix: hook_factory(t) for ix, t in union_mapping.items() if t is not NoneType
+        }
+        res.append(
+            (UNION, 4 + slot_idx * 2, 1, NoneType not in union_types, union_schemas)
+        )
+    return TableSchema(res)
 
 
 def make_from_fb_fn(
-    cl: FlatbufferTable, hook_factory: Callable[[type[AttrsInstance]], Callable]
+    cl: FlatbufferTable,
+    hook_factory: Callable[..., Callable],
+    include: frozenset[str] | None = None,
+    exclude: frozenset[str] = frozenset(),
+    code_cache: CodeCache | None = None,
+    trusted_construction: bool = False,
+    unknown_enums: UnknownEnums = "raise",
 ) -> Callable:
     """Compile a function to init an attrs model from a FB model, flattrs-style.
 
-    The input is assumed to be an instance of `flatbuffers.Table`.
+    The input is assumed to be an instance of `flattrs.cflattrs.reader.Table`,
+    or its pure-Python fallback.
+
+    If `include` or `exclude` are provided, only the selected fields are
+    decoded. Nested tables are loaded using `hook_factory(cls, include, exclude)`
+    if a nested projection applies to them.
+
+    If `trusted_construction` is true, models are created using `object.__new__`
+    and have their attributes set directly instead of going through `__init__`.
+    Enum values without members are handled according to `unknown_enums`.
     """
     name = cl.cl.__name__
-    globs = {"_Table": Table, "cls": cl.cl}
+    globs = {}
+    script = make_from_fb_script(
+        cl,
+        hook_factory,
+        globs,
+        include,
+        exclude,
+        trusted_construction,
+        unknown_enums,
+        code_cache,
+    )
+
+    sha1 = hashlib.sha1()
+    sha1.update(name.encode("utf-8"))
+    if include is not None or exclude:
+        sha1.update(repr((sorted(include or ()), sorted(exclude))).encode("utf-8"))
+    if trusted_construction:
+        sha1.update(b"trusted")
+    if unknown_enums != "raise":
+        sha1.update(unknown_enums.encode("utf-8"))
+    unique_filename = "<FB from_fb for %s, %s>" % (name, sha1.hexdigest())
+    _compile(script, unique_filename, globs, cl.cl.__module__, code_cache)
+
+    return globs["__fb_from_fb__"]
+
+
+def make_from_fb_script(
+    cl: FlatbufferTable,
+    hook_factory: Callable[..., Callable],
+    globs: dict[str, Any],
+    include: frozenset[str] | None = None,
+    exclude: frozenset[str] = frozenset(),
+    trusted_construction: bool = False,
+    unknown_enums: UnknownEnums = "raise",
+    code_cache: CodeCache | None = None,
+) -> str:
+    """Generate the source of `__fb_from_fb__` for a table.
+
+    Any necessary globals are added to `globs`. Struct codecs compiled along
+    the way are cached in `code_cache`, if given.
+    """
+    globs["cls"] = cl.cl
+    globs["_not_loaded"] = NOT_LOADED
     lines = []
     inst_lines = []  # Instantiation lines
+    projections = (
+        _split_projection(cl, include, exclude)
+        if include is not None or exclude
+        else None
+    )
+    decoders = _make_field_decoders(
+        cl, hook_factory, globs, projections, unknown_enums, code_cache
+    )
+    # Skipped fields may hold `NOT_LOADED`, which validators would reject.
+    trusted_construction = trusted_construction or projections is not None
+
+    lines.append("def __fb_from_fb__(tab):")
+
+    if trusted_construction:
+        globs["_new"] = object.__new__
+        inst_lines.append("    inst = _new(cls)")
+    else:
+        inst_lines.append("    return cls(")
+    for field in fields(cl.cl):
+        fname = field.name
+        if fname not in decoders:
+            # Skipped by the projection.
+            if field.default is NOTHING:
+                expr = "_not_loaded"
+            elif isinstance(field.default, Factory):
+                if field.default.takes_self:
+                    expr = "_not_loaded"
+                else:
+                    globs[f"_{fname}_factory"] = field.default.factory
+                    expr = f"_{fname}_factory()"
+            else:
+                globs[f"_{fname}_default"] = field.default
+                expr = f"_{fname}_default"
+        else:
+            prelude, expr = decoders[fname]
+            lines.extend(f"    {line}" for line in prelude)
+        if trusted_construction:
+            inst_lines.append(f"    {_trusted_assignment(cl.cl, fname, globs, expr)}")
+        else:
+            inst_lines.append(f"        {expr},")
+    inst_lines.append("    return inst" if trusted_construction else "    )")
+
+    return "\n".join(lines + inst_lines)
+
+
+def _trusted_assignment(
+    cl: type, fname: FieldName, globs: dict[str, Any], expr: str
+) -> str:
+    """The statement setting `fname` on `inst`, bypassing `__setattr__` hooks."""
+    if cl.__setattr__ is object.__setattr__:
+        return f"inst.{fname} = {expr}"
+    # Frozen classes, and classes with `on_setattr` hooks.
+    # Slots are set faster through their descriptors.
+    for base in cl.__mro__:
+        if isinstance(slot := base.__dict__.get(fname), MemberDescriptorType):
+            globs[f"_{fname}_setter"] = slot.__set__
+            return f"_{fname}_setter(inst, {expr})"
+    globs["_setattr"] = object.__setattr__
+    return f"_setattr(inst, {fname!r}, {expr})"
+
+
+def _decode_enum(
+    enum: type[IntEnum],
+    raw: str,
+    name: str,
+    globs: dict[str, Any],
+    unknown_enums: UnknownEnums,
+    default: Any = NOTHING,
+) -> str:
+    """The expression decoding the `raw` value of an enum, using a lookup table.
+
+    Dense enums are looked up in a tuple indexed by value, sparse ones in a dict.
+    Values without members are handled according to `unknown_enums`.
+    """
+    if unknown_enums == "raise":
+        # The enum itself raises, unless it has a `_missing_` hook.
+        unknown = enum
+    elif unknown_enums == "raw":
+        unknown = int
+    elif unknown_enums == "default":
+        member = enum(default) if default is not NOTHING else next(iter(enum))
+        unknown = lambda _: member  # noqa: E731
+    else:
+        raise ValueError(f"Unknown enum policy: {unknown_enums!r}")
+    members = {m.value: m for m in enum}
+    var = f"_{name}_raw"
+    globs[f"_{name}_unknown"] = unknown
+    globs[f"_{name}_members"] = members
+    fallback = f"else _{name}_unknown({var})"
+    if members:
+        low, high = min(members), max(members)
+        # Holes are filled in advance, unless they need to raise.
+        if high - low < 2 * len(members) and (
+            unknown_enums != "raise" or high - low + 1 == len(members)
+        ):
+            globs[f"_{name}_members"] = tuple(
+                members[v] if v in members else unknown(v) for v in range(low, high + 1)
+            )
+            index = var if not low else f"{var} {'-' if low > 0 else '+'} {abs(low)}"
+            return f"_{name}_members[{index}] if {low} <= ({var} := {raw}) <= {high} {fallback}"
+    return f"_{name}_members[{var}] if ({var} := {raw}) in _{name}_members {fallback}"
+
+
+def make_view_cls(
+    cl: FlatbufferTable,
+    hook_factory: Callable[[type[AttrsInstance]], type],
+    code_cache: CodeCache | None = None,
+    unknown_enums: UnknownEnums = "raise",
+) -> type:
+    """Compile a lazy, read-only view class for an attrs model.
+
+    Views wrap a `Table`, and decode fields when they are first accessed.
+    `hook_factory` is expected to produce view classes for nested tables.
+    """
+    name = f"{cl.cl.__name__}View"
+    globs = {}
+    decoders = _make_field_decoders(
+        cl, hook_factory, globs, None, unknown_enums, code_cache
+    )
+    field_names = [a.name for a in fields(cl.cl)]
+    slots = ("_tab", *(f"_fb_cache_{fname}" for fname in field_names))
+
+    globs["_fb_model"] = cl.cl
+    lines = [
+        f"class {name}:",
+        f"    __slots__ = {slots!r}",
+        "    __flattrs_model__ = _fb_model",
+        "",
+        "    def __init__(self, tab):",
+        "        self._tab = tab",
+    ]
+    for fname in field_names:
+        prelude, expr = decoders[fname]
+        lines.append("")
+        lines.append("    @property")
+        lines.append(f"    def {fname}(self):")
+        lines.append("        try:")
+        lines.append(f"            return self._fb_cache_{fname}")
+        lines.append("        except AttributeError:")
+        lines.append("            pass")
+        lines.append("        tab = self._tab")
+        lines.extend(f"        {line}" for line in prelude)
+        lines.append(f"        self._fb_cache_{fname} = res = {expr}")
+        lines.append("        return res")
+    field_reprs = ", ".join(f"{fname}={{self.{fname}!r}}" for fname in field_names)
+    lines.append("")
+    lines.append("    def __repr__(self):")
+    lines.append(f'        return f"{name}({field_reprs})"')
+
+    sha1 = hashlib.sha1()
+    sha1.update(name.encode("utf-8"))
+    if unknown_enums != "raise":
+        sha1.update(unknown_enums.encode("utf-8"))
+    unique_filename = "<FB view for %s, %s>" % (name, sha1.hexdigest())
+    _compile("\n".join(lines), unique_filename, globs, code_cache=code_cache)
+
+    return globs[name]
+
+
+def make_key_search(
+    cl: FlatbufferTable, field: FieldName
+) -> tuple[Callable[[Table, Any], Table | None], type[AttrsInstance]]:
+    """Prepare a binary search by key through a vector of tables of `cl`.
+
+    Returns the search function, taking the table of `cl` and the key and
+    returning the matching table or `None`, and the class of the elements.
+    Only the keys of the visited tables are read.
+    """
+    for fname, elem_cl, slot_idx, _ in cl.lists_of_tables:
+        if fname == field:
+            break
+    else:
+        raise ValueError(f"{cl.cl.__name__}.{field} is not a vector of tables")
+    if (key := analyze(elem_cl).key) is None:
+        raise ValueError(f"{elem_cl.__name__} has no key field")
+    _, key_slot_idx, scalar_type, default = key
+    vector_slot = 4 + slot_idx * 2
+    key_slot = 4 + key_slot_idx * 2
+
+    if scalar_type is None:
+        # Strings compare as UTF-8 bytes, like flatc does.
+        def read_key(tab: Table) -> bytes:
+            o = tab.Offset(key_slot)
+            return tab.String(tab.Pos + o) if o != 0 else b""
+
+    else:
+        getter = getattr(Table, f"{SCALAR_TYPE_TO_GETTER[scalar_type]}Slot")
+        if default is NOTHING:
+            default = literal_eval(SCALAR_TYPE_TO_DEFAULT[scalar_type])
+
+        def read_key(tab: Table) -> Any:
+            return getter(tab, key_slot, default)
+
+    def search(tab: Table, key: Any) -> Table | None:
+        if scalar_type is None:
+            key = key.encode()
+        offset = tab.Offset(vector_slot)
+        if offset == 0:
+            return None
+        vector = tab.Vector(offset)
+        lo, hi = 0, tab.VectorLen(offset)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            elem = tab.SubTable(tab.Indirect(vector + 4 * mid))
+            elem_key = read_key(elem)
+            if elem_key < key:
+                lo = mid + 1
+            elif key < elem_key:
+                hi = mid
+            else:
+                return elem
+        return None
+
+    return search, elem_cl
+
+
+def _add_nested(
+    add_to_builder: AddToBuilder,
+    builder_pool: BuilderPool,
+    value: Any,
+    builder: Builder,
+) -> int:
+    """Write a nested flatbuffer to `builder`, dumping its model if needed.
+
+    Models are dumped using a pooled builder, and copied straight from it.
+    """
+    if value.__class__ is Nested:
+        if (data := value.data) is not None:
+            return builder.CreateStructVector(1, 8, data)
+        value = value.load()
+    if not has(value.__class__):
+        return builder.CreateStructVector(1, 8, value)
+    nested = builder_pool.acquire()
+    try:
+        nested.Finish(add_to_builder(value, nested, {}, {}))
+        with _builder_output(nested) as payload:
+            return builder.CreateStructVector(1, 8, payload)
+    finally:
+        builder_pool.release(nested)
+
+
+def _nested_loader(from_fb: Callable[[Table], T]) -> Callable[[ReadableBuffer, int], T]:
+    """Load nested flatbuffers in place, from their start in the outer payload."""
+
+    def load(
+        buffer: ReadableBuffer, start: int, _unpack_from=start_struct.unpack_from
+    ) -> T:
+        return from_fb(Table(buffer, start + _unpack_from(buffer, start)[0]))
+
+    return load
+
+
+def _split_projection(
+    cl: FlatbufferTable, include: frozenset[str] | None, exclude: frozenset[str]
+) -> dict[FieldName, Projection | None]:
+    """Map the fields of `cl` selected by a projection to their nested projections."""
+    field_names = [a.name for a in fields(cl.cl)]
+    nested_tables = {
+        t[0] for t in cl.tables + cl.lists_of_tables + cl.nested_flatbuffers
+    }
+    for path in (include or frozenset()) | exclude:
+        head, _, rest = path.partition(".")
+        if head not in field_names:
+            raise ValueError(f"{cl.cl.__name__} has no field {head}.")
+        if rest and head not in nested_tables:
+            raise ValueError(
+                f"Cannot project into {cl.cl.__name__}.{head}, it's not a table."
+            )
+
+    res = {}
+    for fname in field_names:
+        prefix = f"{fname}."
+        if fname in exclude:
+            continue
+        if include is None or fname in include:
+            sub_include = None
+        else:
+            sub_include = frozenset(
+                p.removeprefix(prefix) for p in include if p.startswith(prefix)
+            )
+            if not sub_include:
+                continue
+        sub_exclude = frozenset(
+            p.removeprefix(prefix) for p in exclude if p.startswith(prefix)
+        )
+        res[fname] = (
+            (sub_include, sub_exclude)
+            if sub_include is not None or sub_exclude
+            else None
+        )
+    return res
+
+
+def _make_field_decoders(
+    cl: FlatbufferTable,
+    hook_factory: Callable[..., Callable],
+    globs: dict[str, Any],
+    projections: Mapping[FieldName, Projection | None] | None = None,
+    unknown_enums: UnknownEnums = "raise",
+    code_cache: CodeCache | None = None,
+) -> dict[FieldName, tuple[list[str], str]]:
+    """Generate the code decoding each field of `cl` from `tab`.
+
+    For every field, we return the statements that need to run first
+    and the expression producing the field value.
+    Any necessary globals are added to `globs`.
+
+    If `projections` is provided, only the fields in it are handled, and
+    nested tables are produced by `hook_factory(cls, *projection)`.
+    """
+
+    def nested_hook(fname: FieldName, type: type) -> Callable:
+        if projections is not None and (projection := projections[fname]):
+            return hook_factory(type, *projection)
+        return hook_factory(type)
+
+    res = {}
     byte_names = {f[0]: f for f in cl.byte_fields}
     string_names = {s[0]: s for s in cl.strings}
     list_table_fields = {t[0]: t for t in cl.lists_of_tables}
@@ -344,93 +1407,112 @@ def make_from_fb_fn(
     inline_names = {t[0]: t for t in cl.inlines}
     enum_names = {e[0]: e for e in cl.enums}
     table_names = {t[0]: t for t in cl.tables}
+    numpy_vector_names = {t[0]: t for t in cl.numpy_vectors}
+    struct_names = {t[0]: t for t in cl.structs}
+    lists_of_structs_names = {t[0]: t for t in cl.lists_of_structs}
+    numpy_struct_vector_names = {t[0]: t for t in cl.numpy_struct_vectors}
+    nested_flatbuffer_names = {t[0]: t for t in cl.nested_flatbuffers}
 
-    lines.append("def __fb_from_fb__(tab):")
-
-    inst_lines.append("    return cls(")
     for field in fields(cl.cl):
         fname = field.name
+        if projections is not None and fname not in projections:
+            continue
         if fname in string_names:
             string_def = string_names[fname]
             slot_idx = string_def[1]
             if string_def[2]:
-                inst_lines.append(
-                    f"        tab.String(tab.Pos + o).decode() if (o := tab.Offset({4 + slot_idx * 2})) != 0 else None,"
+                res[fname] = (
+                    [],
+                    f"tab.DecodeString(tab.Pos + o) if (o := tab.Offset({4 + slot_idx * 2})) != 0 else None",
                 )
             else:
-                inst_lines.append(
-                    f"        tab.String(tab.Pos + tab.Offset({4 + slot_idx * 2})).decode(),"
+                res[fname] = (
+                    [],
+                    f"tab.DecodeString(tab.Pos + tab.Offset({4 + slot_idx * 2}))",
                 )
         elif fname in byte_names:
             byte_def = byte_names[fname]
             slot_idx = byte_def[1]
             if byte_def[2]:
-                inst_lines.append(
-                    f"        tab.String(tab.Pos + o) if (o := tab.Offset({4 + slot_idx * 2})) != 0 else None,"
+                res[fname] = (
+                    [],
+                    f"tab.String(tab.Pos + o) if (o := tab.Offset({4 + slot_idx * 2})) != 0 else None",
                 )
             else:
-                inst_lines.append(
-                    f"        tab.String(tab.Pos + tab.Offset({4 + slot_idx * 2})),"
+                res[fname] = (
+                    [],
+                    f"tab.String(tab.Pos + tab.Offset({4 + slot_idx * 2}))",
                 )
         elif fname in enum_names:
             _, fb_type, slot_idx, default = enum_names[fname]
-            globs[f"_{fname}_type"] = field.type
-            globs[f"_{fname}_flags"] = SCALAR_TYPES_TO_FLAGS[fb_type]
-            inst_lines.append(
-                f"        _{fname}_type(tab.Get(_{fname}_flags, tab.Pos + o) if (o := tab.Offset({4 + slot_idx * 2})) != 0 else {default}),"
+            getter = SCALAR_TYPE_TO_GETTER[fb_type]
+            res[fname] = (
+                [],
+                _decode_enum(
+                    field.type,
+                    f"tab.{getter}Slot({4 + slot_idx * 2}, {default})",
+                    fname,
+                    globs,
+                    unknown_enums,
+                    default,
+                ),
             )
         elif fname in table_names:
             table_def = table_names[fname]
             slot_idx = table_def[2]
-            globs[f"_{fname}_from_fb"] = hook_factory(table_def[1])
-            lines.append(f"    _{fname}_offset = tab.Offset({4 + slot_idx * 2})")
+            globs[f"_{fname}_from_fb"] = nested_hook(fname, table_def[1])
             suffix = ""
             if table_def[3]:
                 suffix = f" if _{fname}_offset != 0 else None"
-            inst_lines.append(
-                f"        _{fname}_from_fb(tab.__class__(tab.Bytes, tab.Indirect(_{fname}_offset + tab.Pos))){suffix},"
+            res[fname] = (
+                [f"_{fname}_offset = tab.Offset({4 + slot_idx * 2})"],
+                f"_{fname}_from_fb(tab.SubTable(tab.Indirect(_{fname}_offset + tab.Pos))){suffix}",
             )
         elif fname in list_table_fields:
-            _, type, slot_idx, is_optional = list_table_fields[fname]
-            hook = hook_factory(type)
-            globs[f"_{fname}_from_fb"] = hook
-            lines.append(f"    _{fname}_offset = tab.Offset({4 + slot_idx * 2})")
-            lines.append(
-                f"    _{fname}_vector = tab.Vector(_{fname}_offset) if _{fname}_offset != 0 else None"
-            )
+            _, item_type, slot_idx, is_optional = list_table_fields[fname]
+            globs[f"_{fname}_from_fb"] = nested_hook(fname, item_type)
+            prelude = [
+                f"_{fname}_offset = tab.Offset({4 + slot_idx * 2})",
+                f"_{fname}_vector = tab.Vector(_{fname}_offset) if _{fname}_offset != 0 else None",
+            ]
             for_ = f"for i in range(tab.VectorLen(_{fname}_offset) if _{fname}_offset != 0 else 0)"
-            line = f"        [_{fname}_from_fb(tab.__class__(tab.Bytes, tab.Indirect(_{fname}_vector + 4 * i))) {for_}]"
+            line = f"[_{fname}_from_fb(tab.SubTable(tab.Indirect(_{fname}_vector + 4 * i))) {for_}]"
 
             if is_optional:
                 line = f"{line} if _{fname}_offset != 0 else None"
-            inst_lines.append(f"{line},")
+            res[fname] = (prelude, line)
+        elif fname in nested_flatbuffer_names:
+            _, item_type, slot_idx, is_optional = nested_flatbuffer_names[fname]
+            globs[f"_{fname}_loader"] = _nested_loader(nested_hook(fname, item_type))
+            globs["_nested"] = Nested._in_place
+            line = f"_nested(tab.Bytes, tab.Vector(_{fname}_offset), tab.VectorLen(_{fname}_offset), _{fname}_loader)"
+            if is_optional:
+                line = f"{line} if _{fname}_offset != 0 else None"
+            res[fname] = ([f"_{fname}_offset = tab.Offset({4 + slot_idx * 2})"], line)
         elif fname in lists_of_strings_names:
             list_def = lists_of_strings_names[fname]
             is_optional = list_def[2]
             slot_idx = list_def[1]
-            lines.append(f"    _{fname}_offset = tab.Offset({4 + slot_idx * 2})")
-            lines.append(
-                f"    _{fname}_vector = tab.Vector(_{fname}_offset) if _{fname}_offset != 0 else None"
-            )
+            prelude = [
+                f"_{fname}_offset = tab.Offset({4 + slot_idx * 2})",
+                f"_{fname}_vector = tab.Vector(_{fname}_offset) if _{fname}_offset != 0 else None",
+            ]
             for_ = f"for i in range(tab.VectorLen(_{fname}_offset))"
-            line = f"        [tab.String(_{fname}_vector + i * 4).decode() {for_}]"
+            line = f"[tab.DecodeString(_{fname}_vector + i * 4) {for_}]"
             if is_optional:
                 # We adjust the previous line a little
                 line = f"{line} if _{fname}_offset != 0 else None"
-            inst_lines.append(f"{line},")
+            res[fname] = (prelude, line)
         elif fname in inline_names:
             inline = inline_names[fname]
             slot_idx = inline[2]
-            globs[f"_{fname}_type"] = SCALAR_TYPE_TO_PYTHON[inline[1]]
-            globs[f"_{fname}_flags"] = SCALAR_TYPES_TO_FLAGS[inline[1]]
+            getter = SCALAR_TYPE_TO_GETTER[inline[1]]
             if inline[3] is not NOTHING:
                 globs[f"_{fname}_default"] = inline[3]
                 default = f"_{fname}_default"
             else:
                 default = SCALAR_TYPE_TO_DEFAULT[inline[1]]
-            inst_lines.append(
-                f"        _{fname}_type(tab.Get(_{fname}_flags, tab.Pos + o)) if (o := tab.Offset({4 + slot_idx * 2})) != 0 else {default},"
-            )
+            res[fname] = ([], f"tab.{getter}Slot({4 + slot_idx * 2}, {default})")
         elif fname in union_field_names:
             # We prepare a dictionary to select the proper class at runtime.
             # Then we just grab the proper type and instantiate it.
@@ -445,50 +1527,303 @@ def make_from_fb_fn(
                 hook = hook_factory(attr_model)
 
                 def _load_from_content(table: Table, o, hook=hook):
-                    obj = Table(bytearray(), 0)
-                    table.Union(obj, o)
-                    return hook(obj)
+                    return hook(table.SubTable(table.Indirect(table.Pos + o)))
 
                 union_resolution_dict[ix] = _load_from_content
 
             globs[dn] = union_resolution_dict
-            globs[f"_{fname}_flags"] = Uint8Flags
-            lines.append(f"    _{fname}_offset = tab.Offset({4 + slot_idx * 2})")
+            prelude = [f"_{fname}_offset = tab.Offset({4 + slot_idx * 2})"]
             if NoneType in union_types:
-                inst_lines.append(
-                    f"        {dn}[tab.Get(_{fname}_flags, _{fname}_offset + tab.Pos)](tab, tab.Offset({6 + slot_idx * 2})) if _{fname}_offset != 0 else None,"
+                res[fname] = (
+                    prelude,
+                    f"{dn}[tab.GetUint8(_{fname}_offset + tab.Pos)](tab, tab.Offset({6 + slot_idx * 2})) if _{fname}_offset != 0 else None",
                 )
             else:
-                inst_lines.append(
-                    f"        {dn}[tab.Get(_{fname}_flags, _{fname}_offset + tab.Pos) if _{fname}_offset != 0 else None](tab, tab.Offset({6 + slot_idx * 2})),"
+                res[fname] = (
+                    prelude,
+                    f"{dn}[tab.GetUint8(_{fname}_offset + tab.Pos) if _{fname}_offset != 0 else None](tab, tab.Offset({6 + slot_idx * 2}))",
                 )
         elif fname in lists_of_scalar_names:
             list_def = lists_of_scalar_names[fname]
-            flags = SCALAR_TYPES_TO_FLAGS[list_def[3]]
-            globs[f"_{fname}_flags"] = flags
-            globs[f"_{fname}_type"] = list_def[2]
+            getter = SCALAR_TYPE_TO_GETTER[list_def[3]]
+            width = SCALAR_TYPE_TO_WIDTH[list_def[3]]
             slot_idx = list_def[1]
-            lines.append(f"    _{fname}_offset = tab.Offset({4 + slot_idx * 2})")
-            lines.append(
-                f"    _{fname}_vector = tab.Vector(_{fname}_offset) if _{fname}_offset != 0 else None"
-            )
+            prelude = [
+                f"_{fname}_offset = tab.Offset({4 + slot_idx * 2})",
+                f"_{fname}_vector = tab.Vector(_{fname}_offset) if _{fname}_offset != 0 else None",
+            ]
             for_ = f"for i in range(tab.VectorLen(_{fname}_offset) if _{fname}_offset != 0 else 0)"
-            i = "i" if flags.bytewidth == 1 else f"i * {flags.bytewidth}"
-            line = f"        [_{fname}_type(tab.Get(_{fname}_flags, _{fname}_vector + {i})) {for_}]"
+            i = "i" if width == 1 else f"i * {width}"
+            elem = f"tab.{getter}(_{fname}_vector + {i})"
+            if list_def in cl.lists_of_enums:
+                elem = _decode_enum(list_def[2], elem, fname, globs, unknown_enums)
+            line = f"[{elem} {for_}]"
             if list_def[4]:
                 # We adjust the previous line a little
                 line = f"{line} if _{fname}_offset != 0 else None"
-            inst_lines.append(line + ", ")
+            res[fname] = (prelude, line)
+        elif fname in numpy_vector_names:
+            _, slot_idx, fb_type, is_optional = numpy_vector_names[fname]
+            # The array is a view over the payload, so no copies are made.
+            globs["_get_vector_as_numpy"] = GetVectorAsNumpy
+            globs[f"_{fname}_dtype"] = SCALAR_TYPE_TO_DTYPE[fb_type]
+            prelude = [f"_{fname}_offset = tab.Offset({4 + slot_idx * 2})"]
+            line = f"_get_vector_as_numpy(_{fname}_dtype, tab.Bytes, tab.VectorLen(_{fname}_offset), tab.Vector(_{fname}_offset)) if _{fname}_offset != 0 else "
+            if is_optional:
+                line += "None"
+            else:
+                line += f'_get_vector_as_numpy(_{fname}_dtype, b"", 0, 0)'
+            res[fname] = (prelude, line)
+        elif fname in struct_names:
+            _, fb_struct, slot_idx, is_optional = struct_names[fname]
+            # A single unpack reads the whole struct.
+            globs[f"_{fname}_unpack"] = _struct_format(fb_struct).unpack_from
+            globs[f"_{fname}_make"] = make_struct_fn(
+                fb_struct, unknown_enums, code_cache
+            )
+            if is_optional:
+                res[fname] = (
+                    [],
+                    f"_{fname}_make(*_{fname}_unpack(tab.Bytes, tab.Pos + o)) if (o := tab.Offset({4 + slot_idx * 2})) != 0 else None",
+                )
+            else:
+                res[fname] = (
+                    [],
+                    f"_{fname}_make(*_{fname}_unpack(tab.Bytes, tab.Pos + tab.Offset({4 + slot_idx * 2})))",
+                )
+        elif fname in lists_of_structs_names:
+            _, fb_struct, slot_idx, is_optional = lists_of_structs_names[fname]
+            globs["_load_struct_vector"] = _load_struct_vector
+            globs[f"_{fname}_iter_unpack"] = _struct_format(fb_struct).iter_unpack
+            globs[f"_{fname}_make"] = make_struct_fn(
+                fb_struct, unknown_enums, code_cache
+            )
+            prelude = [f"_{fname}_offset = tab.Offset({4 + slot_idx * 2})"]
+            line = f"_load_struct_vector(tab, _{fname}_offset, {fb_struct.size}, _{fname}_iter_unpack, _{fname}_make)"
+            if is_optional:
+                line = f"{line} if _{fname}_offset != 0 else None"
+            res[fname] = (prelude, line)
+        elif fname in numpy_struct_vector_names:
+            _, fb_struct, slot_idx, is_optional = numpy_struct_vector_names[fname]
+            # A structured array viewing the payload, like NumPy vectors.
+            globs["_get_vector_as_numpy"] = GetVectorAsNumpy
+            globs[f"_{fname}_dtype"] = make_struct_dtype(fb_struct)
+            prelude = [f"_{fname}_offset = tab.Offset({4 + slot_idx * 2})"]
+            line = f"_get_vector_as_numpy(_{fname}_dtype, tab.Bytes, tab.VectorLen(_{fname}_offset), tab.Vector(_{fname}_offset)) if _{fname}_offset != 0 else "
+            if is_optional:
+                line += "None"
+            else:
+                line += f'_get_vector_as_numpy(_{fname}_dtype, b"", 0, 0)'
+            res[fname] = (prelude, line)
         else:
             raise ValueError(f"Can't handle {fname} (type {field.type}).")
 
-    inst_lines.append("    )")
+    return res
+
+
+def _struct_format(fb_struct: FlatbufferStruct) -> struct.Struct:
+    return struct.Struct(f"<{fb_struct.format}")
+
+
+def _struct_values(fb_struct: FlatbufferStruct, expr: str) -> list[str]:
+    """The expressions reading every scalar of a struct, in layout order."""
+    res = []
+    for name, member, _ in fb_struct.fields:
+        if isinstance(member, FlatbufferStruct):
+            res.extend(_struct_values(member, f"{expr}.{name}"))
+        else:
+            res.append(f"{expr}.{name}")
+    return res
+
 
+def struct_pack_fn(fb_struct: FlatbufferStruct) -> Callable[..., bytes]:
+    """A function packing the scalars of a struct, padding included."""
+    return _struct_format(fb_struct).pack
+
+
+def make_struct_fn(
+    fb_struct: FlatbufferStruct,
+    unknown_enums: UnknownEnums = "raise",
+    code_cache: CodeCache | None = None,
+) -> Callable[..., AttrsInstance]:
+    """A function creating a struct from its scalars, in layout order.
+
+    Structs made only of plain scalars are created by their class directly.
+    The compiled code is cached in `code_cache`, if given.
+    """
+    if all(
+        isinstance(member, str) and member_type in HELPER_TYPE_TO_SCALAR_TYPE
+        for _, member, member_type in fb_struct.fields
+    ):
+        return fb_struct.cl
+
+    globs = {}
+    script = make_struct_script(fb_struct, globs, unknown_enums)
+    name = fb_struct.cl.__name__
     sha1 = hashlib.sha1()
     sha1.update(name.encode("utf-8"))
-    unique_filename = "<FB from_fb for %s, %s>" % (name, sha1.hexdigest())
-    script = "\n".join(lines + inst_lines)
-    eval(compile(script, unique_filename, "exec"), globs)
+    if unknown_enums != "raise":
+        sha1.update(unknown_enums.encode("utf-8"))
+    unique_filename = "<FB make_struct for %s, %s>" % (name, sha1.hexdigest())
+    _compile(script, unique_filename, globs, fb_struct.cl.__module__, code_cache)
+    return globs["__fb_make_struct__"]
+
+
+def make_struct_script(
+    fb_struct: FlatbufferStruct,
+    globs: dict[str, Any],
+    unknown_enums: UnknownEnums = "raise",
+) -> str:
+    """Generate the source of `__fb_make_struct__` for a struct.
+
+    Any necessary globals are added to `globs`.
+    """
+    args = []
+
+    def make(fb_struct: FlatbufferStruct) -> str:
+        cls_name = f"_{fb_struct.cl.__name__}_{len(globs)}"
+        globs[cls_name] = fb_struct.cl
+        field_exprs = []
+        for _, member, member_type in fb_struct.fields:
+            if isinstance(member, FlatbufferStruct):
+                field_exprs.append(make(member))
+            else:
+                arg = f"v{len(args)}"
+                args.append(arg)
+                if member_type not in HELPER_TYPE_TO_SCALAR_TYPE:
+                    # An enum.
+                    arg = _decode_enum(
+                        member_type,
+                        arg,
+                        f"{member_type.__name__}_{len(globs)}",
+                        globs,
+                        unknown_enums,
+                    )
+                field_exprs.append(arg)
+        return f"{cls_name}({', '.join(field_exprs)})"
+
+    body = make(fb_struct)
+    return f"def __fb_make_struct__({', '.join(args)}):\n    return {body}\n"
+
+
+def make_struct_dtype(fb_struct: FlatbufferStruct) -> Any:
+    """The NumPy structured dtype matching the layout of a struct."""
+    from numpy import dtype
+
+    names = []
+    formats = []
+    offsets = []
+    offset = 0
+    for name, member, _ in fb_struct.fields:
+        if isinstance(member, FlatbufferStruct):
+            member_dtype = make_struct_dtype(member)
+            alignment = member.alignment
+        else:
+            member_dtype = dtype(SCALAR_TYPE_TO_DTYPE[member])
+            alignment = member_dtype.itemsize
+        offset += -offset % alignment
+        names.append(name)
+        formats.append(member_dtype)
+        offsets.append(offset)
+        offset += member_dtype.itemsize
+    return dtype(
+        {
+            "names": names,
+            "formats": formats,
+            "offsets": offsets,
+            "itemsize": fb_struct.size,
+        }
+    )
+
+
+def struct_dtype(cl: type[AttrsInstance]) -> Any:
+    """The NumPy structured dtype of vectors of a struct class.
+
+    Use it to create arrays for `StructVector` fields.
+    """
+    return make_struct_dtype(analyze_struct(cl))
+
+
+def _load_struct_vector(
+    tab: Table,
+    offset: int,
+    size: int,
+    iter_unpack: Callable[[ReadableBuffer], Iterator[tuple]],
+    make: Callable[..., AttrsInstance],
+) -> list[AttrsInstance]:
+    """Load a vector of structs, unpacking them in a single pass."""
+    if offset == 0:
+        return []
+    start = tab.Vector(offset)
+    end = start + tab.VectorLen(offset) * size
+    data = memoryview(tab.Bytes)[start:end]
+    if start + len(data) != end:
+        raise IndexError(f"flatbuffers: vector of structs at {start} is out of range.")
+    return list(starmap(make, iter_unpack(data)))
+
+
+def register_codecs(codecs: Mapping[str, Callable]) -> None:
+    """Register functions generated ahead of time by `flattrs.modgen --emit-codecs`.
+
+    `codecs` maps the hashes of generated scripts to functions compiled from
+    them. Codec modules call this when imported.
+    """
+    _codecs.update(codecs)
+
+
+def script_hash(script: str) -> str:
+    """The key of a generated script in codec modules."""
+    return hashlib.sha1(script.encode("utf-8")).hexdigest()
+
+
+@cache
+def _flattrs_version() -> str:
+    try:
+        return version("flattrs")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+@cache
+def _import_codecs(module: str) -> None:
+    """Import the codec module generated next to a models module, if any."""
+    try:
+        import_module(f"{module}{CODECS_SUFFIX}")
+    except ModuleNotFoundError as exc:
+        if exc.name != f"{module}{CODECS_SUFFIX}":
+            raise
+
+
+def _compile(
+    script: str,
+    unique_filename: str,
+    globs: dict[str, Any],
+    module: str | None = None,
+    code_cache: CodeCache | None = None,
+) -> None:
+    """Compile and execute a generated script into `globs`.
+
+    If the codec module of the `module` the script was generated for contains
+    the exact same script, compiled ahead of time, the compiled function is
+    reused instead. Codecs generated from outdated models don't match, so
+    they are ignored. Otherwise, the compiled code is looked up in and
+    stored to `code_cache`, if given.
+    """
+    if module is not None:
+        _import_codecs(module)
+        if (codec := _codecs.get(script_hash(script))) is not None:
+            name = script[4 : script.index("(")]
+            globs[name] = FunctionType(codec.__code__, globs, name)
+            return
+
+    code = None
+    if code_cache is not None:
+        code = code_cache.load(script, unique_filename)
+    if code is None:
+        code = compile(script, unique_filename, "exec")
+        if code_cache is not None:
+            code_cache.store(script, unique_filename, code)
+    eval(code, globs)
 
     linecache.cache[unique_filename] = (
         len(script),
@@ -497,34 +1832,17 @@ def make_from_fb_fn(
         unique_filename,
     )
 
-    return globs["__fb_from_fb__"]
-
-
-SCALAR_TYPE_TO_PREPEND: Final[dict[ScalarType, str]] = {
-    "Bool": "PrependBool",
-    "Uint8": "PrependUint8",
-    "Uint16": "PrependUint16",
-    "Uint32": "PrependUint32",
-    "Uint64": "PrependUint64",
-    "Int8": "PrependInt8",
-    "Int16": "PrependInt16",
-    "Int32": "PrependInt32",
-    "Int64": "PrependInt64",
-    "Float32": "PrependFloat32",
-    "Float64": "PrependFloat64",
-}
-
 
-SCALAR_TYPES_TO_FLAGS: Final[dict[ScalarType, type]] = {
-    "Float32": Float32Flags,
-    "Float64": Float64Flags,
-    "Uint8": Uint8Flags,
-    "Uint16": Uint16Flags,
-    "Uint32": Uint32Flags,
-    "Uint64": Uint64Flags,
-    "Int8": Int8Flags,
-    "Int16": Int16Flags,
-    "Int32": Int32Flags,
-    "Int64": Int64Flags,
-    "Bool": BoolFlags,
+SCALAR_TYPE_TO_GETTER: Final[dict[ScalarType, str]] = {
+    "Bool": "GetBool",
+    "Uint8": "GetUint8",
+    "Uint16": "GetUint16",
+    "Uint32": "GetUint32",
+    "Uint64": "GetUint64",
+    "Int8": "GetInt8",
+    "Int16": "GetInt16",
+    "Int32": "GetInt32",
+    "Int64": "GetInt64",
+    "Float32": "GetFloat32",
+    "Float64": "GetFloat64",
 }
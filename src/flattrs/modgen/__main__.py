@@ -9,8 +9,46 @@ from .renderer import render
 @click.argument("input", type=click.Path(path_type=Path))
 @click.argument("output", type=click.Path(path_type=Path))
 @click.option("--gen-namespace-exports/--no-gen-namespace-exports", default=False)
-def main(input: Path, output: Path, gen_namespace_exports: bool) -> None:
-    render(input, output, gen_namespace_exports)
+@click.option(
+    "--lazy-exports/--no-lazy-exports",
+    default=False,
+    help="Import namespace exports on first access instead of eagerly.",
+)
+@click.option(
+    "--emit-codecs/--no-emit-codecs",
+    default=False,
+    help="Also generate encoders and decoders, so they aren't compiled at runtime.",
+)
+@click.option(
+    "--incremental/--no-incremental",
+    default=False,
+    help="Keep a manifest in the output directory, and only render changed schemas.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    default=1,
+    type=click.IntRange(min=1),
+    help="Parse and render in this many processes.",
+)
+def main(
+    input: Path,
+    output: Path,
+    gen_namespace_exports: bool,
+    lazy_exports: bool,
+    emit_codecs: bool,
+    incremental: bool,
+    jobs: int,
+) -> None:
+    render(
+        input,
+        output,
+        gen_namespace_exports,
+        emit_codecs,
+        incremental,
+        jobs,
+        lazy_exports,
+    )
 
 
 if __name__ == "__main__":
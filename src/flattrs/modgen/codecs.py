@@ -0,0 +1,111 @@
+"""Generate codec modules ahead of time, for `--emit-codecs`."""
+import sys
+from importlib import import_module
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+from types import ModuleType
+from uuid import uuid4
+
+from attrs import has
+from click import echo
+
+from .._analysis import analyze, analyze_struct
+from ..converters import (
+    CODECS_SUFFIX,
+    make_add_to_builder_script,
+    make_from_fb_script,
+    make_struct_fn,
+    make_struct_script,
+    script_hash,
+)
+from ..typing import is_struct
+from .manifest import write_if_changed
+
+
+def render_codecs(output: Path) -> None:
+    """Write a codec module next to every generated models module in `output`.
+
+    The models are imported as a package with a private, unique name, so
+    modules already imported under the name of `output` are left alone.
+    """
+    package = f"_flattrs_modgen_{uuid4().hex}"
+    spec = spec_from_file_location(
+        package, output / "__init__.py", submodule_search_locations=[str(output)]
+    )
+    sys.modules[package] = module_from_spec(spec)
+    try:
+        spec.loader.exec_module(sys.modules[package])
+        for path in sorted(output.rglob("*.py")):
+            if path.name == "__init__.py" or path.stem.endswith(CODECS_SUFFIX):
+                continue
+            rel_path = path.relative_to(output).with_suffix("")
+            module = import_module(".".join((package, *rel_path.parts)))
+            rendered = render_codec_module(module)
+            if rendered:
+                write_if_changed(
+                    path.with_name(f"{path.stem}{CODECS_SUFFIX}.py"), rendered
+                )
+    finally:
+        # The models may change before they are imported for real.
+        for name in [m for m in sys.modules if m.split(".")[0] == package]:
+            del sys.modules[name]
+
+
+def render_codec_module(module: ModuleType) -> str:
+    """Render the codecs of the models defined in a module.
+
+    These are the encoding and decoding functions `flattrs.converters`
+    would otherwise compile at runtime.
+    """
+    functions = []
+    for cl in vars(module).values():
+        if not isinstance(cl, type) or not has(cl) or cl.__module__ != module.__name__:
+            continue
+        try:
+            if is_struct(cl):
+                fb_struct = analyze_struct(cl)
+                if make_struct_fn(fb_struct) is cl:
+                    # Plain structs are created by their class directly.
+                    continue
+                scripts = [make_struct_script(fb_struct, {})]
+            else:
+                fb_cl = analyze(cl)
+                scripts = [
+                    make_add_to_builder_script(fb_cl, _no_hook, {}),
+                    make_from_fb_script(fb_cl, _no_hook, {}),
+                ]
+        except (TypeError, ValueError) as exc:
+            echo(f"Skipping codecs for {cl.__name__}: {exc}", err=True)
+            continue
+        for script in scripts:
+            name = script[4 : script.index("(")]
+            functions.append(
+                (script_hash(script), f"{cl.__name__}{name}", script, name)
+            )
+
+    if not functions:
+        return ""
+    module_name = module.__name__.rsplit(".", 1)[-1]
+    lines = [
+        f'"""Generated by `flattrs.modgen --emit-codecs` for `{module_name}`. Do not edit.',
+        "",
+        "Converters use these functions instead of compiling them at runtime,",
+        "as long as they match the models.",
+        '"""',
+        "from flattrs.converters import register_codecs",
+    ]
+    for _, fn_name, script, name in functions:
+        lines.extend(["", ""])
+        lines.append(f"def {fn_name}{script[4 + len(name):]}".rstrip("\n"))
+    lines.extend(["", "", "register_codecs("])
+    lines.append("    {")
+    for key, fn_name, _, _ in functions:
+        lines.append(f'        "{key}": {fn_name},')
+    lines.append("    }")
+    lines.append(")")
+    return "\n".join(lines) + "\n"
+
+
+def _no_hook(*_) -> None:
+    """Nested hooks are provided by the converter when linking."""
+    return None
@@ -0,0 +1,117 @@
+"""The manifest of incremental `modgen` runs.
+
+The manifest lives in the output directory and records, for every schema
+file, what the other schema files need to know about it and what its output
+was rendered from. Files whose inputs are unchanged aren't parsed or rendered
+again.
+"""
+import json
+from hashlib import sha256
+from pathlib import Path
+from typing import Mapping, Sequence
+
+from attrs import define, field, frozen
+
+from ..converters import _flattrs_version
+
+MANIFEST_NAME = ".flattrs-modgen.json"
+
+
+@frozen
+class Summary:
+    """A parsed schema file, as seen from other schema files."""
+
+    hash: str
+    path: Path = field(converter=Path)
+    namespace: str | None
+    importables: Sequence[tuple[str, str]] = field(
+        converter=lambda i: tuple(tuple(e) for e in i)
+    )
+    references: Sequence[str] = field(converter=tuple)
+    #: The dependency key the output was last rendered with.
+    key: str = ""
+    #: The names exported from the namespace package, once rendered.
+    exports: Sequence[str] = field(default=(), converter=tuple)
+    #: Whether rendering produced an empty module, which isn't written.
+    empty: bool = False
+
+
+@define
+class Manifest:
+    files: dict[str, Summary] = field(factory=dict)
+
+    @classmethod
+    def load(cls, output: Path) -> "Manifest":
+        """Load the manifest of `output`, or an empty one if it's missing or outdated."""
+        try:
+            raw = json.loads((output / MANIFEST_NAME).read_text())
+        except (OSError, ValueError):
+            return cls()
+        if raw.get("version") != _flattrs_version():
+            return cls()
+        try:
+            return cls({k: Summary(**v) for k, v in raw["files"].items()})
+        except (KeyError, TypeError):
+            return cls()
+
+    def save(self, output: Path) -> None:
+        raw = {
+            "version": _flattrs_version(),
+            "files": {
+                name: {
+                    "hash": s.hash,
+                    "path": str(s.path),
+                    "namespace": s.namespace,
+                    "importables": s.importables,
+                    "references": s.references,
+                    "key": s.key,
+                    "exports": s.exports,
+                    "empty": s.empty,
+                }
+                for name, s in sorted(self.files.items())
+            },
+        }
+        write_if_changed(output / MANIFEST_NAME, json.dumps(raw, indent=1) + "\n")
+
+
+def file_hash(content: bytes) -> str:
+    return sha256(content).hexdigest()
+
+
+def dependency_key(
+    summary: Summary,
+    enums: set[str],
+    importables_to_module: Mapping[str, Sequence[Summary]],
+    namespace_to_attributes: Mapping[str, set[str]],
+) -> str:
+    """Hash everything the output of a schema file depends on.
+
+    That's the file itself, and how every name it references resolves:
+    whether it's an enum, which modules define it and which namespaces
+    define it as an attribute.
+    """
+    facts: list = [summary.hash]
+    for ref in summary.references:
+        facts.append(
+            [
+                ref,
+                ref in enums,
+                [
+                    (str(m.path), m.namespace)
+                    for m in importables_to_module.get(ref, [])
+                ],
+                [ns for ns, attrs in namespace_to_attributes.items() if ref in attrs],
+            ]
+        )
+    return sha256(json.dumps(facts).encode()).hexdigest()
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write `content` to `path` unless it's already there, preserving mtimes."""
+    try:
+        if path.read_text() == content:
+            return False
+    except OSError:
+        pass
+    path.write_text(content)
+    return True
@@ -10,7 +10,7 @@ DIGIT: "0".."9"
 DECIMAL_POSITIVE_INTEGER: "1".."9" DIGIT*
 
 LETTER: UCASE_LETTER | LCASE_LETTER
-WORD: LETTER+
+WORD: LETTER (LETTER | DIGIT | "_")*
 
 COMMENT: "//" /.*/ "\n"
          | "/*" /(.|\n|\r)+/ "*/"
@@ -31,27 +31,33 @@ enum_field_default: "=" NUMBER
 table: "table" NAME attributes? "{" table_field* "}"
 table_field: NAME ":" (scalar_type | vector_type | NAMESPACED_NAME) table_field_default? attributes? ";"
 table_field_default: "=" (NAMESPACED_NAME | NUMBER)
-attributes: "(" [WORD ("," WORD)*] ")"
+struct: "struct" NAME attributes? "{" table_field* "}"
+attributes: "(" [attribute_value ("," attribute_value)*] ")"
+// Attributes without values stay plain `WORD` tokens.
+?attribute_value: WORD (":" STRING)?
 
-union: "union" NAME "{" [union_member (("," union_member ","?)* | ",")] "}"
+union: "union" NAME "{" [union_member ("," union_member)* ","?] "}"
 union_member: NAMESPACED_NAME ("=" DECIMAL_POSITIVE_INTEGER)?
 
 attribute: "attribute \"" NAME "\"" ";"
 
-BOOL_TYPE: "bool"
-INT_TYPES: "u"? "int" ("8"|"16"|"32"|"64")? | "ubyte" | "ushort" | "ulong"
-           | "byte" | "short" | "long"
-FLOAT_TYPES: "float" | "float32" | "double" | "float64"
+// Keywords win over names of the same length, but not over longer names.
+BOOL_TYPE.2: /bool\b/
+INT_TYPES.2: /(u?int(8|16|32|64)?|ubyte|ushort|ulong|byte|short|long)\b/
+FLOAT_TYPES.2: /(float|float32|double|float64)\b/
 STRING_TYPE: "string"
 scalar_type: BOOL_TYPE | INT_TYPES | FLOAT_TYPES
 vector_type: "[" NAMESPACED_NAME "]"
 
-module: include* namespace? (table | enum | union | attribute)* root_type?
+module: include* namespace? (table | struct | enum | union | attribute)* root_type?
 
 %import common.SIGNED_NUMBER -> NUMBER
+%import common.ESCAPED_STRING -> STRING
 %import common.WS
 %ignore WS
 %ignore COMMENT
 """,
     start="module",
+    parser="lalr",
+    cache=True,
 )
@@ -1,8 +1,12 @@
+from ast import literal_eval
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from enum import Enum as PythonEnum
+from functools import partial
 from keyword import iskeyword
 from pathlib import Path
 from traceback import print_exception
-from typing import Final, Mapping, Sequence, Set, TypeAlias
+from typing import Callable, Final, Mapping, Sequence, Set, TypeAlias, TypeVar
 
 from attrs import define, evolve, field, frozen
 from immutables import Map
@@ -10,6 +14,8 @@ from lark import ParseTree, Token, Tree
 from lark.visitors import Interpreter
 
 from .._types import FieldName, Optionality
+from ..converters import CODECS_SUFFIX
+from .manifest import Manifest, Summary, dependency_key, file_hash, write_if_changed
 from .parser import parser
 
 ImportableName: TypeAlias = str
@@ -18,6 +24,7 @@ Imports: TypeAlias = Mapping[str, Set[str]]
 UnresolvedImports: TypeAlias = Set[tuple[NamespacePrefix, ImportableName]]
 Script: TypeAlias = list[str]
 MISSING: Final = "$MISSING"
+T = TypeVar("T")
 
 
 @frozen
@@ -27,8 +34,9 @@ class Attribute:
     namespace: str | None = MISSING
 
 
-BUILTIN_ATTRS = {"required", "deprecated", "key"}
+BUILTIN_ATTRS = {"required", "deprecated", "key", "nested_flatbuffer"}
 NO_REPR = Attribute("norepr", namespace="flattrs")
+KEY = Attribute("key", namespace=None)
 FROZEN = Attribute("immutable", namespace="flattrs")
 
 
@@ -132,9 +140,11 @@ class Table:
             has_repr = True
             if f.type == "bytes" or NO_REPR in f.attrs:
                 has_repr = False
-            needs_field = not has_repr
+            needs_field = not has_repr or KEY in f.attrs
             if needs_field:
                 imports = merge_imports(imports, {"attrs": {"field"}})
+            if KEY in f.attrs:
+                imports = merge_imports(imports, {"flattrs.types": {"KEY"}})
         return evolve(self, imports=imports)
 
     def render(self) -> Script:
@@ -152,7 +162,8 @@ class Table:
             if f.type == "bytes" or NO_REPR in f.attrs:
                 has_repr = False
 
-            needs_field = not has_repr
+            is_key = KEY in f.attrs
+            needs_field = not has_repr or is_key
 
             if needs_field:
                 field_args = []
@@ -160,6 +171,8 @@ class Table:
                     field_args.append(("default", f.default))
                 if not has_repr:
                     field_args.append(("repr", "False"))
+                if is_key:
+                    field_args.append(("metadata", "{KEY: True}"))
                 field_str = ", ".join(f"{k}={v}" for k, v in field_args)
                 def_str = f" = field({field_str})"
             elif f.default:
@@ -176,6 +189,29 @@ class Table:
         return script
 
 
+@frozen
+class Struct(Table):
+    """Structs are tables laid out inline, with all fields present."""
+
+    def adjust_defaults(self) -> "Struct":
+        """Struct fields are never optional, and have no defaults."""
+        return evolve(
+            self,
+            field_defs=[
+                evolve(f, is_optional=False, default="") for f in self.field_defs
+            ],
+        )
+
+    def adjust_imports(self) -> "Struct":
+        table = super().adjust_imports()
+        return evolve(
+            table, imports=merge_imports(table.imports, {"flattrs": {"struct"}})
+        )
+
+    def render(self) -> Script:
+        return ["@struct", *super().render()]
+
+
 @define
 class Enum:
     name: str
@@ -303,7 +339,7 @@ class FlatbufferInterpreter(Interpreter):
         ] = [
             self.visit(t)
             for t in tree.find_pred(
-                lambda t: t.data in ("table", "enum", "union", "attribute")
+                lambda t: t.data in ("table", "struct", "enum", "union", "attribute")
             )
         ]
         imports = {}
@@ -413,10 +449,7 @@ class FlatbufferInterpreter(Interpreter):
         table_attributes = []
         for child in tree.children:
             if isinstance(child, Tree) and child.data == "attributes":
-                table_attributes.extend(
-                    Attribute(c, namespace=None if c in BUILTIN_ATTRS else MISSING)
-                    for c in child.children
-                )
+                table_attributes.extend(parse_attribute(c) for c in child.children)
         field_defs = [self.table_field(c) for c in tree.find_data("table_field")]
         imports = Map()
         urs = set()
@@ -425,7 +458,10 @@ class FlatbufferInterpreter(Interpreter):
             urs |= unresolved_imports
         fields = []
         for f in field_defs:
-            is_optional = Attribute("required", namespace=None) not in f[3]
+            # Like flatc, keys are required.
+            is_optional = Attribute("required", namespace=None) not in f[3] and (
+                KEY not in f[3]
+            )
             fields.append(
                 Table.Field(
                     f[0],
@@ -444,6 +480,20 @@ class FlatbufferInterpreter(Interpreter):
             imports,
         )
 
+    def struct(self, tree: ParseTree) -> tuple[ImportableName, Struct, Imports]:
+        name, table, imports = self.table(tree)
+        return (
+            name,
+            Struct(
+                name,
+                table.field_defs,
+                table.imports,
+                table.attrs,
+                table.unresolved_imports,
+            ),
+            imports,
+        )
+
     def table_field(
         self, tree: ParseTree
     ) -> tuple[FieldName, str, str, list[Attribute], Imports, UnresolvedImports, str]:
@@ -453,13 +503,7 @@ class FlatbufferInterpreter(Interpreter):
         full_type = tree.children[1]
         attributes = []
         for attr_tree in tree.find_data("attributes"):
-            for c in attr_tree.children:
-                attr_name = str(c)
-                if attr_name in BUILTIN_ATTRS:
-                    attr_namespace = None
-                else:
-                    attr_namespace = MISSING
-                attributes.append(Attribute(attr_name, namespace=attr_namespace))
+            attributes.extend(parse_attribute(c) for c in attr_tree.children)
         is_scalar = False
         namespace_prefix = ""
         if full_type == "string":
@@ -479,6 +523,16 @@ class FlatbufferInterpreter(Interpreter):
                 inner_type = full_type.children[0]
                 if inner_type.lower() in ("uint8", "ubyte"):
                     type = "bytes"
+                    for attr in attributes:
+                        if attr.name == "nested_flatbuffer" and attr.value:
+                            namespace_prefix, nested_type = (
+                                attr.value.rsplit(".", 1)
+                                if "." in attr.value
+                                else ("", attr.value)
+                            )
+                            unresolved_imports.add((namespace_prefix, nested_type))
+                            imports["flattrs"] = {"Nested"}
+                            type = f"Nested[{nested_type}]"
                 else:
                     if inner_type.lower() in TYPE_MAP:
                         inner_type = TYPE_MAP[inner_type]
@@ -529,43 +583,70 @@ class FlatbufferInterpreter(Interpreter):
         pass
 
 
+def parse_attribute(node: Token | Tree) -> Attribute:
+    """Parse an attribute, either a name or a name with a string value."""
+    value = None
+    if isinstance(node, Tree):
+        node, value = node.children
+        value = literal_eval(value)
+    name = str(node)
+    return Attribute(name, value, namespace=None if name in BUILTIN_ATTRS else MISSING)
+
+
 def parse_module(module_tree: Tree, file: Path) -> Module:
     r = FlatbufferInterpreter()
     parsed_module = r.module(module_tree, file)
     return parsed_module
 
 
-def render_directory(
-    input: Path, output: Path, gen_namespace_imports: bool = False
-) -> None:
-    """
-    Render a directory of Flatbuffers into a directory of Python.
+def summarize(module: Module, tree: ParseTree, hash: str) -> Summary:
+    """Summarize a parsed module for resolving the others, and for the manifest."""
+    kinds = {Struct: "struct", Table: "table", Enum: "enum", Union: "union"}
+    references = {
+        (literal_eval(token) if token.type == "STRING" else str(token)).rsplit(".", 1)[
+            -1
+        ]
+        for token in tree.scan_values(lambda v: isinstance(v, Token))
+        if token.type in ("NAME", "NAMESPACED_NAME", "WORD", "STRING")
+    }
+    return Summary(
+        hash,
+        module.path,
+        module.namespace,
+        [(name, kinds.get(i.__class__, "attribute")) for name, i in module.importables],
+        sorted(references),
+    )
+
 
+def parse_file(file: Path, rel_path: Path, hash: str) -> tuple[Module, Summary] | None:
+    """Parse a schema file, printing errors."""
+    try:
+        tree = parser.parse(file.read_text())
+        module = parse_module(tree, rel_path)
+    except Exception as exc:
+        print(f"While parsing {file}: {exc}")
+        print_exception(exc)
+        return None
+    return module, summarize(module, tree, hash)
+
+
+def render_module(
+    enums: set[str],
+    namespace_to_attributes: dict[str, set[str]],
+    importables_to_module: Mapping[str, Sequence[Summary]],
+    file: Path,
+    pm: Module | None,
+    rel_path: Path,
+) -> tuple[str, list[str]] | None:
+    """Resolve and render a module, printing errors.
+
+    Returns the rendered module and the names it exports.
     """
-    # First we parse, then we resolve imports, then we write.
-    per_namespace: dict[str | None, list[Module]] = {}
-    importables_to_module: dict[str, list[Module]] = {}
-    namespace_to_attributes: dict[str, set[str]] = {}
-    enums = set()
-    modules: list[Module] = []
-    for file in input.rglob("*.fbs"):
-        rel_path = file.relative_to(input).with_suffix(".py")
-        try:
-            pm = parse_module(parser.parse(file.read_text()), rel_path)
-        except Exception as exc:
-            print(f"While parsing {file}: {exc}")
-            print_exception(exc)
-        modules.append(pm)
-        # Gather importables so we can resolve them later.
-        for name, importable in pm.importables:
-            importables_to_module.setdefault(name, []).append(pm)
-            if isinstance(importable, Enum):
-                enums.add(importable.name)
-            elif isinstance(importable, Attribute):
-                namespace_to_attributes.setdefault(pm.namespace or "", set()).add(
-                    importable.name
-                )
-        per_namespace.setdefault(pm.namespace, []).append(pm)
+    if pm is None:
+        # The file is unchanged, but the names it references resolve differently.
+        if (parsed := parse_file(file, rel_path, "")) is None:
+            return None
+        pm = parsed[0]
 
     # We can resolve attribute namespaces now.
     # At this point, we know which importables are enums.
@@ -573,91 +654,229 @@ def render_directory(
     # For each table, add defaults as much as possible,
     # starting from backwards. This is so fields added at the end
     # keep backwards comp.
-    for module in modules:
-        module.importables = [
-            (
-                name,
-                i.adjust_attribute_namespaces(namespace_to_attributes)
-                .adjust_enums(enums)
-                .adjust_defaults()
-                .adjust_imports()
-                if isinstance(i, Table)
-                else i,
-            )
-            for name, i in module.importables
+    pm.importables = [
+        (
+            importable_name,
+            i.adjust_attribute_namespaces(namespace_to_attributes)
+            .adjust_enums(enums)
+            .adjust_defaults()
+            .adjust_imports()
+            if isinstance(i, Table)
+            else i,
+        )
+        for importable_name, i in pm.importables
+    ]
+
+    pm_path = pm.path
+    for ns, importable in pm.unresolved_imports:
+        for module in importables_to_module[importable]:
+            if pm.namespace == module.namespace:
+                # Referencing a symbol in the same namespace.
+                break
+            if not ns:
+                if not module.namespace:
+                    break
+            else:
+                # A namespace is referenced.
+                if module.namespace is not None:
+                    if module.namespace.endswith(ns):
+                        break
+        else:
+            raise Exception(f"Cannot resolve {ns}.{importable} in {pm_path}")
+
+        if module.path.parent == pm_path.parent:
+            rel_import = f".{module.path.stem}"
+        else:
+            pm_parents = set(pm_path.parents)
+            target_parents = set(module.path.parents)
+            common_parent = sorted(
+                pm_parents & target_parents, key=lambda p: -len(str(p))
+            )[0]
+            num_dots = len(pm_path.relative_to(common_parent).parent.parts) + 1
+
+            target_rel_path = module.path.relative_to(common_parent)
+            fname = target_rel_path.stem
+            if target_rel_path.parent == Path("."):
+                rel_import = f"{'.' * num_dots}{fname}"
+            else:
+                rel_import = f"{'.' * num_dots}{str(target_rel_path.parent).replace('/', '.')}.{fname}"
+        pm.imports.setdefault(str(rel_import), set()).add(importable)
+    try:
+        rendered = pm.render()
+    except Exception as exc:
+        print(f"While parsing or rendering {file}: {exc}")
+        print_exception(exc)
+        return None
+    # Rendering drops reordered unions from the importables.
+    return rendered, [n for n, i in pm.importables if not isinstance(i, Attribute)]
+
+
+def render_directory(
+    input: Path,
+    output: Path,
+    gen_namespace_imports: bool = False,
+    incremental: bool = False,
+    jobs: int = 1,
+    lazy_exports: bool = False,
+) -> None:
+    """
+    Render a directory of Flatbuffers into a directory of Python.
+
+    If `incremental`, a manifest is kept in the output directory and only
+    files whose inputs changed since the last run are parsed and rendered.
+    Output files are only written if their contents change.
+
+    With more than one job, files are parsed and rendered in a process pool.
+    The output doesn't depend on the number of jobs.
+
+    With `lazy_exports`, namespace exports are only imported on first access.
+    """
+    with ProcessPoolExecutor(jobs) if jobs > 1 else nullcontext() as executor:
+
+        def map_jobs(fn: Callable[..., T], *args: Sequence) -> list[T]:
+            if executor is None:
+                return list(map(fn, *args))
+            chunksize = max(1, len(args[0]) // (jobs * 4))
+            return list(executor.map(fn, *args, chunksize=chunksize))
+
+        # First we parse, then we resolve imports, then we write.
+        manifest = Manifest.load(output) if incremental else Manifest()
+        hashes = {}
+        for file in sorted(input.rglob("*.fbs")):
+            hashes[file.relative_to(input).as_posix()] = file_hash(file.read_bytes())
+        to_parse = [
+            name
+            for name, hash in hashes.items()
+            if name not in manifest.files or manifest.files[name].hash != hash
         ]
+        parsed = dict(
+            zip(
+                to_parse,
+                map_jobs(
+                    parse_file,
+                    [input / name for name in to_parse],
+                    [Path(name).with_suffix(".py") for name in to_parse],
+                    [hashes[name] for name in to_parse],
+                ),
+            )
+        )
+
+        summaries: dict[str, Summary] = {}
+        per_namespace: dict[str | None, list[str]] = {}
+        importables_to_module: dict[str, list[Summary]] = {}
+        namespace_to_attributes: dict[str, set[str]] = {}
+        enums = set()
+        for name in hashes:
+            if name in parsed:
+                if parsed[name] is None:
+                    continue
+                summary = parsed[name][1]
+            else:
+                summary = manifest.files[name]
+            summaries[name] = summary
+            # Gather importables so we can resolve them later.
+            for importable_name, kind in summary.importables:
+                importables_to_module.setdefault(importable_name, []).append(summary)
+                if kind == "enum":
+                    enums.add(importable_name)
+                elif kind == "attribute":
+                    namespace_to_attributes.setdefault(
+                        summary.namespace or "", set()
+                    ).add(importable_name)
+            per_namespace.setdefault(summary.namespace, []).append(name)
+
+        to_render = []
+        keys = {}
+        packages = {Path(".")}
+        for name, summary in summaries.items():
+            keys[name] = dependency_key(
+                summary, enums, importables_to_module, namespace_to_attributes
+            )
+            old = manifest.files.get(name)
+            if (
+                old is not None
+                and old.key == keys[name]
+                and (old.empty or (output / summary.path).is_file())
+            ):
+                summaries[name] = old
+                if not old.empty:
+                    packages.add(summary.path.parent)
+            else:
+                to_render.append(name)
+        rendered_modules = map_jobs(
+            partial(
+                render_module, enums, namespace_to_attributes, importables_to_module
+            ),
+            [input / name for name in to_render],
+            [parsed[name][0] if name in parsed else None for name in to_render],
+            [summaries[name].path for name in to_render],
+        )
 
     # Now we write the modules to disk.
     output.mkdir(exist_ok=True, parents=True)
-    (output / "__init__.py").write_text("")
-    for pm_list in per_namespace.values():
-        for pm in pm_list:
-            pm_path = pm.path
-            for ns, importable in pm.unresolved_imports:
-                for module in importables_to_module[importable]:
-                    if pm.namespace == module.namespace:
-                        # Referencing a symbol in the same namespace.
-                        break
-                    if not ns:
-                        if not module.namespace:
-                            break
-                    else:
-                        # A namespace is referenced.
-                        if module.namespace is not None:
-                            if module.namespace.endswith(ns):
-                                break
-                else:
-                    raise Exception(f"Cannot resolve {ns}.{importable} in {pm_path}")
-
-                if module.path.parent == pm_path.parent:
-                    rel_path = f".{module.path.stem}"
-                else:
-                    pm_parents = set(pm_path.parents)
-                    target_parents = set(module.path.parents)
-                    common_parent = sorted(
-                        pm_parents & target_parents, key=lambda p: -len(str(p))
-                    )[0]
-                    num_dots = len(pm_path.relative_to(common_parent).parent.parts) + 1
-
-                    target_rel_path = module.path.relative_to(common_parent)
-                    fname = target_rel_path.stem
-                    if target_rel_path.parent == Path("."):
-                        rel_path = f"{'.' * num_dots}{fname}"
-                    else:
-                        rel_path = f"{'.' * num_dots}{str(target_rel_path.parent).replace('/', '.')}.{fname}"
-                pm.imports.setdefault(str(rel_path), set()).add(importable)
-            try:
-                target_file = output / pm.path
-                rendered = pm.render()
-                if not rendered:
-                    continue
-                target_file.parent.mkdir(exist_ok=True, parents=True)
-                (target_file.parent / "__init__.py").write_text("")
-                target_file.write_text(rendered)
-            except Exception as exc:
-                print(f"While parsing or rendering {file}: {exc}")
-                print_exception(exc)
+    for name, result in zip(to_render, rendered_modules):
+        if result is None:
+            del summaries[name]
+            continue
+        rendered, exports = result
+        summary = summaries[name] = evolve(
+            summaries[name], key=keys[name], empty=not rendered, exports=exports
+        )
+        if not rendered:
+            continue
+        target_file = output / summary.path
+        target_file.parent.mkdir(exist_ok=True, parents=True)
+        packages.add(summary.path.parent)
+        write_if_changed(target_file, rendered)
+
+    # Outputs of schema files that are gone.
+    stale_inits = set()
+    for name, old in manifest.files.items():
+        if name in hashes:
+            continue
+        if not old.empty:
+            (output / old.path).unlink(missing_ok=True)
+            codecs = old.path.with_name(f"{old.path.stem}{CODECS_SUFFIX}.py")
+            (output / codecs).unlink(missing_ok=True)
+            stale_inits.add(old.path.parent / "__init__.py")
+        if gen_namespace_imports and old.exports:
+            stale_inits.add(namespace_init(old.namespace))
+
+    inits = {package / "__init__.py": "" for package in packages}
     if gen_namespace_imports:
-        for namespace, pm_list in per_namespace.items():
+        modules = [m.path for m in summaries.values() if not m.empty]
+        for namespace, names in per_namespace.items():
             importables: list[tuple[str, Path]] = []
-            for module in pm_list:
-                importables.extend(
-                    [
-                        (i[0], module.path)
-                        for i in module.importables
-                        if not isinstance(i[1], Attribute)
-                    ]
-                )
+            for name in names:
+                if name in summaries:
+                    summary = summaries[name]
+                    importables.extend((e, summary.path) for e in summary.exports)
             if not importables:
                 continue
-            namespace_dir = Path(
-                namespace.replace(".", "/") if namespace is not None else "."
-            )
-            namespace_fn = namespace_dir / "__init__.py"
-            (output / namespace_dir).mkdir(parents=True, exist_ok=True)
-            (output / namespace_fn).write_text(
-                render_exports(namespace_fn, importables)
+            namespace_fn = namespace_init(namespace)
+            inits[namespace_fn] = render_exports(
+                namespace_fn, importables, lazy_exports, modules
             )
+    for init, rendered in inits.items():
+        (output / init).parent.mkdir(parents=True, exist_ok=True)
+        write_if_changed(output / init, rendered)
+    # Packages and namespaces left without modules or exports.
+    for init in stale_inits - inits.keys():
+        (output / init).unlink(missing_ok=True)
+        try:
+            (output / init).parent.rmdir()
+        except OSError:
+            pass
+
+    if incremental:
+        manifest.files = summaries
+        manifest.save(output)
+
+
+def namespace_init(namespace: str | None) -> Path:
+    """The `__init__.py` exporting the contents of a namespace."""
+    namespace_dir = namespace.replace(".", "/") if namespace is not None else "."
+    return Path(namespace_dir) / "__init__.py"
 
 
 def make_import_path(importing_from: Path, import_target: Path) -> str:
@@ -680,7 +899,19 @@ def make_import_path(importing_from: Path, import_target: Path) -> str:
     return rel_path
 
 
-def render_exports(importing_from: Path, importables: list[tuple[str, Path]]) -> str:
+def render_exports(
+    importing_from: Path,
+    importables: list[tuple[str, Path]],
+    lazy: bool = False,
+    modules: Sequence[Path] = (),
+) -> str:
+    if lazy:
+        # Importing a module binds it on its package, where it would shadow
+        # a lazy export of the same name.
+        shadowed = {m.stem for m in modules if m.parent == importing_from.parent}
+        eager = [(i, p) for i, p in importables if i in shadowed]
+        if len(eager) < len(importables):
+            return render_lazy_exports(importing_from, importables, eager)
     return (
         "\n".join(
             f"from {make_import_path(importing_from, p)} import {i}"
@@ -692,12 +923,68 @@ def render_exports(importing_from: Path, importables: list[tuple[str, Path]]) ->
     )
 
 
-def render(input: Path, output: Path, gen_namespace_exports: bool = False) -> None:
+def render_lazy_exports(
+    importing_from: Path,
+    importables: list[tuple[str, Path]],
+    eager: Sequence[tuple[str, Path]] = (),
+) -> str:
+    """Render exports imported on first access, using PEP 562.
+
+    Type checkers see the usual imports. The `eager` exports are imported
+    right away.
+    """
+    lazy = [(i, p) for i, p in importables if (i, p) not in eager]
+    return (
+        "from importlib import import_module\n"
+        "from typing import TYPE_CHECKING, Any\n\n"
+        + "".join(
+            f"from {make_import_path(importing_from, p)} import {i}\n" for i, p in eager
+        )
+        + ("\n" if eager else "")
+        + "if TYPE_CHECKING:\n"
+        + "\n".join(
+            f"    from {make_import_path(importing_from, p)} import {i}"
+            for i, p in lazy
+        )
+        + "\n\n__all__ = ["
+        + "\n".join(f'"{i[0]}",' for i in sorted(importables))
+        + "]\n\n_exports = {"
+        + "\n".join(
+            f'"{i}": "{make_import_path(importing_from, p)}",' for i, p in sorted(lazy)
+        )
+        + "}\n\n\n"
+        "def __getattr__(name: str) -> Any:\n"
+        "    try:\n"
+        "        module = _exports[name]\n"
+        "    except KeyError:\n"
+        '        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None\n'
+        "    value = globals()[name] = getattr(import_module(module, __name__), name)\n"
+        "    return value\n\n\n"
+        "def __dir__() -> list[str]:\n"
+        "    return sorted(set(globals()) | set(__all__))\n"
+    )
+
+
+def render(
+    input: Path,
+    output: Path,
+    gen_namespace_exports: bool = False,
+    emit_codecs: bool = False,
+    incremental: bool = False,
+    jobs: int = 1,
+    lazy_exports: bool = False,
+) -> None:
     if input.is_file():
         output.parent.mkdir(exist_ok=True, parents=True)
         output.write_text(parse_module(parser.parse(input.read_text()), output))
     else:
-        render_directory(input, output, gen_namespace_exports)
+        render_directory(
+            input, output, gen_namespace_exports, incremental, jobs, lazy_exports
+        )
+        if emit_codecs:
+            from .codecs import render_codecs
+
+            render_codecs(output)
 
 
 def merge_imports(a: Imports, b: Imports) -> Imports:
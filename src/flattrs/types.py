@@ -1,13 +1,25 @@
 from enum import IntEnum
-from typing import Annotated, Literal, TypeAlias
-
-from attrs import frozen
+from typing import (
+    Annotated,
+    Any,
+    Callable,
+    Final,
+    Generic,
+    Literal,
+    TypeAlias,
+    TypeVar,
+    final,
+)
+
+from attrs import frozen, has
 
 try:
     from enum import ReprEnum as Enum
 except ImportError:
     from enum import Enum
 
+T = TypeVar("T")
+
 
 @frozen
 class ScalarMarker:
@@ -28,6 +40,41 @@ Float32: TypeAlias = Float
 Float64: TypeAlias = float
 
 
+@frozen
+class VectorMarker:
+    """Annotate a `numpy.ndarray` with this to store it as a vector of scalars.
+
+    For example, `Annotated[np.ndarray, Float32Vector]`.
+    """
+
+    scalar_type: Literal[
+        "Bool",
+        "Uint8",
+        "Uint16",
+        "Uint32",
+        "Uint64",
+        "Int8",
+        "Int16",
+        "Int32",
+        "Int64",
+        "Float32",
+        "Float64",
+    ]
+
+
+BoolVector: Final = VectorMarker("Bool")
+Uint8Vector: Final = VectorMarker("Uint8")
+Uint16Vector: Final = VectorMarker("Uint16")
+Uint32Vector: Final = VectorMarker("Uint32")
+Uint64Vector: Final = VectorMarker("Uint64")
+Int8Vector: Final = VectorMarker("Int8")
+Int16Vector: Final = VectorMarker("Int16")
+Int32Vector: Final = VectorMarker("Int32")
+Int64Vector: Final = VectorMarker("Int64")
+Float32Vector: Final = VectorMarker("Float32")
+Float64Vector: Final = VectorMarker("Float64")
+
+
 class Uint8Enum(IntEnum):
     """An 8-bit Flatbuffer enum."""
 
@@ -65,7 +112,126 @@ class Int32Enum(IntEnum):
 Int64Enum: TypeAlias = IntEnum
 
 
+@frozen
+class StructVector:
+    """Annotate a `numpy.ndarray` with this to store it as a vector of structs.
+
+    For example, `Annotated[np.ndarray, StructVector(Point)]`. The array has
+    the structured dtype given by `flattrs.struct_dtype(Point)`.
+    """
+
+    struct: type
+
+
+def struct(cl: type[T]) -> type[T]:
+    """Mark an attrs class as a Flatbuffer struct, instead of a table.
+
+    Structs are fixed-size records stored inline, without a vtable. Their
+    fields can only be scalars, enums and other structs.
+    """
+    cl.__flattrs_struct__ = True
+    return cl
+
+
+@final
+class Nested(Generic[T]):
+    """A nested flatbuffer of a `T`, stored in a byte vector.
+
+    Fields annotated with `Nested[T]` behave like the Flatbuffer
+    `nested_flatbuffer` attribute. When loaded, they point into the outer
+    payload without copying it, and are only decoded by `load`.
+    For dumping, they wrap either a model, dumped along with the outer
+    model, or an already dumped payload. Fields can also be set to the
+    model or the payload directly.
+    """
+
+    __slots__ = ("_model", "_buffer", "_start", "_size", "_loader")
+
+    def __init__(self, value: Any) -> None:
+        self._loader = None
+        if has(value.__class__):
+            self._model = value
+            self._buffer = None
+        else:
+            self._model = None
+            self._buffer = value
+            self._start = 0
+            self._size = memoryview(value).nbytes
+
+    @classmethod
+    def _in_place(
+        cls,
+        buffer: Any,
+        start: int,
+        size: int,
+        loader: Callable[[Any, int], T],
+    ) -> "Nested[T]":
+        """A nested flatbuffer at `start` in `buffer`, decoded by `loader`."""
+        res = cls.__new__(cls)
+        res._model = None
+        res._buffer = buffer
+        res._start = start
+        res._size = size
+        res._loader = loader
+        return res
+
+    @property
+    def data(self) -> memoryview | None:
+        """The dumped nested flatbuffer, if it isn't just a model."""
+        if self._buffer is None:
+            return None
+        return memoryview(self._buffer).cast("B")[
+            self._start : self._start + self._size
+        ]
+
+    def load(self) -> T:
+        """Decode the nested flatbuffer, once."""
+        if self._model is None:
+            if self._loader is None:
+                raise ValueError(
+                    "flattrs: nested flatbuffers created from payloads cannot be loaded, use `loads`."
+                )
+            self._model = self._loader(self._buffer, self._start)
+        return self._model
+
+    def _value(self) -> Any:
+        if self._model is None and self._loader is None:
+            return bytes(self.data)
+        return self.load()
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not Nested:
+            return NotImplemented
+        return self._value() == other._value()
+
+    def __repr__(self) -> str:
+        if self._model is not None:
+            return f"Nested({self._model!r})"
+        return f"Nested(<{self._size} bytes>)"
+
+
+KEY: Final = "flattrs_key"
+"""Mark the key field of a table with `attrs.field(metadata={KEY: True})`.
+
+Like the Flatbuffer `key` attribute, vectors of the table are sorted by it
+when dumped, and can be searched with `lookup_by_key`. Keys are scalars
+or strings.
+"""
+
+
 class UnionVal(int):
     """Annotate a union member with this to set the union type value."""
 
     pass
+
+
+@final
+class NotLoaded:
+    """The type of `NOT_LOADED`."""
+
+    def __repr__(self) -> str:
+        return "NOT_LOADED"
+
+
+NOT_LOADED: Final = NotLoaded()
+"""Set on fields without defaults that were skipped by a projected load."""
@@ -1,6 +1,8 @@
 from types import GenericAlias, UnionType
 from typing import Any, TypeVar, Union, _AnnotatedAlias, _GenericAlias, get_args
 
+from attrs import has
+
 from ._consts import NoneType
 from ._types import Optionality
 
@@ -15,6 +17,11 @@ def is_subclass(typ, supertype) -> bool:
         return False
 
 
+def is_struct(typ) -> bool:
+    """Is this an attrs class marked with `flattrs.struct`?"""
+    return has(typ) and getattr(typ, "__flattrs_struct__", False)
+
+
 def is_generic_subclass(t, s):
     return (isinstance(t, _GenericAlias) and t.__origin__ is s) or (
         isinstance(t, GenericAlias) and t.__origin__ is s
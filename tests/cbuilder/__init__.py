@@ -1,10 +1,18 @@
 from flatbuffers.builder import Builder
-from hypothesis.strategies import composite, integers
+from hypothesis.strategies import integers
+from pytest import mark
 
+from flattrs._builder import Builder as PyBuilder
 from flattrs.cflattrs.builder import Builder as CBuilder
 
+#: Run a test against both the Cython and the pure-Python builder, as `impl`.
+implementations = mark.parametrize(
+    "impl", [CBuilder, PyBuilder], ids=["cython", "python"]
+)
 
-@composite
-def builders(draw):
-    size = draw(integers(0, 50000))
-    return CBuilder(size), Builder(size)
+sizes = integers(0, 50000)
+
+
+def builders(impl: type, size: int) -> tuple:
+    """An `impl` builder and a reference `flatbuffers` one, of the same size."""
+    return impl(size), Builder(size)
@@ -1,20 +1,132 @@
+import sys
+
+from flatbuffers.builder import Builder
+from flatbuffers.builder import BuilderNotFinishedError as PyBuilderNotFinishedError
 from hypothesis import given
+from hypothesis.strategies import integers, lists, sampled_from, tuples
+from pytest import raises
 
+from flattrs._builder import Builder as PyBuilder
+from flattrs.cflattrs.builder import Builder as CBuilder
+from flattrs.cflattrs.builder import BuilderNotFinishedError
+from flattrs.converters import _builder_output
 from tests import model_to_bytes
 
 from ..flatc.test_common import all_scalars, all_scalars_with_defaults
-from . import builders
+from . import builders, implementations, sizes
+
+
+@implementations
+@given(all_scalars(), sizes)
+def test_all_scalars(impl, inst, size):
+    tested, builder = builders(impl, size)
+
+    assert model_to_bytes(inst, tested) == model_to_bytes(inst, builder)
+
+
+@implementations
+@given(all_scalars_with_defaults(), sizes)
+def test_all_scalars_with_defaults(impl, inst, size):
+    tested, builder = builders(impl, size)
+
+    assert model_to_bytes(inst, tested) == model_to_bytes(inst, builder)
+
+
+@implementations
+@given(all_scalars(), all_scalars(), sizes)
+def test_clear(impl, first, second, size):
+    """Cleared builders produce the same output as fresh ones."""
+    tested = impl(size)
+    fresh = model_to_bytes(second, Builder(0))
+
+    model_to_bytes(first, tested)
+    tested.Clear()
+    assert model_to_bytes(second, tested) == fresh
+
+
+@implementations
+@given(all_scalars(), all_scalars(), sizes)
+def test_reset(impl, first, second, size):
+    """Reset builders shrink, and produce the same output as fresh ones."""
+    tested = impl(size)
+    fresh = model_to_bytes(second, Builder(0))
+
+    model_to_bytes(first, tested)
+    tested.Reset(8)
+    assert len(tested.Bytes) <= 8
+    assert model_to_bytes(second, tested) == fresh
+
+
+@implementations
+@given(
+    lists(
+        lists(tuples(integers(0, 15), sampled_from([1, 2, 4, 8])), max_size=8),
+        max_size=300,
+    ),
+    sizes,
+)
+def test_many_vtables(impl, shapes, size):
+    """Vtables are deduplicated exactly like flatbuffers does it."""
+    tested, builder = builders(impl, size)
+
+    def build(b):
+        offsets = []
+        for shape in shapes:
+            b.StartObject(16)
+            for slot, width in shape:
+                {
+                    1: b.PrependUint8Slot,
+                    2: b.PrependUint16Slot,
+                    4: b.PrependUint32Slot,
+                    8: b.PrependUint64Slot,
+                }[width](slot, 1, 0)
+            offsets.append(b.EndObject())
+        b.StartVector(4, len(offsets), 4)
+        for offset in reversed(offsets):
+            b.PrependUOffsetTRelative(offset)
+        b.Finish(b.EndVector())
+        return b.Output()
+
+    assert build(tested) == build(builder)
+
+
+@given(all_scalars(), sizes)
+def test_buffer_protocol(inst, size):
+    """Finished builders expose their output without copying."""
+    cbuilder = CBuilder(size)
 
+    with raises(BuilderNotFinishedError):
+        memoryview(cbuilder)
 
-@given(all_scalars(), builders())
-def test_all_scalars(inst, builders):
-    cbuilder, builder = builders
+    payload = model_to_bytes(inst, cbuilder)
+    with memoryview(cbuilder) as view:
+        assert view.readonly
+        assert view == payload
+        with raises(BufferError):
+            cbuilder.Clear()
+    cbuilder.Clear()
 
-    assert model_to_bytes(inst, cbuilder) == model_to_bytes(inst, builder)
 
+@given(all_scalars(), sizes)
+def test_pure_python_output(inst, size):
+    """The output of pure-Python builders is exposed without copying."""
+    builder = PyBuilder(size)
+    payload = model_to_bytes(inst, Builder(0))
 
-@given(all_scalars_with_defaults(), builders())
-def test_all_scalars_with_defaults(inst, builders):
-    cbuilder, builder = builders
+    if sys.version_info >= (3, 12):
+        with raises(PyBuilderNotFinishedError):
+            memoryview(builder)
+        model_to_bytes(inst, builder)
+        view = memoryview(builder)
+    else:
+        # Only Python 3.12+ calls `__buffer__` by itself.
+        with raises(PyBuilderNotFinishedError):
+            builder.__buffer__(0)
+        model_to_bytes(inst, builder)
+        view = builder.__buffer__(0)
+    assert view.readonly
+    assert view == payload
 
-    assert model_to_bytes(inst, cbuilder) == model_to_bytes(inst, builder)
+    with _builder_output(builder) as view:
+        assert view.readonly
+        assert view == payload
@@ -0,0 +1,56 @@
+from flatbuffers.builder import Builder
+from hypothesis import given
+from hypothesis.strategies import binary, integers, sampled_from
+from pytest import raises
+
+from . import builders, implementations, sizes
+
+alignments = sampled_from([1, 2, 4, 8])
+
+
+def prepend_bytes(builder: Builder, data: bytes) -> None:
+    for byte in reversed(data):
+        builder.PrependUint8(byte)
+
+
+@implementations
+@given(binary(min_size=1, max_size=32), alignments, sizes)
+def test_structs(impl, data, alignment, size):
+    """Inline structs are written like flatc-generated code does it."""
+    tested, builder = builders(impl, size)
+
+    tested.StartObject(1)
+    tested.PrependStructSlot(0, tested.CreateStruct(alignment, data), 0)
+    tested.Finish(tested.EndObject())
+
+    builder.StartObject(1)
+    builder.Prep(alignment, len(data))
+    prepend_bytes(builder, data)
+    builder.PrependStructSlot(0, builder.Offset(), 0)
+    builder.Finish(builder.EndObject())
+
+    assert bytes(tested.Output()) == bytes(builder.Output())
+
+
+@implementations
+@given(integers(1, 16), integers(0, 8), alignments, sizes)
+def test_struct_vectors(impl, struct_size, length, alignment, size):
+    """Vectors of structs are written with a single copy, from any buffer."""
+    data = bytes(range(struct_size * length))
+    tested, builder = builders(impl, size)
+
+    tested.Finish(tested.CreateStructVector(struct_size, alignment, bytearray(data)))
+
+    builder.StartVector(struct_size, length, alignment)
+    prepend_bytes(builder, data)
+    builder.Finish(builder.EndVector())
+
+    assert bytes(tested.Output()) == bytes(builder.Output())
+
+
+@implementations
+def test_invalid_struct_vectors(impl):
+    with raises(ValueError):
+        impl(0).CreateStructVector(4, 4, b"abc")
+    with raises(ValueError):
+        impl(0).CreateStructVector(0, 4, b"")
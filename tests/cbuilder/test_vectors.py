@@ -1,6 +1,12 @@
+from array import array as pyarray
+
+from flatbuffers.builder import Builder
 from hypothesis import given
-from hypothesis.strategies import DrawFn, composite, lists
+from hypothesis.strategies import DrawFn, composite, integers, lists, sampled_from
+from numpy import array
 
+from flattrs._builder import Builder as PyBuilder
+from flattrs.cflattrs.builder import Builder as CBuilder
 from tests import model_to_bytes
 
 from ..flatc.models_vectors import VectorsOfFloats, VectorsOfInts
@@ -15,7 +21,7 @@ from ..flatc.test_vectors import (
     vectors_of_common1s,
     vectors_of_scalars,
 )
-from . import builders
+from . import builders, implementations, sizes
 
 
 @composite
@@ -36,33 +42,115 @@ def vectors_of_floats(draw: DrawFn):
     )
 
 
-@given(vectors_of_bools(), builders())
-def test_vectors_of_bools(inst, builders):
-    cbuilder, builder = builders
-    assert model_to_bytes(inst, cbuilder) == model_to_bytes(inst, builder)
+@implementations
+@given(vectors_of_bools(), sizes)
+def test_vectors_of_bools(impl, inst, size):
+    tested, builder = builders(impl, size)
+    assert model_to_bytes(inst, tested) == model_to_bytes(inst, builder)
+
+
+@implementations
+@given(vectors_of_ints(), sizes)
+def test_vectors_of_ints(impl, inst: VectorsOfInts, size):
+    tested, builder = builders(impl, size)
+    assert model_to_bytes(inst, tested) == model_to_bytes(inst, builder)
 
 
-@given(vectors_of_ints(), builders())
-def test_vectors_of_ints(inst: VectorsOfInts, builders):
-    cbuilder, builder = builders
-    assert model_to_bytes(inst, cbuilder)
+@implementations
+@given(vectors_of_floats(), sizes)
+def test_vectors_of_floats(impl, inst, size):
+    tested, builder = builders(impl, size)
+    assert model_to_bytes(inst, tested) == model_to_bytes(inst, builder)
 
 
-@given(vectors_of_floats(), builders())
-def test_vectors_of_floats(inst, builders):
-    cbuilder, builder = builders
-    assert model_to_bytes(inst, cbuilder) == model_to_bytes(inst, builder)
+@implementations
+@given(vectors_of_scalars(), sizes)
+def test_vectors_of_scalars(impl, inst, size):
+    tested, builder = builders(impl, size)
 
+    assert model_to_bytes(inst, tested) == model_to_bytes(inst, builder)
 
-@given(vectors_of_scalars(), builders())
-def test_vectors_of_scalars(inst, builders):
-    cbuilder, builder = builders
 
-    assert model_to_bytes(inst, cbuilder) == model_to_bytes(inst, builder)
+@implementations
+@given(vectors_of_common1s(), sizes)
+def test_vectors_of_common1s(impl, inst, size):
+    tested, builder = builders(impl, size)
 
+    assert model_to_bytes(inst, tested) == model_to_bytes(inst, builder)
 
-@given(vectors_of_common1s(), builders())
-def test_vectors_of_common1s(inst, builders):
-    cbuilder, builder = builders
 
-    assert model_to_bytes(inst, cbuilder) == model_to_bytes(inst, builder)
+@implementations
+@given(
+    lists(integers(0, 100)),
+    sampled_from(["?", "<u2", ">u4", "<i8", ">i2", "<f4", ">f8"]),
+    sizes,
+)
+def test_numpy_vectors(impl, values, dtype, size):
+    """Builders write NumPy arrays like the flatbuffers one."""
+    arr = array(values).astype(dtype)
+    outputs = []
+    for builder in builders(impl, size):
+        builder.Finish(builder.CreateNumpyVector(arr))
+        outputs.append(bytes(builder.Output()))
+
+    assert outputs[0] == outputs[1]
+
+
+SCALAR_TYPES = {
+    "Bool": (1, "?", None),
+    "Uint8": (1, "u1", "B"),
+    "Uint16": (2, "u2", "H"),
+    "Uint32": (4, "u4", "I"),
+    "Uint64": (8, "u8", "Q"),
+    "Int8": (1, "i1", "b"),
+    "Int16": (2, "i2", "h"),
+    "Int32": (4, "i4", "i"),
+    "Int64": (8, "i8", "q"),
+    "Float32": (4, "f4", "f"),
+    "Float64": (8, "f8", "d"),
+}
+
+
+def prepend_vector(type: str, values: list) -> bytes:
+    """Write a vector of scalars with the flatbuffers builder."""
+    width = SCALAR_TYPES[type][0]
+    builder = Builder(0)
+    builder.StartVector(width, len(values), width)
+    for value in reversed(values):
+        getattr(builder, f"Prepend{type}")(value)
+    builder.Finish(builder.EndVector())
+    return bytes(builder.Output())
+
+
+@given(
+    lists(integers(0, 100)),
+    sampled_from(sorted(SCALAR_TYPES)),
+    sampled_from(["<", ">"]),
+)
+def test_scalar_vectors(values, type, byteorder):
+    """Scalar vectors are written like with `Prepend`, from any source."""
+    _, dtype, typecode = SCALAR_TYPES[type]
+    if type == "Bool":
+        values = [bool(v) for v in values]
+    elif type.startswith("Float"):
+        values = [float(v) for v in values]
+
+    arr = array(values, byteorder + dtype)
+    # Arrays of other item sizes are iterated over, like non-contiguous ones.
+    other_dtype = {"f4": "f8", "f8": "f4", "i8": "i4"}.get(dtype, "i8")
+    sources = [
+        (values, values),
+        (values, tuple(values)),
+        (values, arr),
+        (values, arr.astype(other_dtype)),
+        (values[::2], arr[::2]),
+    ]
+    if typecode is not None:
+        sources.append((values, pyarray(typecode, values)))
+    if type == "Uint8":
+        sources.append((values, bytes(values)))
+
+    for vals, source in sources:
+        for builder in (CBuilder(len(values)), PyBuilder(len(values))):
+            builder.Finish(builder.CreateScalarVector(type, source))
+            assert bytes(builder.Output()) == prepend_vector(type, vals)
@@ -0,0 +1,6 @@
+from hypothesis.strategies import sampled_from
+
+from flattrs._reader import Table
+from flattrs.cflattrs.reader import Table as CTable
+
+tables = sampled_from([CTable, Table])
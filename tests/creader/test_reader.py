@@ -0,0 +1,75 @@
+"""The Cython reader and its fallback should agree with `flatbuffers`."""
+from struct import unpack_from
+
+from flatbuffers import number_types as N
+from flatbuffers.table import Table as FbTable
+from hypothesis import given
+from hypothesis.strategies import lists, text
+from pytest import raises
+
+from flattrs import dumps
+from flattrs.cflattrs.reader import Table as CTable
+
+from ..flattrs.models.common import AllScalars
+from ..flattrs.models.vectors import VectorOfStrings
+from ..flattrs.test_common import all_scalars
+from . import tables
+
+SCALARS = [
+    ("Bool", N.BoolFlags),
+    ("Uint8", N.Uint8Flags),
+    ("Uint16", N.Uint16Flags),
+    ("Uint32", N.Uint32Flags),
+    ("Uint64", N.Uint64Flags),
+    ("Int8", N.Int8Flags),
+    ("Int16", N.Int16Flags),
+    ("Int32", N.Int32Flags),
+    ("Int64", N.Int64Flags),
+    ("Float32", N.Float32Flags),
+    ("Float64", N.Float64Flags),
+]
+
+
+@given(all_scalars(), tables)
+def test_scalars(inst: AllScalars, table_cls) -> None:
+    payload = dumps(inst)
+    root = unpack_from("<I", payload)[0]
+    tab = table_cls(payload, root)
+    oracle = FbTable(payload, root)
+
+    for ix, (name, flags) in enumerate(SCALARS):
+        slot = 4 + 2 * ix
+        assert tab.Offset(slot) == oracle.Offset(slot)
+        o = oracle.Offset(slot)
+        expected = oracle.Get(flags, oracle.Pos + o) if o != 0 else None
+        assert getattr(tab, f"Get{name}Slot")(slot, None) == expected
+        if o != 0:
+            assert getattr(tab, f"Get{name}")(tab.Pos + o) == expected
+            assert tab.Get(flags, tab.Pos + o) == expected
+
+
+@given(lists(text()), tables)
+def test_strings(strings: list[str], table_cls) -> None:
+    payload = dumps(VectorOfStrings(strings))
+    root = unpack_from("<I", payload)[0]
+    tab = table_cls(bytearray(payload), root)
+    oracle = FbTable(payload, root)
+
+    vector = tab.Vector(tab.Offset(4))
+    assert vector == oracle.Vector(oracle.Offset(4))
+    assert tab.VectorLen(tab.Offset(4)) == len(strings)
+    assert [tab.DecodeString(vector + 4 * i) for i in range(len(strings))] == strings
+    assert [tab.String(vector + 4 * i) for i in range(len(strings))] == [
+        oracle.String(vector + 4 * i) for i in range(len(strings))
+    ]
+
+
+def test_out_of_bounds() -> None:
+    """Corrupt offsets raise instead of reading outside the buffer."""
+    tab = CTable(b"\xff\xff\xff\x7f", 0)
+    with raises(IndexError):
+        tab.Offset(4)
+    with raises(IndexError):
+        tab.GetUint64(0)
+    with raises(IndexError):
+        tab.String(0)
@@ -12,6 +12,9 @@ from ..enums import (
     ASimpleByteEnum,
     ASimpleUByteEnum,
 )
+from ..keys import ContainsKeyed, KeyedByEnum, KeyedByNumber, KeyedByString
+from ..nested_flatbuffers import WithNestedFlatbuffers
+from ..structs import ContainsStructs, Point, Sample, Segment
 from ..tableswithattributes import FrozenTable, IgnoredAttributes, NoReprField
 from ..tableswithtables import (
     CommonUnion,
@@ -59,7 +62,9 @@ __all__ = [
     "Common1",
     "Common2",
     "CommonUnion",
+    "ContainsKeyed",
     "ContainsNamespaced",
+    "ContainsStructs",
     "ContainsTable",
     "Empty",
     "FrozenTable",
@@ -72,6 +77,9 @@ __all__ = [
     "JustAnOptionalString",
     "JustBytes",
     "JustOptionalBytes",
+    "KeyedByEnum",
+    "KeyedByNumber",
+    "KeyedByString",
     "NestedUnion",
     "NestedUnion2",
     "NoReprField",
@@ -79,10 +87,14 @@ __all__ = [
     "NumberedUnionTable",
     "OptionalTable",
     "OptionalTableAfterEnum",
+    "Point",
+    "Sample",
+    "Segment",
     "SingleClassUnion",
     "SingleClassUnionRequiredTable",
     "SingleClassUnionTable",
     "UnionOfNestedTables",
     "UnionOfOptionalTables",
     "UnionOfTables",
+    "WithNestedFlatbuffers",
 ]
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from attrs import define, field
+
+from flattrs import Int32, Uint32
+from flattrs.types import KEY
+
+from .enums import AnInt8Enum
+
+
+@define
+class KeyedByString:
+    id: str = field(metadata={KEY: True})
+    value: Int32
+
+
+@define
+class KeyedByNumber:
+    value: str | None
+    number: Uint32 = field(metadata={KEY: True})
+
+
+@define
+class KeyedByEnum:
+    color: AnInt8Enum = field(metadata={KEY: True})
+
+
+@define
+class ContainsKeyed:
+    byString: list[KeyedByString] | None
+    byNumber: list[KeyedByNumber] | None
+    byEnum: list[KeyedByEnum]
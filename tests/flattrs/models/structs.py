@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from attrs import define
+
+from flattrs import Float32, Uint8, struct
+
+from .enums import AnInt8Enum
+
+
+@struct
+@define
+class Point:
+    x: Float32
+    y: Float32
+    z: Float32
+
+
+@struct
+@define
+class Sample:
+    tag: Uint8
+    value: float
+    color: AnInt8Enum
+
+
+@struct
+@define
+class Segment:
+    start: Point
+    end: Point
+    sample: Sample
+
+
+@define
+class ContainsStructs:
+    point: Point
+    segment: Segment | None = None
+    points: list[Point] | None = None
+    samples: list[Sample] | None = None
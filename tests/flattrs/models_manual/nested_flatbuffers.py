@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from attrs import define
+
+from flattrs import Nested
+
+from .common import Common1
+from .nested.nested_trivial import NestedJustAString
+from .vectors import VectorOfCommon1
+
+
+@define
+class WithNestedFlatbuffers:
+    common: Nested[Common1]
+    vectors: Nested[VectorOfCommon1] | None = None
+    fromNamespace: Nested[NestedJustAString] | None = None
+    after: str | None = None
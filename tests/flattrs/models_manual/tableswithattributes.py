@@ -3,6 +3,7 @@ from __future__ import annotations
 from attrs import define, field, frozen
 
 from flattrs import Uint8, Uint16
+from flattrs.types import KEY
 
 
 @define
@@ -17,4 +18,4 @@ class FrozenTable:
 
 @define
 class IgnoredAttributes:
-    a_field: Uint8
+    a_field: Uint8 = field(metadata={KEY: True})
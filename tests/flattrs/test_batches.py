@@ -0,0 +1,34 @@
+"""Test the batch APIs."""
+from hypothesis import given
+from hypothesis.strategies import lists, one_of
+
+from flattrs import dumps, dumps_many, loads, loads_many
+
+from .models.common import Common1
+from .test_common import all_scalars, common1s
+from .test_vectors import vectors_of_common1s, vectors_of_scalars
+
+models = one_of(common1s, all_scalars(), vectors_of_scalars(), vectors_of_common1s())
+
+
+@given(lists(models))
+def test_dumps_many(insts) -> None:
+    """Batches are dumped exactly like single models."""
+    assert dumps_many(insts) == [dumps(inst) for inst in insts]
+
+
+@given(lists(models))
+def test_concatenated(insts) -> None:
+    """Concatenated batches are made of standard size-prefixed payloads."""
+    blob = dumps_many(insts, concatenate=True)
+    assert blob == b"".join(dumps(inst, size_prefixed=True) for inst in insts)
+
+    offset = 0
+    for inst in insts:
+        assert loads(blob, inst.__class__, offset + 4) == inst
+        offset += 4 + int.from_bytes(blob[offset : offset + 4], "little")
+
+
+@given(lists(common1s))
+def test_loads_many(insts: list[Common1]) -> None:
+    assert loads_many(dumps_many(insts), Common1) == insts
@@ -0,0 +1,93 @@
+"""Test loading from and dumping into buffers other than `bytes`."""
+from mmap import mmap
+from tempfile import TemporaryFile
+
+from hypothesis import given
+from hypothesis.strategies import binary, integers, lists, none, text, tuples
+from pytest import raises
+
+from flattrs import dumps, dumps_into, loads, make_view
+from flattrs._builder import BuilderPool as PyBuilderPool
+from flattrs.converters import Converter
+
+from .models.common import Common1, Common2
+from .test_common import common1s
+
+common2s = tuples(lists(text()), text() | none()).map(lambda t: Common2(*t))
+
+
+@given(common1s, common2s, binary(max_size=16))
+def test_offsets(c1: Common1, c2: Common2, prefix: bytes) -> None:
+    """Payloads can be loaded from the middle of a larger buffer."""
+    first = dumps(c1)
+    blob = prefix + first + dumps(c2)
+    second_offset = len(prefix) + len(first)
+
+    for buffer in (blob, bytearray(blob), memoryview(blob)):
+        assert loads(buffer, Common1, len(prefix)) == c1
+        assert loads(buffer, Common2, second_offset) == c2
+        assert make_view(Common1)(buffer, len(prefix)).id == c1.id
+
+    assert loads(memoryview(blob)[second_offset:], Common2) == c2
+
+
+def test_mmap() -> None:
+    c1 = Common1("a string", 1, 2)
+    c2 = Common2(["a", "b"], "c")
+    first = dumps(c1)
+
+    with TemporaryFile() as f:
+        f.write(first + dumps(c2))
+        f.flush()
+        with mmap(f.fileno(), 0) as m:
+            assert loads(m, Common1) == c1
+            assert loads(m, Common2, len(first)) == c2
+
+
+@given(common1s, integers(0, 64))
+def test_dumps_into(inst: Common1, offset: int) -> None:
+    payload = dumps(inst)
+    buffer = bytearray(b"x" * (offset + len(payload) + 8))
+
+    assert dumps_into(inst, buffer, offset) == len(payload)
+    assert buffer[:offset] == b"x" * offset
+    assert buffer[offset : offset + len(payload)] == payload
+    assert buffer[offset + len(payload) :] == b"x" * 8
+
+    size = dumps_into(inst, buffer, offset, size_prefixed=True)
+    assert buffer[offset : offset + size] == dumps(inst, size_prefixed=True)
+
+
+@given(common1s, integers(0, 64))
+def test_dumps_into_pure_python(inst: Common1, offset: int) -> None:
+    """The pure-Python builder is copied from without the buffer protocol."""
+    converter = Converter(builder_pool=PyBuilderPool())
+    payload = dumps(inst)
+    buffer = bytearray(offset + len(payload))
+
+    assert converter.dumps_into(inst, buffer, offset) == len(payload)
+    assert buffer[offset:] == payload
+
+
+def test_dumps_into_mmap() -> None:
+    c1 = Common1("a string", 1, 2)
+    c2 = Common2(["a", "b"], "c")
+
+    with mmap(-1, 4096) as m:
+        offset = dumps_into(c1, m)
+        dumps_into(c2, m, offset)
+        assert loads(m, Common1) == c1
+        assert loads(m, Common2, offset) == c2
+
+
+def test_dumps_into_overflow() -> None:
+    inst = Common1("a string", 1, 2)
+    size = len(dumps(inst))
+
+    dumps_into(inst, bytearray(size))
+    with raises(ValueError):
+        dumps_into(inst, bytearray(size - 1))
+    with raises(ValueError):
+        dumps_into(inst, bytearray(size), 1)
+    with raises(ValueError):
+        dumps_into(inst, bytearray(size + 1), -1)
@@ -0,0 +1,48 @@
+"""Test the on-disk code cache."""
+from pathlib import Path
+
+from pytest import MonkeyPatch
+
+from flattrs import converters
+from flattrs.converters import CodeCache, Converter
+
+from .models.common import Common1
+from .models.enums import AnInt8Enum
+from .models.structs import ContainsStructs, Point, Sample, Segment
+from .models.vectors import VectorOfCommon1
+
+
+def roundtrip(converter: Converter) -> None:
+    inst = VectorOfCommon1([Common1("a", 1, 2)])
+    assert converter.loads(converter.dumps(inst), VectorOfCommon1) == inst
+    assert converter.make_view(Common1)(converter.dumps(inst.vecOfCommon[0])).id == "a"
+
+    # Structs with enums or nested structs are compiled too.
+    sample = Sample(1, 2.0, AnInt8Enum.SEVEN)
+    point = Point(1.0, 2.0, 3.0)
+    structs = ContainsStructs(point, Segment(point, point, sample), [], [sample])
+    assert converter.loads(converter.dumps(structs), ContainsStructs) == structs
+    assert converter.make_view(ContainsStructs)(converter.dumps(structs)).segment == (
+        structs.segment
+    )
+
+
+def test_code_cache(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    roundtrip(Converter(code_cache=CodeCache(tmp_path)))
+    assert list(tmp_path.glob("*.marshal"))
+
+    def fail(*_):
+        raise AssertionError("Compiled despite the cache.")
+
+    # A fresh converter loads everything from the cache.
+    monkeypatch.setattr(converters, "compile", fail, raising=False)
+    roundtrip(Converter(code_cache=CodeCache(tmp_path)))
+
+
+def test_corrupted(tmp_path: Path) -> None:
+    """Unreadable entries are compiled again."""
+    roundtrip(Converter(code_cache=CodeCache(tmp_path)))
+    for entry in tmp_path.glob("*.marshal"):
+        entry.write_bytes(b"garbage")
+
+    roundtrip(Converter(code_cache=CodeCache(tmp_path)))
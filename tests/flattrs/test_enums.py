@@ -1,8 +1,11 @@
 """Test serialization and deserialization of enums."""
+from attrs import Factory, define
 from hypothesis import given
-from hypothesis.strategies import sampled_from, tuples
+from hypothesis.strategies import lists, sampled_from, tuples
+from pytest import raises
 
-from flattrs import dumps, loads
+from flattrs import Int8, Uint8, dumps, loads, struct
+from flattrs.converters import Converter
 
 from .models.enums import (
     AllEnums,
@@ -17,6 +20,7 @@ from .models.enums import (
     ASimpleByteEnum,
     ASimpleUByteEnum,
 )
+from .models.structs import Sample
 
 all_enums = tuples(
     sampled_from(ASimpleUByteEnum),
@@ -35,3 +39,63 @@ all_enums = tuples(
 @given(all_enums)
 def test_all_enums(inst: AllEnums) -> None:
     assert inst == loads(dumps(inst), inst.__class__)
+
+
+@define
+class Colors:
+    color: AnInt8Enum = AnInt8Enum.EIGHT
+    colors: list[AnInt8Enum] = Factory(list)
+    sample: Sample | None = None
+
+
+@struct
+@define
+class RawSample:
+    tag: Uint8
+    value: float
+    color: Int8
+
+
+@define
+class RawColors:
+    """The layout of `Colors`, with plain integers."""
+
+    color: Int8
+    colors: list[Int8]
+    sample: RawSample | None = None
+
+
+@given(lists(sampled_from(AnInt8Enum)))
+def test_vectors(colors: list[AnInt8Enum]) -> None:
+    loaded = loads(dumps(Colors(colors=colors)), Colors)
+    assert loaded.colors == colors
+    assert all(c.__class__ is AnInt8Enum for c in loaded.colors)
+
+
+def test_unknown_values() -> None:
+    """Values without members are handled according to the converter policy."""
+    payload = dumps(RawColors(5, [-127, 5], RawSample(1, 0.5, 6)))
+
+    with raises(ValueError):
+        Converter().loads(payload, Colors)
+    with raises(ValueError):
+        Converter().loads(dumps(RawColors(-126, [5])), Colors)
+    with raises(ValueError):
+        Converter().loads(dumps(RawColors(-126, [], RawSample(1, 0.5, 6))), Colors)
+
+    raw = Converter(unknown_enums="raw")
+    assert raw.loads(payload, Colors) == Colors(
+        5, [AnInt8Enum.SEVEN, 5], Sample(1, 0.5, 6)
+    )
+    assert raw.make_view(Colors)(payload).colors == [AnInt8Enum.SEVEN, 5]
+
+    default = Converter(unknown_enums="default")
+    assert default.loads(payload, Colors) == Colors(
+        AnInt8Enum.EIGHT,
+        [AnInt8Enum.SEVEN, AnInt8Enum.SEVEN],
+        Sample(1, 0.5, AnInt8Enum.SEVEN),
+    )
+    assert default.make_view(Colors)(payload).color is AnInt8Enum.EIGHT
+
+    with raises(ValueError):
+        Converter(unknown_enums="ignore").loads(payload, Colors)
@@ -0,0 +1,106 @@
+"""Test key fields: sorted vectors and lookups by key."""
+from attrs import define, field
+from hypothesis import given
+from hypothesis.strategies import lists, none, sampled_from, text, tuples
+from pytest import raises
+
+from flattrs import KEY, dumps, loads, lookup_by_key, make_view
+from flattrs._analysis import analyze
+
+from ..strats import int32s, uint32s
+from .models.enums import AnInt8Enum
+from .models.keys import ContainsKeyed, KeyedByEnum, KeyedByNumber, KeyedByString
+from .models.vectors import VectorOfCommon1
+
+keyed_by_strings = tuples(text(), int32s).map(lambda a: KeyedByString(*a))
+keyed_by_numbers = tuples(text() | none(), uint32s).map(lambda a: KeyedByNumber(*a))
+keyed_by_enums = sampled_from(AnInt8Enum).map(KeyedByEnum)
+contains_keyed = tuples(
+    lists(keyed_by_strings) | none(),
+    lists(keyed_by_numbers) | none(),
+    lists(keyed_by_enums),
+).map(lambda a: ContainsKeyed(*a))
+
+
+@define
+class TwoKeys:
+    a: int = field(metadata={KEY: True})
+    b: int = field(metadata={KEY: True})
+
+
+@define
+class OptionalStringKey:
+    a: str | None = field(metadata={KEY: True})
+
+
+@given(contains_keyed)
+def test_sorted(inst: ContainsKeyed) -> None:
+    """Vectors of tables with keys are sorted by key, stably."""
+    loaded = loads(dumps(inst), ContainsKeyed)
+
+    for name, key in (("byString", "id"), ("byNumber", "number"), ("byEnum", "color")):
+        val = getattr(inst, name)
+        if val is None:
+            assert getattr(loaded, name) is None
+        else:
+            assert getattr(loaded, name) == sorted(val, key=lambda e: getattr(e, key))
+
+
+def test_utf8_order() -> None:
+    """Strings are sorted by their UTF-8 bytes."""
+    ids = ["b", "a", "é", "\U0001f600", "￿", ""]
+    payload = dumps(ContainsKeyed([KeyedByString(i, 0) for i in ids], None, []))
+
+    loaded = [e.id for e in loads(payload, ContainsKeyed).byString]
+    assert loaded == sorted(ids, key=lambda i: i.encode())
+
+
+@given(contains_keyed)
+def test_lookup(inst: ContainsKeyed) -> None:
+    payload = dumps(inst)
+    view = make_view(ContainsKeyed)(payload)
+
+    for name, key in (("byString", "id"), ("byNumber", "number"), ("byEnum", "color")):
+        for elem in getattr(inst, name) or []:
+            k = getattr(elem, key)
+            found = lookup_by_key(payload, name, k, ContainsKeyed)
+            assert getattr(found, key) == k
+            assert getattr(lookup_by_key(view, name, k), key) == k
+
+    assert lookup_by_key(payload, "byString", "missing", ContainsKeyed) in (
+        None,
+        *[e for e in inst.byString or [] if e.id == "missing"],
+    )
+
+
+def test_lookup_result_types() -> None:
+    inst = ContainsKeyed(
+        [KeyedByString(str(i), i) for i in range(100)],
+        None,
+        [KeyedByEnum(AnInt8Enum.SEVEN)],
+    )
+    payload = dumps(inst)
+
+    assert lookup_by_key(payload, "byString", "42", ContainsKeyed) == KeyedByString(
+        "42", 42
+    )
+    assert lookup_by_key(payload, "byString", "420", ContainsKeyed) is None
+    assert lookup_by_key(payload, "byNumber", 1, ContainsKeyed) is None
+
+    view = lookup_by_key(make_view(ContainsKeyed)(payload), "byString", "42")
+    assert view.__class__.__name__ == "KeyedByStringView"
+    assert view.value == 42
+
+    with raises(TypeError):
+        lookup_by_key(payload, "byString", "42")
+
+
+def test_invalid() -> None:
+    with raises(TypeError):
+        analyze(TwoKeys)
+    with raises(TypeError):
+        analyze(OptionalStringKey)
+    with raises(ValueError):
+        lookup_by_key(dumps(VectorOfCommon1([])), "vecOfCommon", "a", VectorOfCommon1)
+    with raises(ValueError):
+        lookup_by_key(dumps(VectorOfCommon1([])), "missing", "a", VectorOfCommon1)
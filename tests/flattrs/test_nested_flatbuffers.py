@@ -0,0 +1,93 @@
+"""Test nested flatbuffers, stored in byte vectors."""
+from hypothesis import given
+from hypothesis.strategies import none, text, tuples
+from pytest import raises
+
+from flattrs import Nested, dumps, loads, make_verifier, make_view
+from flattrs._analysis import analyze
+
+from ..strats import int32s, uint8s
+from .models.common import Common1
+from .models.nested.nested_trivial import NestedJustAString
+from .models.nested_flatbuffers import WithNestedFlatbuffers
+from .models.vectors import VectorOfCommon1
+
+common1s = tuples(text(), uint8s, int32s).map(lambda a: Common1(*a))
+
+
+def test_analysis() -> None:
+    cl = analyze(WithNestedFlatbuffers)
+    assert cl.nested_flatbuffers == [
+        ("common", Common1, 0, False),
+        ("vectors", VectorOfCommon1, 1, True),
+        ("fromNamespace", NestedJustAString, 2, True),
+    ]
+
+
+@given(common1s, text() | none())
+def test_roundtrip(common: Common1, after: str | None) -> None:
+    """Models, payloads and loaded nested flatbuffers can all be dumped."""
+    inst = WithNestedFlatbuffers(
+        Nested(common),
+        Nested(VectorOfCommon1([common, common])),
+        Nested(dumps(NestedJustAString("a"))),
+        after,
+    )
+    loaded = loads(dumps(inst), WithNestedFlatbuffers)
+
+    assert loaded.common.load() == common
+    assert loaded.vectors.load() == VectorOfCommon1([common, common])
+    assert loaded.fromNamespace.load() == NestedJustAString("a")
+    assert loaded.after == after
+    assert loads(dumps(loaded), WithNestedFlatbuffers) == loaded
+
+
+def test_unwrapped() -> None:
+    """Fields can be set to models and payloads directly."""
+    common = Common1("a", 1, 2)
+    inst = WithNestedFlatbuffers(common, dumps(VectorOfCommon1([])))
+    loaded = loads(dumps(inst), WithNestedFlatbuffers)
+
+    assert loaded.common.load() == common
+    assert loaded.vectors.load() == VectorOfCommon1([])
+    assert loaded.fromNamespace is None
+
+
+def test_in_place() -> None:
+    """Loaded nested flatbuffers point into the outer payload, and are lazy."""
+    inner = dumps(Common1("a", 1, 2))
+    payload = bytearray(dumps(WithNestedFlatbuffers(Nested(inner))))
+
+    loaded = loads(payload, WithNestedFlatbuffers)
+    assert loaded.common.data.obj is payload
+    assert loaded.common.data == inner
+    # The inner payload stays 8-byte aligned.
+    start = payload.index(inner)
+    assert start % 8 == 0
+
+    # Nothing is decoded until `load`.
+    payload[start : start + len(inner)] = dumps(Common1("b", 3, 4))
+    assert loaded.common.load() == Common1("b", 3, 4)
+    assert loaded.common.load() is loaded.common.load()
+
+
+def test_views() -> None:
+    payload = dumps(WithNestedFlatbuffers(Nested(Common1("a", 1, 2))))
+
+    view = make_view(WithNestedFlatbuffers)(payload)
+    assert view.common.data.obj is payload
+    assert view.common.load().__class__.__name__ == "Common1View"
+    assert view.common.load().id == "a"
+    assert view.vectors is None
+
+
+def test_verify() -> None:
+    payload = dumps(WithNestedFlatbuffers(Nested(Common1("a", 1, 2))))
+    make_verifier(WithNestedFlatbuffers)(payload)
+
+
+def test_unloadable() -> None:
+    nested = Nested(dumps(Common1("a", 1, 2)))
+    assert nested == Nested(dumps(Common1("a", 1, 2)))
+    with raises(ValueError):
+        nested.load()
@@ -0,0 +1,138 @@
+"""Test NumPy-backed vectors of scalars."""
+from typing import Annotated
+
+from attrs import define, fields
+from hypothesis import given
+from numpy import array, array_equal, float32, ndarray
+
+from flattrs import (
+    BoolVector,
+    Float32Vector,
+    Float64Vector,
+    Int8Vector,
+    Int16Vector,
+    Int32Vector,
+    Int64Vector,
+    Uint16Vector,
+    Uint32Vector,
+    Uint64Vector,
+    dumps,
+    loads,
+    make_view,
+)
+
+from .models.vectors import OptionalVectorsOfScalars, VectorsOfScalars
+from .test_vectors import optional_vectors_of_scalars, vectors_of_scalars
+
+
+@define
+class NumpyVectorsOfScalars:
+    """Wire-compatible with `VectorsOfScalars`."""
+
+    vecOfBools: Annotated[ndarray, BoolVector]
+    vecOfUint8s: bytes
+    vecOfUint16s: Annotated[ndarray, Uint16Vector]
+    vecOfUint32s: Annotated[ndarray, Uint32Vector]
+    vecOfUint64s: Annotated[ndarray, Uint64Vector]
+    vecOfInt8s: Annotated[ndarray, Int8Vector]
+    vecOfInt16s: Annotated[ndarray, Int16Vector]
+    vecOfInt32s: Annotated[ndarray, Int32Vector]
+    vecOfInt64s: Annotated[ndarray, Int64Vector]
+    vecOfFloat32s: Annotated[ndarray, Float32Vector]
+    vecOfFloat64s: Annotated[ndarray, Float64Vector]
+
+
+@define
+class OptionalNumpyVectors:
+    """Wire-compatible with `OptionalVectorsOfScalars`."""
+
+    vecOfBools: Annotated[ndarray, BoolVector] | None = None
+    vecOfUint8s: bytes | None = None
+    vecOfUint16s: Annotated[ndarray, Uint16Vector] | None = None
+    vecOfUint32s: Annotated[ndarray, Uint32Vector] | None = None
+    vecOfUint64s: Annotated[ndarray, Uint64Vector] | None = None
+    vecOfInt8s: Annotated[ndarray, Int8Vector] | None = None
+    vecOfInt16s: Annotated[ndarray, Int16Vector] | None = None
+    vecOfInt32s: Annotated[ndarray, Int32Vector] | None = None
+    vecOfInt64s: Annotated[ndarray, Int64Vector] | None = None
+    vecOfFloat32s: Annotated[ndarray, Float32Vector] | None = None
+    vecOfFloat64s: Annotated[ndarray, Float64Vector] | None = None
+
+
+DTYPES = {
+    "vecOfBools": "?",
+    "vecOfUint16s": "u2",
+    "vecOfUint32s": "u4",
+    "vecOfUint64s": "u8",
+    "vecOfInt8s": "i1",
+    "vecOfInt16s": "i2",
+    "vecOfInt32s": "i4",
+    "vecOfInt64s": "i8",
+    "vecOfFloat32s": "f4",
+    "vecOfFloat64s": "f8",
+}
+
+
+def to_numpy(inst: VectorsOfScalars | OptionalVectorsOfScalars, cls: type):
+    return cls(
+        **{
+            a.name: val
+            if (val := getattr(inst, a.name)) is None or isinstance(val, bytes)
+            else array(val, DTYPES[a.name])
+            for a in fields(inst.__class__)
+        }
+    )
+
+
+def assert_matches(numpy_inst, inst) -> None:
+    for name in (a.name for a in fields(inst.__class__)):
+        val = getattr(inst, name)
+        numpy_val = getattr(numpy_inst, name)
+        if val is None or isinstance(val, bytes):
+            assert numpy_val == val
+        else:
+            assert numpy_val.tolist() == val
+
+
+@given(vectors_of_scalars())
+def test_vectors_of_scalars(inst: VectorsOfScalars) -> None:
+    """NumPy vectors are encoded exactly like lists, and decoded as arrays."""
+    payload = dumps(inst)
+
+    assert dumps(to_numpy(inst, NumpyVectorsOfScalars)) == payload
+    assert_matches(loads(payload, NumpyVectorsOfScalars), inst)
+    assert_matches(make_view(NumpyVectorsOfScalars)(payload), inst)
+
+
+@given(optional_vectors_of_scalars())
+def test_optional_vectors(inst: OptionalVectorsOfScalars) -> None:
+    payload = dumps(inst)
+
+    assert dumps(to_numpy(inst, OptionalNumpyVectors)) == payload
+    assert_matches(loads(payload, OptionalNumpyVectors), inst)
+
+
+def test_zero_copy() -> None:
+    """Loaded arrays are views over the payload."""
+    payload = dumps(OptionalNumpyVectors(vecOfFloat32s=array([1.0, 2.0], float32)))
+
+    loaded = loads(payload, OptionalNumpyVectors).vecOfFloat32s
+
+    assert loaded.base is payload
+    assert not loaded.flags.writeable
+
+
+def test_conversions() -> None:
+    """Arrays of other dtypes and byte orders are converted on dump."""
+    loaded = loads(
+        dumps(
+            OptionalNumpyVectors(
+                vecOfInt16s=array([1, -2], ">i8"),
+                vecOfFloat64s=array([1.5, 2.5], ">f8"),
+            )
+        ),
+        OptionalNumpyVectors,
+    )
+
+    assert array_equal(loaded.vecOfInt16s, [1, -2])
+    assert array_equal(loaded.vecOfFloat64s, [1.5, 2.5])
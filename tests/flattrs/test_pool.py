@@ -0,0 +1,98 @@
+"""Test builder pooling."""
+from threading import Thread
+
+from pytest import fixture
+
+from flattrs import Nested, dumps
+from flattrs._builder import BuilderPool as PyBuilderPool
+from flattrs.cflattrs.builder import BuilderPool as CBuilderPool
+from flattrs.converters import Converter
+
+from .models.common import Common1
+from .models.nested_flatbuffers import WithNestedFlatbuffers
+from .models.vectors import VectorOfCommon1
+
+
+@fixture(params=[CBuilderPool, PyBuilderPool], ids=["cython", "python"])
+def BuilderPool(request) -> type:
+    """Both builder pool implementations."""
+    return request.param
+
+
+class RecordingPool:
+    """A pool recording the builders it hands out."""
+
+    def __init__(self, pool) -> None:
+        self.pool = pool
+        self.acquired = []
+
+    def acquire(self):
+        builder = self.pool.acquire()
+        self.acquired.append(builder)
+        return builder
+
+    def release(self, builder) -> None:
+        self.pool.release(builder)
+
+
+def test_reuse(BuilderPool: type) -> None:
+    """Pooled builders are reused, and produce identical payloads."""
+    pool = BuilderPool()
+    converter = Converter(builder_pool=pool)
+    inst = Common1("a string", 1, 2)
+
+    assert converter.dumps(inst) == dumps(inst)
+    builder = pool.acquire()
+    pool.release(builder)
+    assert converter.dumps(inst) == dumps(inst)
+    assert pool.acquire() is builder
+
+
+def test_shrinking(BuilderPool: type) -> None:
+    """Builders that grew too large are shrunk when released."""
+    pool = BuilderPool(initial_size=100, max_size=1000)
+    converter = Converter(builder_pool=pool)
+    inst = VectorOfCommon1([Common1("a string", 1, 2)] * 1000)
+
+    assert converter.dumps(inst) == dumps(inst)
+    builder = pool.acquire()
+    assert len(builder.Bytes) == 1000
+    pool.release(builder)
+    assert converter.dumps(Common1("a", 1, 2)) == dumps(Common1("a", 1, 2))
+
+
+def test_threads(BuilderPool: type) -> None:
+    """Each thread has its own builders."""
+    pool = BuilderPool()
+    builder = pool.acquire()
+    pool.release(builder)
+
+    other = []
+    thread = Thread(target=lambda: other.append(pool.acquire()))
+    thread.start()
+    thread.join()
+
+    assert other[0] is not builder
+    assert pool.acquire() is builder
+
+
+def test_max_builders(BuilderPool: type) -> None:
+    pool = BuilderPool(max_builders=1)
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+
+    assert pool.acquire() is first
+    assert pool.acquire() is not second
+
+
+def test_nested_flatbuffers(BuilderPool: type) -> None:
+    """Nested flatbuffers are dumped with pooled builders too."""
+    pool = RecordingPool(BuilderPool())
+    converter = Converter(builder_pool=pool)
+    inst = WithNestedFlatbuffers(Nested(Common1("a", 1, 2)), Nested(b"payload"))
+
+    assert converter.dumps(inst) == dumps(inst)
+    assert len(pool.acquired) == 2
+    assert converter.dumps(inst) == dumps(inst)
+    assert {id(b) for b in pool.acquired[2:]} == {id(b) for b in pool.acquired[:2]}
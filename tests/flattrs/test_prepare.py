@@ -0,0 +1,52 @@
+"""Test preparing converters up front."""
+from pytest import MonkeyPatch
+
+from flattrs import converters
+from flattrs.converters import Converter
+
+from .models import common
+from .models.common import AllScalars, Common1
+from .models.tableswithtables import ContainsTable, UnionOfTables
+from .models.vectors import VectorOfCommon1
+
+
+def test_prepare(monkeypatch: MonkeyPatch) -> None:
+    converter = Converter()
+
+    timings = converter.prepare(ContainsTable, VectorOfCommon1)
+
+    # Referenced models come first.
+    assert list(timings) == [Common1, ContainsTable, VectorOfCommon1]
+    assert all(t >= 0 for t in timings.values())
+
+    def fail(*_):
+        raise AssertionError("Compiled after preparing.")
+
+    monkeypatch.setattr(converters, "compile", fail, raising=False)
+    inst = ContainsTable(Common1("a", 1, 2))
+    assert converter.loads(converter.dumps(inst), ContainsTable) == inst
+
+
+def test_unions() -> None:
+    assert list(Converter().prepare(UnionOfTables)) == [
+        Common1,
+        AllScalars,
+        UnionOfTables,
+    ]
+
+
+def test_not_recursive() -> None:
+    assert list(Converter().prepare(ContainsTable, recursive=False)) == [ContainsTable]
+
+
+def test_modules() -> None:
+    timings = Converter().prepare(common)
+
+    assert Common1 in timings
+    assert AllScalars in timings
+
+
+def test_background() -> None:
+    future = Converter().prepare(ContainsTable, background=True)
+
+    assert list(future.result(timeout=10)) == [Common1, ContainsTable]
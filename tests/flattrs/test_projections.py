@@ -0,0 +1,99 @@
+"""Test loading with field projections."""
+from attrs import define, evolve, field
+from attrs.validators import instance_of
+from hypothesis import given
+from pytest import raises
+
+from flattrs import NOT_LOADED, Int32, Uint8, dumps, make_loads
+from flattrs.converters import Converter
+
+from .models.common import AllScalarsWithDefaults, Common1, Common2
+from .models.tableswithtables import ContainsTable
+from .models.vectors import VectorOfCommon1
+from .test_common import common1s
+from .test_vectors import vectors_of_common1s
+
+
+@define
+class Validated:
+    id: str = field(validator=instance_of(str))
+    aSmallInt: Uint8 = field(validator=instance_of(int), converter=int)
+    aBigInt: Int32 = 0
+
+
+@given(common1s)
+def test_include(inst: Common1) -> None:
+    loaded = make_loads(Common1, include=["id"])(dumps(inst))
+
+    assert loaded == Common1(inst.id, NOT_LOADED, NOT_LOADED)
+
+
+@given(common1s)
+def test_exclude(inst: Common1) -> None:
+    loaded = make_loads(Common1, exclude=["aBigInt"])(dumps(inst))
+
+    assert loaded == evolve(inst, aBigInt=NOT_LOADED)
+
+
+def test_defaults() -> None:
+    """Skipped fields with defaults get their defaults."""
+    inst = AllScalarsWithDefaults(uint8=5, float64=2.0)
+    loaded = make_loads(AllScalarsWithDefaults, include=["uint8"])(dumps(inst))
+    assert loaded == AllScalarsWithDefaults(uint8=5)
+
+    loaded = make_loads(Common2, exclude=["a_string"])(dumps(Common2(["a"], "b")))
+    assert loaded == Common2(["a"], None)
+
+
+@given(common1s)
+def test_validated(inst: Common1) -> None:
+    """Validators and converters don't run on projected models."""
+    payload = dumps(inst)
+
+    loaded = make_loads(Validated, exclude=["id", "aSmallInt"])(payload)
+    assert (loaded.id, loaded.aSmallInt, loaded.aBigInt) == (
+        NOT_LOADED,
+        NOT_LOADED,
+        inst.aBigInt,
+    )
+    loaded = make_loads(Validated, include=["id"])(payload)
+    assert (loaded.id, loaded.aSmallInt, loaded.aBigInt) == (inst.id, NOT_LOADED, 0)
+
+
+@given(common1s)
+def test_nested_table(inner: Common1) -> None:
+    payload = dumps(ContainsTable(inner))
+
+    assert make_loads(ContainsTable, include=["inner.id"])(payload) == ContainsTable(
+        Common1(inner.id, NOT_LOADED, NOT_LOADED)
+    )
+    assert make_loads(ContainsTable, exclude=["inner.id"])(payload) == ContainsTable(
+        evolve(inner, id=NOT_LOADED)
+    )
+
+
+@given(vectors_of_common1s())
+def test_nested_vector_of_tables(inst: VectorOfCommon1) -> None:
+    loaded = make_loads(VectorOfCommon1, include=["vecOfCommon.aSmallInt"])(dumps(inst))
+
+    assert loaded == VectorOfCommon1(
+        [Common1(NOT_LOADED, c.aSmallInt, NOT_LOADED) for c in inst.vecOfCommon]
+    )
+
+
+def test_invalid_projections() -> None:
+    with raises(ValueError):
+        make_loads(Common1, include=["missing"])
+    with raises(ValueError):
+        make_loads(Common1, exclude=["id.nested"])
+
+
+def test_caching() -> None:
+    """Loaders are generated once per class and projection."""
+    converter = Converter()
+
+    converter.make_loads(ContainsTable, include=["inner.id"])
+    misses = converter._from_fb_cache.cache_info().misses
+    converter.make_loads(ContainsTable, include=("inner.id",))
+
+    assert converter._from_fb_cache.cache_info().misses == misses
@@ -0,0 +1,94 @@
+"""Test size-prefixed streams."""
+from io import BytesIO
+from mmap import mmap
+from socket import socketpair
+from tempfile import TemporaryFile
+
+from hypothesis import given
+from hypothesis.strategies import lists
+from pytest import MonkeyPatch, raises
+
+from flattrs import converters, dumps, dumps_many, iter_loads, loads, make_writer
+from flattrs._builder import Builder as PyBuilder
+
+from .models.common import Common1
+from .test_common import common1s
+
+
+@given(common1s)
+def test_size_prefixed(inst: Common1) -> None:
+    payload = dumps(inst, size_prefixed=True)
+
+    assert int.from_bytes(payload[:4], "little") == len(payload) - 4
+    assert loads(payload, Common1, 4) == inst
+
+
+@given(lists(common1s))
+def test_iter_loads(insts: list[Common1]) -> None:
+    """Streams can be read from buffers and files."""
+    stream = b"".join(dumps(inst, size_prefixed=True) for inst in insts)
+
+    assert list(iter_loads(stream, Common1)) == insts
+    assert list(iter_loads(memoryview(stream), Common1)) == insts
+    assert list(iter_loads(BytesIO(stream), Common1)) == insts
+    assert list(iter_loads(dumps_many(insts, concatenate=True), Common1)) == insts
+
+
+@given(lists(common1s))
+def test_writer(insts: list[Common1]) -> None:
+    file = BytesIO()
+    with make_writer(file, buffer_size=64) as writer:
+        writer.write_many(insts)
+
+    assert file.getvalue() == b"".join(
+        dumps(inst, size_prefixed=True) for inst in insts
+    )
+
+
+def test_writer_pure_python(monkeypatch: MonkeyPatch) -> None:
+    insts = [Common1(str(i), i, -i) for i in range(100)]
+    monkeypatch.setattr(converters, "Builder", PyBuilder)
+
+    file = BytesIO()
+    with make_writer(file, buffer_size=64) as writer:
+        writer.write_many(insts)
+
+    assert file.getvalue() == dumps_many(insts, concatenate=True)
+
+
+def test_sockets() -> None:
+    insts = [Common1(str(i), i, -i) for i in range(100)]
+    left, right = socketpair()
+    with left, right:
+        left.sendall(dumps_many(insts, concatenate=True))
+        left.close()
+
+        assert list(iter_loads(right, Common1)) == insts
+
+
+def test_mmap() -> None:
+    """Memory maps are read in place, from the start, wherever they're seeked."""
+    insts = [Common1(str(i), i, -i) for i in range(100)]
+    with TemporaryFile() as file:
+        file.write(dumps_many(insts, concatenate=True))
+        file.flush()
+        with mmap(file.fileno(), 0) as mm:
+            mm.seek(len(mm) // 2)
+            assert list(iter_loads(mm, Common1)) == insts
+            assert mm.tell() == len(mm) // 2
+
+
+def test_not_a_stream() -> None:
+    with raises(TypeError):
+        list(iter_loads(object(), Common1))
+
+
+def test_truncated() -> None:
+    stream = dumps(Common1("a", 1, 2), size_prefixed=True)
+
+    with raises(ValueError):
+        list(iter_loads(stream[:-1], Common1))
+    with raises(ValueError):
+        list(iter_loads(BytesIO(stream[:-1]), Common1))
+    with raises(ValueError):
+        list(iter_loads(stream[:2], Common1))
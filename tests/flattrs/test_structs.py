@@ -0,0 +1,180 @@
+"""Test structs, inline and in vectors."""
+from typing import Annotated
+
+from attrs import define
+from flatbuffers import Builder
+from hypothesis import given
+from hypothesis.strategies import lists, none, sampled_from, tuples
+from numpy import array_equal, ndarray, zeros
+from pytest import raises
+
+from flattrs import (
+    StructVector,
+    VerificationError,
+    dumps,
+    loads,
+    make_verifier,
+    make_view,
+    struct_dtype,
+)
+
+from ..strats import float32s, float64s, uint8s
+from .models.enums import AnInt8Enum
+from .models.geometry.Vec3 import Vec3
+from .models.structs import ContainsStructs, Point, Sample, Segment
+from .test_views import assert_view_matches
+
+points = tuples(float32s, float32s, float32s).map(lambda a: Point(*a))
+samples = tuples(uint8s, float64s, sampled_from(AnInt8Enum)).map(lambda a: Sample(*a))
+segments = tuples(points, points, samples).map(lambda a: Segment(*a))
+contains_structs = tuples(
+    points, segments | none(), lists(points) | none(), lists(samples) | none()
+).map(lambda a: ContainsStructs(*a))
+
+
+@define
+class OptionalPoint:
+    """Wire-compatible with `ContainsStructs`, with an optional point."""
+
+    point: Point | None = None
+
+
+@define
+class NumpyContainsStructs:
+    """Wire-compatible with `ContainsStructs`, with structured arrays."""
+
+    point: Point
+    segment: Segment | None = None
+    points: Annotated[ndarray, StructVector(Point)] | None = None
+    samples: Annotated[ndarray, StructVector(Sample)] | None = None
+
+
+@define
+class PointList:
+    points: list[Point]
+
+
+@define
+class Vec3List:
+    points: list[Vec3]
+
+
+def create_point(builder: Builder, point: Point) -> int:
+    """Write a `Point` the way flatc-generated code does."""
+    builder.Prep(4, 12)
+    builder.PrependFloat32(point.z)
+    builder.PrependFloat32(point.y)
+    builder.PrependFloat32(point.x)
+    return builder.Offset()
+
+
+def create_sample(builder: Builder, sample: Sample) -> int:
+    builder.Prep(8, 24)
+    builder.Pad(7)
+    builder.PrependInt8(sample.color)
+    builder.PrependFloat64(sample.value)
+    builder.Pad(7)
+    builder.PrependUint8(sample.tag)
+    return builder.Offset()
+
+
+def create_segment(builder: Builder, segment: Segment) -> int:
+    builder.Prep(8, 48)
+    create_sample(builder, segment.sample)
+    create_point(builder, segment.end)
+    create_point(builder, segment.start)
+    return builder.Offset()
+
+
+def create_vector(builder: Builder, create, size: int, alignment: int, items) -> int:
+    builder.StartVector(size, len(items), alignment)
+    for item in reversed(items):
+        create(builder, item)
+    return builder.EndVector()
+
+
+@given(contains_structs)
+def test_structs(inst: ContainsStructs) -> None:
+    payload = dumps(inst)
+
+    assert loads(payload, ContainsStructs) == inst
+    assert loads(payload, ContainsStructs, verify=True) == inst
+    assert_view_matches(make_view(ContainsStructs)(payload), inst)
+
+
+@given(contains_structs)
+def test_layout(inst: ContainsStructs) -> None:
+    """Structs are laid out exactly like flatc lays them out."""
+    builder = Builder(0)
+    if inst.points is not None:
+        points_offset = create_vector(builder, create_point, 12, 4, inst.points)
+    if inst.samples is not None:
+        samples_offset = create_vector(builder, create_sample, 24, 8, inst.samples)
+    builder.StartObject(4)
+    builder.PrependStructSlot(0, create_point(builder, inst.point), 0)
+    if inst.segment is not None:
+        builder.PrependStructSlot(1, create_segment(builder, inst.segment), 0)
+    if inst.points is not None:
+        builder.PrependUOffsetTRelativeSlot(2, points_offset, 0)
+    if inst.samples is not None:
+        builder.PrependUOffsetTRelativeSlot(3, samples_offset, 0)
+    builder.Finish(builder.EndObject())
+
+    assert dumps(inst) == builder.Output()
+
+
+def test_required() -> None:
+    make_verifier(ContainsStructs)(dumps(ContainsStructs(Point(1.0, 2.0, 3.0))))
+    with raises(VerificationError):
+        make_verifier(ContainsStructs)(dumps(OptionalPoint()))
+
+
+def test_compact() -> None:
+    """Vectors of structs are smaller than vectors of equivalent tables."""
+    points = [Point(i, i, i) for i in range(100)]
+    tables = [Vec3(i, i, i) for i in range(100)]
+
+    assert len(dumps(PointList(points))) < len(dumps(Vec3List(tables)))
+
+
+@given(contains_structs)
+def test_numpy(inst: ContainsStructs) -> None:
+    """Vectors of structs load as structured arrays, and dump back the same."""
+    payload = dumps(inst)
+    loaded = loads(payload, NumpyContainsStructs)
+
+    for name in ("points", "samples"):
+        val = getattr(inst, name)
+        arr = getattr(loaded, name)
+        if val is None:
+            assert arr is None
+        else:
+            assert arr.tolist() == [
+                tuple(getattr(e, f) for f in arr.dtype.names) for e in val
+            ]
+    assert dumps(loaded) == payload
+
+
+def test_numpy_zero_copy() -> None:
+    points = zeros(3, struct_dtype(Point))
+    points["x"] = [1.0, 2.0, 3.0]
+    payload = dumps(NumpyContainsStructs(Point(0.0, 0.0, 0.0), points=points))
+
+    loaded = loads(payload, NumpyContainsStructs).points
+
+    assert loaded.base is payload
+    assert array_equal(loaded, points)
+    assert loads(payload, ContainsStructs).points == [
+        Point(1.0, 0.0, 0.0),
+        Point(2.0, 0.0, 0.0),
+        Point(3.0, 0.0, 0.0),
+    ]
+
+
+def test_struct_dtype() -> None:
+    """Struct dtypes follow the struct layout, padding included."""
+    dtype = struct_dtype(Segment)
+
+    assert dtype.itemsize == 48
+    assert dtype.fields["sample"][1] == 24
+    assert dtype["sample"].fields["value"][1] == 8
@@ -0,0 +1,73 @@
+"""Test loading models without going through their `__init__`."""
+from attrs import define, field
+from attrs.exceptions import FrozenInstanceError
+from attrs.validators import gt
+from hypothesis import given
+from pytest import raises
+
+from flattrs import dumps
+from flattrs.converters import Converter
+
+from .models.tableswithattributes import FrozenTable
+from .test_verifier import models
+
+trusted = Converter(trusted_construction=True)
+post_inits: list["Validated"] = []
+
+
+@define
+class Validated:
+    a: int = field(validator=gt(0), converter=int)
+    b: list[str] = field(factory=list)
+
+    def __attrs_post_init__(self) -> None:
+        post_inits.append(self)
+
+
+@define
+class Unvalidated:
+    """The layout of `Validated`, without the validation."""
+
+    a: int
+    b: list[str] = field(factory=list)
+
+
+@define(slots=False)
+class DictClass:
+    a: int
+    _b: str = ""
+
+
+@given(models)
+def test_roundtrip(inst) -> None:
+    assert trusted.loads(dumps(inst), inst.__class__) == inst
+
+
+def test_init_skipped() -> None:
+    """Validators, converters and `__attrs_post_init__` don't run."""
+    payload = dumps(Unvalidated(0, ["a"]))
+    post_inits.clear()
+
+    loaded = trusted.loads(payload, Validated)
+    assert (loaded.a, loaded.b) == (0, ["a"])
+    assert not post_inits
+
+    with raises(ValueError):
+        Converter().loads(payload, Validated)
+
+
+def test_frozen() -> None:
+    loaded = trusted.loads(dumps(FrozenTable("a")), FrozenTable)
+    assert loaded == FrozenTable("a")
+    with raises(FrozenInstanceError):
+        loaded.a_string = "b"
+
+
+def test_dict_classes() -> None:
+    inst = DictClass(1, "b")
+    assert trusted.loads(dumps(inst), DictClass) == inst
+
+
+def test_projections() -> None:
+    loaded = trusted.make_loads(Validated, exclude=["b"])(dumps(Validated(2, ["a"])))
+    assert loaded.a == 2 and loaded.b == []
@@ -0,0 +1,211 @@
+"""Test payload verification."""
+from attrs import define
+from hypothesis import given
+from hypothesis.strategies import one_of
+from pytest import fixture, raises
+
+from flattrs import Nested, VerificationError, dumps, loads, make_verifier
+from flattrs._verifier import TableSchema as PyTableSchema
+from flattrs._verifier import verify as py_verify
+from flattrs.cflattrs.verifier import verify as c_verify
+from flattrs.converters import Converter
+
+from .models.common import AllScalars, Common1
+from .models.nested_flatbuffers import WithNestedFlatbuffers
+from .models.tableswithtables import ContainsTable
+from .models.vectors import VectorOfCommon1
+from .test_common import all_scalars, common1s
+from .test_numpy import NumpyVectorsOfScalars, to_numpy
+from .test_tableswithtables import optional_tables
+from .test_unions import (
+    numbered_union_tables,
+    unions_of_nested_tables,
+    unions_of_optional_tables,
+)
+from .test_vectors import (
+    optional_vectors_of_scalars,
+    vectors_of_common1s,
+    vectors_of_scalars,
+)
+
+models = one_of(
+    common1s,
+    all_scalars(),
+    optional_tables,
+    unions_of_nested_tables,
+    unions_of_optional_tables,
+    numbered_union_tables,
+    vectors_of_scalars(),
+    optional_vectors_of_scalars(),
+    vectors_of_common1s(),
+)
+
+
+@define
+class OptionalString:
+    s: str | None = None
+
+
+@define
+class RequiredString:
+    s: str
+
+
+@define
+class WideUnion:
+    u: Common1 | RequiredString | AllScalars | None
+
+
+@define
+class NarrowUnion:
+    u: Common1 | RequiredString | None
+
+
+def to_py_schema(schema):
+    """Convert a Cython schema into a pure-Python one."""
+
+    def convert(child):
+        if isinstance(child, dict):
+            return {k: to_py_schema(v) for k, v in child.items()}
+        return to_py_schema(child) if child is not None else None
+
+    return PyTableSchema([(*f[:4], convert(f[4])) for f in schema.fields])
+
+
+@fixture(params=["cython", "python"])
+def verifier(request):
+    """A `make_verifier` equivalent, for both implementations."""
+    converter = Converter()
+
+    def make_verifier(cl, **kwargs):
+        schema = converter._schema_cache(cl)
+        if request.param == "python":
+            return lambda data, offset=0: py_verify(
+                to_py_schema(schema), data, offset, **kwargs
+            )
+        return lambda data, offset=0: c_verify(schema, data, offset, **kwargs)
+
+    return make_verifier
+
+
+@given(models)
+def test_valid(inst) -> None:
+    payload = dumps(inst)
+    make_verifier(inst.__class__)(payload)
+    assert loads(payload, inst.__class__, verify=True) == inst
+
+
+@given(vectors_of_scalars())
+def test_numpy_vectors(inst) -> None:
+    make_verifier(NumpyVectorsOfScalars)(dumps(to_numpy(inst, NumpyVectorsOfScalars)))
+
+
+def test_truncated(verifier) -> None:
+    payload = dumps(ContainsTable(Common1("a string", 1, 2)))
+
+    # The payload ends with the string's null terminator and padding.
+    for size in range(len(payload.rstrip(b"\0"))):
+        with raises(VerificationError):
+            verifier(ContainsTable)(payload[:size])
+
+
+def test_corrupted(verifier) -> None:
+    """Corrupted payloads are either rejected, or load safely."""
+    payload = dumps(VectorOfCommon1([Common1("a", 1, 2), Common1("b", 3, 4)]))
+    rejected = 0
+
+    for ix in range(len(payload)):
+        for val in (0x00, 0x01, 0x7F, 0x80, 0xFF):
+            corrupted = bytearray(payload)
+            corrupted[ix] = val
+            try:
+                verifier(VectorOfCommon1)(corrupted)
+            except VerificationError:
+                rejected += 1
+                continue
+            try:
+                loads(corrupted, VectorOfCommon1)
+            except UnicodeDecodeError:
+                # String contents aren't verified.
+                pass
+
+    assert rejected
+
+
+def test_string_terminator(verifier) -> None:
+    payload = bytearray(dumps(Common1("a string", 1, 2)))
+    payload[payload.index(b"a string") + len("a string")] = 1
+
+    with raises(VerificationError):
+        verifier(Common1)(payload)
+
+
+def test_required_fields(verifier) -> None:
+    verifier(RequiredString)(dumps(OptionalString("a")))
+    with raises(VerificationError):
+        verifier(RequiredString)(dumps(OptionalString()))
+
+
+def test_union_types(verifier) -> None:
+    verifier(NarrowUnion)(dumps(WideUnion(Common1("a", 1, 2))))
+    with raises(VerificationError):
+        verifier(NarrowUnion)(dumps(WideUnion(AllScalars(*[1] * 11))))
+
+
+def test_limits(verifier) -> None:
+    nested = dumps(ContainsTable(Common1("a", 1, 2)))
+    verifier(ContainsTable, max_depth=2)(nested)
+    with raises(VerificationError):
+        verifier(ContainsTable, max_depth=1)(nested)
+
+    vector = dumps(VectorOfCommon1([Common1("a", 1, 2)] * 3))
+    verifier(VectorOfCommon1, max_tables=4)(vector)
+    with raises(VerificationError):
+        verifier(VectorOfCommon1, max_tables=3)(vector)
+
+
+def test_offsets(verifier) -> None:
+    """Payloads can be verified in the middle of larger buffers."""
+    payload = dumps(Common1("a string", 1, 2))
+
+    verifier(Common1)(b"prefix" + payload, 6)
+
+
+def test_nested_flatbuffers(verifier) -> None:
+    """Nested flatbuffers are verified as buffers of their own."""
+    verifier(WithNestedFlatbuffers)(
+        dumps(WithNestedFlatbuffers(Nested(Common1("a", 1, 2))))
+    )
+
+    # Garbage, and a root offset pointing past the nested flatbuffer.
+    for inner in (b"\xff" * 16, (64).to_bytes(4, "little") + bytes(12), b""):
+        payload = dumps(WithNestedFlatbuffers(Nested(inner), after="x" * 100))
+        with raises(VerificationError):
+            verifier(WithNestedFlatbuffers)(payload)
+        with raises(VerificationError):
+            loads(payload, WithNestedFlatbuffers, verify=True)
+
+
+def test_corrupted_nested_flatbuffers(verifier) -> None:
+    """Corrupted nested flatbuffers are either rejected, or load safely."""
+    inner = dumps(Common1("a", 1, 2))
+    payload = dumps(WithNestedFlatbuffers(Nested(inner)))
+    start = payload.index(inner)
+    rejected = 0
+
+    for ix in range(start, start + len(inner)):
+        for val in (0x00, 0x01, 0x7F, 0x80, 0xFF):
+            corrupted = bytearray(payload)
+            corrupted[ix] = val
+            try:
+                verifier(WithNestedFlatbuffers)(corrupted)
+            except VerificationError:
+                rejected += 1
+                continue
+            try:
+                loads(corrupted, WithNestedFlatbuffers).common.load()
+            except UnicodeDecodeError:
+                # String contents aren't verified.
+                pass
+
+    assert rejected
@@ -0,0 +1,85 @@
+"""Test lazy views."""
+from typing import Any
+
+from attrs import fields, has
+from hypothesis import given
+from pytest import raises
+
+from flattrs import dumps, make_view
+from flattrs.typing import is_struct
+
+from .models.common import Common1
+from .models.tableswithtables import OptionalTable, UnionOfOptionalTables
+from .models.vectors import VectorOfCommon1, VectorsOfScalars
+from .test_common import all_scalars, common1s
+from .test_tableswithtables import optional_tables
+from .test_unions import numbered_union_tables, unions_of_optional_tables
+from .test_vectors import vectors_of_common1s, vectors_of_scalars
+
+
+def assert_view_matches(view: Any, inst: Any) -> None:
+    """Views of tables need to be compared field by field.
+
+    Structs are loaded eagerly, so they compare as usual.
+    """
+    assert view.__class__.__name__ == f"{inst.__class__.__name__}View"
+    for a in fields(inst.__class__):
+        val = getattr(inst, a.name)
+        if has(val.__class__) and not is_struct(val.__class__):
+            assert_view_matches(getattr(view, a.name), val)
+        elif (
+            isinstance(val, list)
+            and val
+            and has(val[0].__class__)
+            and not is_struct(val[0].__class__)
+        ):
+            for view_el, el in zip(getattr(view, a.name), val, strict=True):
+                assert_view_matches(view_el, el)
+        else:
+            assert getattr(view, a.name) == val
+
+
+@given(common1s)
+def test_common1(inst: Common1) -> None:
+    assert_view_matches(make_view(Common1)(dumps(inst)), inst)
+
+
+@given(all_scalars())
+def test_all_scalars(inst) -> None:
+    assert_view_matches(make_view(inst.__class__)(dumps(inst)), inst)
+
+
+@given(optional_tables)
+def test_optional_tables(inst: OptionalTable) -> None:
+    assert_view_matches(make_view(OptionalTable)(dumps(inst)), inst)
+
+
+@given(unions_of_optional_tables)
+def test_unions(inst: UnionOfOptionalTables) -> None:
+    assert_view_matches(make_view(UnionOfOptionalTables)(dumps(inst)), inst)
+
+
+@given(numbered_union_tables)
+def test_numbered_unions(inst) -> None:
+    assert_view_matches(make_view(inst.__class__)(dumps(inst)), inst)
+
+
+@given(vectors_of_common1s())
+def test_vectors_of_tables(inst: VectorOfCommon1) -> None:
+    assert_view_matches(make_view(VectorOfCommon1)(dumps(inst)), inst)
+
+
+@given(vectors_of_scalars())
+def test_vectors_of_scalars(inst: VectorsOfScalars) -> None:
+    assert_view_matches(make_view(VectorsOfScalars)(dumps(inst)), inst)
+
+
+def test_caching_and_immutability() -> None:
+    """Fields are decoded once, and views are read-only."""
+    view = make_view(Common1)(dumps(Common1("an id", 1, 2)))
+
+    assert view.id is view.id
+    assert repr(view) == "Common1View(id='an id', aSmallInt=1, aBigInt=2)"
+
+    with raises(AttributeError):
+        view.id = "another id"
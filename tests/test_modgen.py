@@ -1,6 +1,18 @@
+import sys
 from pathlib import Path
+from shutil import copytree
 from subprocess import run
+from types import ModuleType
 
+from attrs import define
+from pytest import raises
+
+from flattrs import dumps, loads, lookup_by_key
+from flattrs.converters import Converter
+from flattrs.modgen import renderer
+from flattrs.modgen.codecs import render_codec_module
+from flattrs.modgen.manifest import MANIFEST_NAME
+from flattrs.modgen.parser import parser
 from flattrs.modgen.renderer import render
 
 
@@ -49,3 +61,259 @@ def test_compare_to_manual(tmp_path: Path) -> None:
     run(["isort", str(dest_dir)], check=True)
     run(["black", str(dest_dir)], check=True)
     assert_dirs_identical(Path(__file__).parent / "flattrs" / "models_manual", dest_dir)
+
+
+def test_emit_codecs(tmp_path: Path) -> None:
+    """Codecs generated ahead of time are used instead of compiling."""
+    render(
+        Path(__file__).parent / "flatbufferdefs",
+        tmp_path / "aot_models",
+        emit_codecs=True,
+    )
+    assert (tmp_path / "aot_models" / "common_codecs.py").is_file()
+
+    # An outdated model, edited after the codecs were generated.
+    common = tmp_path / "aot_models" / "common.py"
+    common.write_text(
+        common.read_text().replace(
+            "class Common2:\n", "class Common2:\n    extra: int\n"
+        )
+    )
+
+    sys.path.insert(0, str(tmp_path))
+    try:
+        from aot_models.common import Common1, Common2  # type: ignore
+
+        converter = Converter()
+        to_fb = converter._to_fb_cache(Common1)
+        from_fb = converter._from_fb_cache(Common1)
+        assert to_fb.__code__.co_filename.endswith("common_codecs.py")
+        assert from_fb.__code__.co_filename.endswith("common_codecs.py")
+        assert converter._to_fb_cache(Common2).__code__.co_filename.startswith("<FB")
+
+        inst = Common1("a string", 1, 2)
+        assert converter.loads(converter.dumps(inst), Common1) == inst
+    finally:
+        sys.path.remove(str(tmp_path))
+        for name in [m for m in sys.modules if m.startswith("aot_models")]:
+            del sys.modules[name]
+
+
+def test_emit_codecs_private_import(tmp_path: Path) -> None:
+    """Models are imported under a private name while rendering codecs."""
+    import json
+
+    render(
+        Path(__file__).parent / "flatbufferdefs", tmp_path / "json", emit_codecs=True
+    )
+
+    assert (tmp_path / "json" / "common_codecs.py").is_file()
+    assert sys.modules["json"] is json
+    assert not [m for m in sys.modules if m.startswith("_flattrs_modgen_")]
+
+
+def test_skipped_codecs(capsys) -> None:
+    """Models without generated codecs are reported on stderr."""
+
+    @define
+    class Unsupported:
+        a: dict[str, int]
+
+    module = ModuleType(Unsupported.__module__)
+    module.Unsupported = Unsupported
+
+    assert render_codec_module(module) == ""
+    assert "Skipping codecs for Unsupported" in capsys.readouterr().err
+
+
+def test_incremental(tmp_path: Path) -> None:
+    """Only outputs whose inputs changed are rendered again."""
+    defs = copytree(Path(__file__).parent / "flatbufferdefs", tmp_path / "defs")
+    output = tmp_path / "models"
+    render(defs, output, True, incremental=True)
+    fresh = tmp_path / "fresh"
+    mtimes = {p: p.stat().st_mtime_ns for p in output.rglob("*.py")}
+
+    parsed = []
+    parse = renderer.parser.parse
+
+    def tracking_parse(text: str):
+        parsed.append(text)
+        return parse(text)
+
+    renderer.parser.parse = tracking_parse
+    try:
+        render(defs, output, True, incremental=True)
+        assert not parsed
+        assert mtimes == {p: p.stat().st_mtime_ns for p in output.rglob("*.py")}
+
+        # Moving a table changes the imports of the modules using it.
+        (defs / "geometry" / "Vec3.fbs").rename(defs / "geometry" / "Vector3.fbs")
+        render(defs, output, True, incremental=True)
+    finally:
+        renderer.parser.parse = parse
+
+    assert len(parsed) == 3
+    changed = {
+        p.relative_to(output).as_posix()
+        for p in output.rglob("*.py")
+        if mtimes.get(p) != p.stat().st_mtime_ns
+    }
+    assert changed == {
+        "geometry/Vector3.py",
+        "includes.py",
+        "nested/nested_imports.py",
+        "vec3/__init__.py",
+    }
+    render(defs, fresh, True)
+    (output / MANIFEST_NAME).unlink()
+    assert_dirs_identical(fresh, output)
+
+
+def test_incremental_removals(tmp_path: Path) -> None:
+    """Outputs of schema files removed from the inputs are removed too."""
+    defs = copytree(Path(__file__).parent / "flatbufferdefs", tmp_path / "defs")
+    (defs / "empty.fbs").write_text('attribute "unused";\n')
+    (defs / "tables_a.fbs").write_text("namespace outer;\n\ntable A {\n  a: int;\n}\n")
+    (defs / "tables_b.fbs").write_text(
+        "namespace outer.inner;\n\ntable B {\n  b: int;\n}\n"
+    )
+    output = tmp_path / "models"
+    render(defs, output, True, emit_codecs=True, incremental=True)
+    assert (output / "collisions" / "Ns2_codecs.py").is_file()
+    assert (output / "Ns2" / "__init__.py").is_file()
+    assert (output / "outer" / "__init__.py").is_file()
+
+    for schema in ("col2.fbs", "collisions/Ns2.fbs", "empty.fbs", "tables_a.fbs"):
+        (defs / schema).unlink()
+    render(defs, output, True, emit_codecs=True, incremental=True)
+
+    fresh = tmp_path / "fresh"
+    render(defs, fresh, True, emit_codecs=True)
+    (output / MANIFEST_NAME).unlink()
+    assert_dirs_identical(fresh, output)
+
+
+def test_incremental_parse_errors(tmp_path: Path, capsys) -> None:
+    """Schema files parsed again for rendering report their errors."""
+    schema = tmp_path / "broken.fbs"
+    schema.write_text("table {")
+
+    assert (
+        renderer.render_module(set(), {}, {}, schema, None, Path("broken.py")) is None
+    )
+    assert f"While parsing {schema}" in capsys.readouterr().out
+
+
+def test_jobs(tmp_path: Path) -> None:
+    """The output doesn't depend on the number of jobs."""
+    defs = Path(__file__).parent / "flatbufferdefs"
+    render(defs, tmp_path / "serial", True)
+    render(defs, tmp_path / "parallel", True, jobs=3)
+
+    assert_dirs_identical(tmp_path / "serial", tmp_path / "parallel")
+
+
+def test_lazy_exports(tmp_path: Path) -> None:
+    """Lazy namespace exports only import their modules on first access."""
+    defs = Path(__file__).parent / "flatbufferdefs"
+    render(defs, tmp_path / "eager_models", True)
+    render(defs, tmp_path / "lazy_models", True, lazy_exports=True)
+
+    sys.path.insert(0, str(tmp_path))
+    try:
+        from eager_models import flattrs_test as eager  # type: ignore
+        from lazy_models import flattrs_test as lazy  # type: ignore
+
+        assert "lazy_models.common" not in sys.modules
+        assert lazy.__all__ == eager.__all__
+        assert "Common1" in dir(lazy)
+        assert lazy.Common1.__module__ == "lazy_models.common"
+        assert "lazy_models.common" in sys.modules
+        assert "lazy_models.vectors" not in sys.modules
+        with raises(AttributeError):
+            lazy.Missing
+    finally:
+        sys.path.remove(str(tmp_path))
+        for name in [m for m in sys.modules if m.split(".")[0].endswith("_models")]:
+            del sys.modules[name]
+
+
+def test_lazy_exports_named_like_modules(tmp_path: Path) -> None:
+    """Exports named like a module of their package are imported eagerly."""
+    defs = tmp_path / "defs"
+    (defs / "geometry").mkdir(parents=True)
+    (defs / "geometry" / "Vec3.fbs").write_text(
+        "namespace geometry;\n\nstruct Vec3 {\n  x: float;\n}\n"
+    )
+    (defs / "geometry" / "lines.fbs").write_text(
+        'include "Vec3.fbs";\n\nnamespace geometry;\n\n'
+        "table Line {\n  start: Vec3;\n}\n"
+    )
+    (defs / "shapes").mkdir()
+    (defs / "shapes" / "Circle.fbs").write_text(
+        "namespace shapes;\n\ntable Circle {\n  radius: float;\n}\n"
+    )
+    render(defs, tmp_path / "shadowed_models", True, lazy_exports=True)
+    # Nothing is left to import lazily.
+    shapes = (tmp_path / "shadowed_models" / "shapes" / "__init__.py").read_text()
+    assert "__getattr__" not in shapes
+
+    sys.path.insert(0, str(tmp_path))
+    try:
+        from shadowed_models import geometry  # type: ignore
+
+        assert "shadowed_models.geometry.lines" not in sys.modules
+        assert isinstance(geometry.Line, type)
+        # Importing `Line` imported the `Vec3` module too.
+        from shadowed_models.geometry import Vec3  # type: ignore
+
+        assert isinstance(Vec3, type)
+        from shadowed_models.shapes import Circle  # type: ignore
+
+        assert isinstance(Circle, type)
+    finally:
+        sys.path.remove(str(tmp_path))
+        for name in [m for m in sys.modules if m.split(".")[0].endswith("_models")]:
+            del sys.modules[name]
+
+
+def test_string_keys(tmp_path: Path) -> None:
+    """String keys are required, like with flatc, so they can be dumped."""
+    defs = tmp_path / "defs"
+    defs.mkdir()
+    (defs / "items.fbs").write_text(
+        "table Item {\n  id: string (key);\n  v: int;\n}\n\n"
+        "table Items {\n  items: [Item];\n}\n"
+    )
+    render(defs, tmp_path / "keyed_models")
+
+    sys.path.insert(0, str(tmp_path))
+    try:
+        from keyed_models.items import Item, Items  # type: ignore
+
+        payload = dumps(Items([Item("b", 1), Item("a", 2)]))
+        assert loads(payload, Items) == Items([Item("a", 2), Item("b", 1)])
+        assert lookup_by_key(payload, "items", "b", Items) == Item("b", 1)
+    finally:
+        sys.path.remove(str(tmp_path))
+        for name in [m for m in sys.modules if m.split(".")[0].endswith("_models")]:
+            del sys.modules[name]
+
+
+def test_parse_keyword_prefixes() -> None:
+    """Names starting with type keywords are still names."""
+    tree = parser.parse(
+        "table floaty { a: float; b: floaty; c: [int8s]; d: int8 = 3; }"
+        "union U { floaty, Other = 3, }"
+    )
+
+    types = [f.children[1] for f in tree.find_data("table_field")]
+    assert [getattr(t, "data", None) for t in types] == [
+        "scalar_type",
+        None,
+        "vector_type",
+        "scalar_type",
+    ]
+    assert types[1] == "floaty"
+    assert len(list(tree.find_data("union_member"))) == 2